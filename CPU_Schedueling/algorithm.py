@@ -1,49 +1,80 @@
 # algorithm.py
 
-import matplotlib.pyplot as plt
-import matplotlib
+import heapq
+from bisect import bisect_right
+from collections import deque
 
-# Use the TkAgg backend for Tkinter compatibility
-matplotlib.use('TkAgg')
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, FCFS then always uses the loop
+    np = None
 
+from taskset import TaskSet, compute_metrics, core_utilization
+from tracing import NULL_TRACER
 
-def avg_wt_tat(data):
+# Task count from which first_come_first_serve switches to the vectorized closed form
+FCFS_VECTORIZE_THRESHOLD = 10000
+
+
+def avg_wt_tat(data, tracer=NULL_TRACER, execution_log=None, cores=None):
     """
     Calculate average Turnaround Time (TAT) and Waiting Time (WT).
 
+    Thin adapter over taskset.compute_metrics: the metrics are computed on columns
+    and 'tat' and 'wt' are written back to each task dictionary.
+
     :param data: List of task dictionaries with 'ct' (completion time) key.
-    :return: Dictionary with 'avg_tat' and 'avg_wt'.
+    :param tracer: Tracer receiving per-task metrics and averages (see tracing.py).
+    :param execution_log: Execution log of the run; when given, 'core_utilization'
+                          (list indexed by core, see taskset.core_utilization) is added.
+    :param cores: Core count of a multi-core run (see smp.py).
+    :return: Dictionary with 'avg_tat' and 'avg_wt', plus the percentiles, 'max_wt'
+             and 'throughput' reported by compute_metrics.
     """
-    print("Calculating average Turnaround Time (TAT) and average Waiting Time (WT)...")
-    for idx, dct in enumerate(data):
+    for dct in data:
         if 'ct' not in dct:
-            print(f"Task index {idx} is missing 'ct': {dct}")
             raise KeyError(f"Task {dct['id']} is missing 'ct'")
-        dct['tat'] = dct['ct'] - dct['at']
-        dct['wt'] = dct['tat'] - dct['bt']
-        print(f"Task {dct['id']}: CT={dct['ct']}, AT={dct['at']}, BT={dct['bt']}, TAT={dct['tat']}, WT={dct['wt']}")
-
-    total_wt = sum(task['wt'] for task in data)
-    total_tat = sum(task['tat'] for task in data)
-    n = len(data)
-    avg = {'avg_tat': total_tat / n, 'avg_wt': total_wt / n}
-    print(f"Average Turnaround Time (Average TAT): {avg['avg_tat']:.2f}")
-    print(f"Average Waiting Time (Average WT): {avg['avg_wt']:.2f}")
+
+    task_set = TaskSet.from_dicts(data)
+    tat = task_set.turnaround_times()
+    wt = task_set.waiting_times(tat)
+    for dct, task_tat, task_wt in zip(data, tat.tolist(), wt.tolist()):
+        dct['tat'] = task_tat
+        dct['wt'] = task_wt
+
+    avg = compute_metrics(task_set)
+    if execution_log is not None:
+        avg['core_utilization'] = core_utilization(execution_log, cores)
+    if tracer.enabled:
+        for dct in data:
+            tracer.emit('task_metrics', task=dct)
+        tracer.emit('averages', avg_tat=avg['avg_tat'], avg_wt=avg['avg_wt'])
     return avg
 
 
-def first_come_first_serve(data):
+def first_come_first_serve(data, tracer=NULL_TRACER, log=None):
     """
     First Come First Serve (FCFS) scheduling algorithm.
 
     :param data: List of task dictionaries.
+    :param tracer: Tracer receiving scheduling events (see tracing.py).
+    :param log: Empty execution log to append to, e.g. a binlog.ExecutionLog or
+                ExecutionLogWriter. Defaults to a new list.
     :return: Tuple of (updated data, execution_log).
     """
-    execution_log = []
+    trace = tracer.enabled
+    if not trace and np is not None and len(data) >= FCFS_VECTORIZE_THRESHOLD:
+        result = _fcfs_vectorized(data, log)
+        if result is not None:
+            return result
+
+    execution_log = [] if log is None else log
     arrival_sorted = sorted(enumerate(data), key=lambda x: x[1]['at'])
     curr_time = 0
+    if trace:
+        arrival_times = [task['at'] for _, task in arrival_sorted]  # To report how many tasks are waiting
 
-    for index, task in arrival_sorted:
+    for position, (index, task) in enumerate(arrival_sorted):
         if task['at'] > curr_time:
             curr_time = task['at']  # Wait for the task to arrive
         start_time = curr_time
@@ -51,220 +82,503 @@ def first_come_first_serve(data):
         execution_log.append((index, start_time, end_time))  # (task_index, start, end)
         curr_time = end_time
         task['ct'] = curr_time
-        print(f"Executing Task {task['id']} from {start_time} to {end_time}")
+        if trace:
+            tracer.emit('dispatch', task=task, start=start_time, end=end_time, remaining=0,
+                        ready=bisect_right(arrival_times, start_time) - position - 1)
+            tracer.emit('complete', task=task, time=curr_time)
 
     return data, execution_log
 
 
-def round_robin(data, tq):
+def _fcfs_vectorized(data, log=None):
+    """
+    Closed-form FCFS computed in one NumPy pass.
+
+    In arrival order, with C the cumulative burst time, the completion time of the
+    k-th task is C[k] + max(0, max over j <= k of (at[j] - C[j - 1])), i.e. a cumulative
+    sum of burst times shifted by a cumulative max of the idle time so far.
+
+    :param data: List of task dictionaries.
+    :param log: Execution log to append to, or None for a new list.
+    :return: Tuple of (updated data, execution_log), or None if the times are not
+             integers, since float cumulative sums could differ from the loop in the last bit.
+    """
+    at = np.asarray([task['at'] for task in data])
+    bt = np.asarray([task['bt'] for task in data])
+    if at.dtype.kind not in 'iu' or bt.dtype.kind not in 'iu':
+        return None
+
+    order = np.argsort(at, kind='stable')  # Stable, so ties keep index order
+    at_sorted = at[order]
+    bt_sorted = bt[order]
+    busy = np.cumsum(bt_sorted)
+    idle = np.maximum(np.maximum.accumulate(at_sorted - (busy - bt_sorted)), 0)
+    ct = busy + idle
+
+    # Write completion times back in index order, which is much friendlier to the cache
+    ct_by_index = np.empty_like(ct)
+    ct_by_index[order] = ct
+    for task, task_ct in zip(data, ct_by_index.tolist()):
+        task['ct'] = task_ct
+    if log is None:
+        execution_log = list(zip(order.tolist(), (ct - bt_sorted).tolist(), ct.tolist()))  # (task_index, start, end)
+    elif hasattr(log, 'extend_columns'):
+        execution_log = log
+        execution_log.extend_columns(order, ct - bt_sorted, ct)  # Straight from the arrays, no tuples
+    else:
+        execution_log = log
+        execution_log.extend(zip(order.tolist(), (ct - bt_sorted).tolist(), ct.tolist()))
+    return data, execution_log
+
+
+class _RRTask:
+    """Per-task bookkeeping for the Round Robin engine."""
+
+    __slots__ = ('index', 'task', 'remaining_bt')
+
+    def __init__(self, index, task):
+        self.index = index
+        self.task = task
+        self.remaining_bt = task['bt']
+
+
+def round_robin(data, tq, compact=False, tracer=NULL_TRACER, log=None):
     """
     Round Robin (RR) scheduling algorithm.
 
+    incremental.IncrementalScheduler._run_round_robin copies the loop (without
+    compact); a change to one must be made to the other.
+
     :param data: List of task dictionaries.
     :param tq: Time quantum.
+    :param compact: If True, back-to-back quanta of a task that is the only runnable
+                    task are collapsed into a single execution_log segment.
+    :param tracer: Tracer receiving scheduling events (see tracing.py).
+    :param log: Empty execution log to append to, e.g. a binlog.ExecutionLog or
+                ExecutionLogWriter. Defaults to a new list.
     :return: Tuple of (updated data, execution_log).
     """
-    rr = []
-    indx = 0
+    trace = tracer.enabled
+    arrivals = sorted(range(len(data)), key=lambda i: data[i]['at'])  # Stable, so ties keep index order
+    n = len(arrivals)
     curr_time = 0
     completed = 0  # The number of tasks completed
-    n = len(data)
-    execution_log = []  # Records a list of task execution fragments (task_index, start_time, end_time)
-
-    # Initialize the task list and add the remaining execution time
-    for task in data:
-        rr.append({
-            'id': task['id'],
-            'at': task['at'],
-            'bt': task['bt'],
-            'remaining_bt': task['bt'],
-            'index': indx
-        })
-        indx += 1
-
-    # Sort tasks by arrival time
-    rr.sort(key=lambda x: x['at'])
-
-    queue = []
+    execution_log = [] if log is None else log  # Records task execution fragments (task_index, start_time, end_time)
+
+    queue = deque()
     i = 0  # Track the index of tasks added to the queue
 
     while completed < n:
         # Add all tasks that have arrived at the current time to the queue
-        while i < n and rr[i]['at'] <= curr_time:
-            queue.append(rr[i])
-            print(f"Task {rr[i]['id']} arrived at {rr[i]['at']} and joined the queue.")
+        while i < n and data[arrivals[i]]['at'] <= curr_time:
+            queue.append(_RRTask(arrivals[i], data[arrivals[i]]))
+            if trace:
+                tracer.emit('arrival', task=data[arrivals[i]], time=data[arrivals[i]]['at'])
             i += 1
 
         if queue:
             # Fetch the first task in the queue
-            current_task = queue.pop(0)
-            exec_time = min(tq, current_task['remaining_bt'])
+            current_task = queue.popleft()
+            exec_time = min(tq, current_task.remaining_bt)
+            if compact and not queue and exec_time < current_task.remaining_bt:
+                # Only runnable task: keep running whole quanta until the next arrival
+                if i < n:
+                    quanta = -(-(data[arrivals[i]]['at'] - curr_time) // tq)
+                    exec_time = min(quanta * tq, current_task.remaining_bt)
+                else:
+                    exec_time = current_task.remaining_bt
 
             # Record execution segment
-            execution_log.append((current_task['index'], curr_time, curr_time + exec_time))  # (task_index, start, end)
+            execution_log.append((current_task.index, curr_time, curr_time + exec_time))  # (task_index, start, end)
 
-            # Print execution information
+            # Report execution information
             start_time = curr_time
             curr_time += exec_time
-            current_task['remaining_bt'] -= exec_time
-            print(
-                f"Executing Task {current_task['id']} from {start_time} to {curr_time}, Remaining time {current_task['remaining_bt']}")
+            current_task.remaining_bt -= exec_time
+            if trace:
+                tracer.emit('dispatch', task=current_task.task, start=start_time, end=curr_time,
+                            remaining=current_task.remaining_bt, ready=len(queue))
 
             # Add any new tasks that have arrived during execution
-            while i < n and rr[i]['at'] <= curr_time:
-                queue.append(rr[i])
-                print(f"Task {rr[i]['id']} arrived at {rr[i]['at']} and joined the queue.")
+            while i < n and data[arrivals[i]]['at'] <= curr_time:
+                queue.append(_RRTask(arrivals[i], data[arrivals[i]]))
+                if trace:
+                    tracer.emit('arrival', task=data[arrivals[i]], time=data[arrivals[i]]['at'])
                 i += 1
 
-            if current_task['remaining_bt'] > 0:
+            if current_task.remaining_bt > 0:
                 # If the task is not completed, rejoin the end of the queue
                 queue.append(current_task)
             else:
                 # The task is complete. Set the completion time
-                data[current_task['index']]['ct'] = curr_time
-                print(f"Task {current_task['id']} completed at {curr_time}")
+                current_task.task['ct'] = curr_time
+                if trace:
+                    tracer.emit('complete', task=current_task.task, time=curr_time)
                 completed += 1
         else:
             # If the queue is empty, jump to the arrival time of the next task
             if i < n:
-                print(f"The queue is empty. Jumping from {curr_time} to {rr[i]['at']}")
-                curr_time = rr[i]['at']
+                if trace:
+                    tracer.emit('idle', time=curr_time, next_time=data[arrivals[i]]['at'])
+                curr_time = data[arrivals[i]]['at']
             else:
                 break  # All tasks have been processed
 
     return data, execution_log
 
 
-def shortest_job_first(data):
+def _run_ready_queue(data, key, tracer, log=None):
     """
-    Shortest Job First (SJF) scheduling algorithm.
+    Non-preemptive ready-queue engine shared by SJF and Priority Non-Preemptive.
+
+    Tasks are admitted through an arrival cursor over the arrival-sorted task list
+    and kept in a binary heap ordered by ``key``. Ties fall back to arrival time and
+    then to the task index, which matches the stable sorts of the original scans.
+    incremental.IncrementalScheduler._run_ready_queue copies this loop; a change to
+    one must be made to the other.
 
     :param data: List of task dictionaries.
+    :param key: Function mapping a task dictionary to its heap ordering value.
+    :param tracer: Tracer receiving scheduling events.
+    :param log: Execution log to append to, or None for a new list.
     :return: Tuple of (updated data, execution_log).
     """
-    # Initialize task data
-    sjf = []
-    indx = 0
-    for dct in data:
-        sjf.append([dct['bt'], dct['at'], indx])  # [Burst Time, Arrival Time, Index]
-        indx += 1
-
-    sjf.sort(key=lambda x: x[1])  # Sort by arrival time
+    trace = tracer.enabled
+    arrivals = sorted(range(len(data)), key=lambda i: data[i]['at'])  # Stable, so ties keep index order
+    n = len(arrivals)
+    ready = []  # Heap of (key, arrival time, index)
+    cursor = 0  # Next task in arrival order that has not joined the ready queue
     curr_time = 0
-    completed = []
-    execution_log = []
-
-    while len(completed) < len(data):
-        # Find all arrived and unfinished tasks
-        available = [task for task in sjf if task[1] <= curr_time and task not in completed]
-
-        if available:
-            # Sort by burst time (shortest job first)
-            available.sort(key=lambda x: x[0])
-            next_task = available[0]
+    execution_log = [] if log is None else log
+
+    while cursor < n or ready:
+        # Admit every task that has arrived by the current time
+        while cursor < n and data[arrivals[cursor]]['at'] <= curr_time:
+            index = arrivals[cursor]
+            task = data[index]
+            heapq.heappush(ready, (key(task), task['at'], index))
+            cursor += 1
+            if trace:
+                tracer.emit('arrival', task=task, time=task['at'])
+
+        if ready:
+            index = heapq.heappop(ready)[2]
+            task = data[index]
 
             # Record the start and end time of the task
             start_time = curr_time
-            end_time = curr_time + next_task[0]
-            execution_log.append((next_task[2], start_time, end_time))  # (task_index, start, end)
-
-            # Perform the task
-            curr_time += next_task[0]  # Increase current time
-            data[next_task[2]]['ct'] = curr_time  # Set completion time
-            completed.append(next_task)  # Mark the task as completed
-            print(f"Executing Task {data[next_task[2]]['id']} with completion time {curr_time}")
+            curr_time += task['bt']
+            execution_log.append((index, start_time, curr_time))  # (task_index, start, end)
+            task['ct'] = curr_time  # Set completion time
+            if trace:
+                tracer.emit('dispatch', task=task, start=start_time, end=curr_time, remaining=0, ready=len(ready))
+                tracer.emit('complete', task=task, time=curr_time)
         else:
             # If no task is available, skip to the arrival time of the next task
-            next_arrival = min(task[1] for task in sjf if task not in completed)
-            print(f"Current time {curr_time} - No task available. Skipping to time {next_arrival}")
+            next_arrival = data[arrivals[cursor]]['at']
+            if trace:
+                tracer.emit('idle', time=curr_time, next_time=next_arrival)
             curr_time = next_arrival
 
     return data, execution_log
 
 
-def priority_non_preemptive(data):
+def shortest_job_first(data, tracer=NULL_TRACER, log=None):
+    """
+    Shortest Job First (SJF) scheduling algorithm.
+
+    :param data: List of task dictionaries.
+    :param tracer: Tracer receiving scheduling events (see tracing.py).
+    :param log: Empty execution log to append to, e.g. a binlog.ExecutionLog or
+                ExecutionLogWriter. Defaults to a new list.
+    :return: Tuple of (updated data, execution_log).
+    """
+    # Shortest burst time first, then earliest arrival
+    return _run_ready_queue(data, key=lambda task: task['bt'], tracer=tracer, log=log)
+
+
+def priority_non_preemptive(data, tracer=NULL_TRACER, log=None):
     """
     Priority Non-Preemptive scheduling algorithm.
 
     :param data: List of task dictionaries.
+    :param tracer: Tracer receiving scheduling events (see tracing.py).
+    :param log: Empty execution log to append to, e.g. a binlog.ExecutionLog or
+                ExecutionLogWriter. Defaults to a new list.
     :return: Tuple of (updated data, execution_log).
     """
-    curr_time = 0
-    completed = []
-    n = len(data)
-    execution_log = []
+    # Lower number = higher priority, then earliest arrival
+    return _run_ready_queue(data, key=lambda task: task['pr'], tracer=tracer, log=log)
 
-    # Transform task data and add priority
-    tasks = [[task['pr'], task['at'], task['bt'], i] for i, task in enumerate(data)]
-    tasks.sort(key=lambda x: x[1])  # Sort by arrival time
 
-    while len(completed) < n:
-        # Find all arrived and unfinished tasks
-        available_tasks = [task for task in tasks if task[1] <= curr_time and task not in completed]
+def _run_preemptive(data, key, tracer, by_remaining=False, log=None):
+    """
+    Event-driven preemptive engine.
 
-        if available_tasks:
-            # Sort by priority (lower number = higher priority) and arrival time
-            available_tasks.sort(key=lambda x: (x[0], x[1]))
-            next_task = available_tasks[0]
+    The clock only moves to the next arrival or to the completion of the running
+    task, whichever comes first, so the work done grows with the number of events
+    rather than with the simulated time. The running task is always the top of a
+    heap ordered by ``key``, then arrival time, then task index. Adjacent segments
+    of the same task are merged into a single execution_log entry.
+    incremental.IncrementalScheduler._run_preemptive copies this loop; a change to
+    one must be made to the other.
 
-            # Record the start and end time of the task
+    :param data: List of task dictionaries.
+    :param key: Function mapping a task dictionary to its heap ordering value.
+    :param tracer: Tracer receiving scheduling events.
+    :param by_remaining: Order by remaining time instead (``key`` must then be the burst time).
+    :param log: Execution log to append to, or None for a new list.
+    :return: Tuple of (updated data, execution_log).
+    """
+    trace = tracer.enabled
+    arrivals = sorted(range(len(data)), key=lambda i: data[i]['at'])  # Stable, so ties keep index order
+    n = len(arrivals)
+    remaining = [task['bt'] for task in data]
+    ready = []  # Heap of (key, arrival time, index)
+    cursor = 0  # Next task in arrival order that has not joined the ready queue
+    curr_time = 0
+    execution_log = [] if log is None else log
+
+    while cursor < n or ready:
+        # Admit every task that has arrived by the current time
+        while cursor < n and data[arrivals[cursor]]['at'] <= curr_time:
+            index = arrivals[cursor]
+            task = data[index]
+            heapq.heappush(ready, (key(task), task['at'], index))
+            cursor += 1
+            if trace:
+                tracer.emit('arrival', task=task, time=task['at'])
+
+        if ready:
+            # Run the highest priority task until it completes or the next task arrives
+            index = ready[0][2]
             start_time = curr_time
-            end_time = curr_time + next_task[2]
-            execution_log.append((next_task[3], start_time, end_time))  # (task_index, start, end)
-
-            # Perform the task
-            curr_time += next_task[2]  # Increase current time
-            data[next_task[3]]['ct'] = curr_time  # Set completion time
-            completed.append(next_task)  # Mark the task as completed
-            print(f"Executing Task {data[next_task[3]]['id']} with completion time {curr_time}")
+            curr_time += remaining[index]
+            if cursor < n and data[arrivals[cursor]]['at'] < curr_time:
+                curr_time = data[arrivals[cursor]]['at']
+            remaining[index] -= curr_time - start_time
+
+            if execution_log and execution_log[-1][0] == index and execution_log[-1][2] == start_time:
+                # The same task keeps the CPU, so extend its previous segment
+                execution_log[-1] = (index, execution_log[-1][1], curr_time)
+            else:
+                execution_log.append((index, start_time, curr_time))  # (task_index, start, end)
+            if trace:
+                tracer.emit('dispatch', task=data[index], start=start_time, end=curr_time,
+                            remaining=remaining[index], ready=len(ready) - 1)
+
+            if remaining[index] == 0:  # If the task is completed
+                heapq.heappop(ready)
+                data[index]['ct'] = curr_time  # Set completion time
+                if trace:
+                    tracer.emit('complete', task=data[index], time=curr_time)
+            elif by_remaining:
+                # The top's key only went down, so it can be updated in place without breaking the heap
+                ready[0] = (remaining[index], ready[0][1], index)
         else:
-            # If no task is available, skip to the arrival time of the next task
-            next_arrival = min(task[1] for task in tasks if task not in completed)
-            print(f"Current time {curr_time} - No task available. Skipping to time {next_arrival}")
+            # No task to execute, jump to the arrival time of the next task
+            next_arrival = data[arrivals[cursor]]['at']
+            if trace:
+                tracer.emit('idle', time=curr_time, next_time=next_arrival)
             curr_time = next_arrival
 
     return data, execution_log
 
 
-def priority_preemptive(data):
+def priority_preemptive(data, tracer=NULL_TRACER, log=None):
     """
     Priority Preemptive scheduling algorithm.
 
     :param data: List of task dictionaries.
+    :param tracer: Tracer receiving scheduling events (see tracing.py).
+    :param log: Empty execution log to append to, e.g. a binlog.ExecutionLog or
+                ExecutionLogWriter. Defaults to a new list.
     :return: Tuple of (updated data, execution_log).
     """
+    # Lower number = higher priority, then earliest arrival
+    return _run_preemptive(data, key=lambda task: task['pr'], tracer=tracer, log=log)
 
-    def find_highest_priority_task(curr_time, tasks):
-        # Find all arrived and unfinished tasks
-        available_tasks = [task for task in tasks if task[1] <= curr_time and task[2] > 0]
-        if not available_tasks:
-            return None  # No task to execute
-        # Sort by priority (lower number = higher priority) and arrival time
-        available_tasks.sort(key=lambda x: (x[0], x[1]))
-        return available_tasks[0]
 
-    curr_time = 0
-    completed = 0  # The number of tasks completed
-    n = len(data)
-    execution_log = []
-    tasks = [[task['pr'], task['at'], task['bt'], i] for i, task in enumerate(data)]  # [PR, AT, BT, Index]
+def shortest_remaining_time_first(data, tracer=NULL_TRACER, log=None):
+    """
+    Shortest Remaining Time First (SRTF) scheduling algorithm, the preemptive form of SJF.
 
-    while completed < n:
-        task = find_highest_priority_task(curr_time, tasks)
-        if task:
-            # Execute the highest priority task for 1 unit time
-            task[2] -= 1  # Reduce remaining execution time
-            start_time = curr_time
-            curr_time += 1
-            execution_log.append((task[3], start_time, curr_time))  # (task_index, start, end)
-            print(f"Executing Task {data[task[3]]['id']} from {start_time} to {curr_time}, Remaining time {task[2]}")
-            if task[2] == 0:  # If the task is completed
-                data[task[3]]['ct'] = curr_time  # Set completion time
-                completed += 1
-                print(f"Task {data[task[3]]['id']} completed at {curr_time}")
+    :param data: List of task dictionaries.
+    :param tracer: Tracer receiving scheduling events (see tracing.py).
+    :param log: Empty execution log to append to, e.g. a binlog.ExecutionLog or
+                ExecutionLogWriter. Defaults to a new list.
+    :return: Tuple of (updated data, execution_log).
+    """
+    # Shortest remaining time first, then earliest arrival; ties keep the running task
+    return _run_preemptive(data, key=lambda task: task['bt'], tracer=tracer, by_remaining=True, log=log)
+
+
+def multilevel_feedback_queue(data, quanta=(4, 8, 16), aging=None, boost=None, tracer=NULL_TRACER,
+                              log=None):
+    """
+    Multilevel Feedback Queue (MLFQ) scheduling algorithm.
+
+    Tasks start in the top level (0). A task that has used up the time quantum of
+    its level, counted across preemptions, moves down one level; the last level is
+    Round Robin with its own quantum. A higher level always runs first, and an
+    arrival preempts a task running below the top level.
+
+    Each level is a heap ordered by the time the task joined it, so a preempted task
+    resumes ahead of its level and the longest waiting task is always on top.
+    Aging counts from when a task last went back to waiting instead, so the time it
+    spent running does not count as waiting.
+
+    :param data: List of task dictionaries.
+    :param quanta: Time quantum of each level, top level first.
+    :param aging: A task that has waited this long in a level since it last ran moves
+                  up one level, at the next scheduling decision. None disables aging.
+    :param boost: Every ``boost`` time units all tasks move back to the top level.
+                  None disables the priority boost.
+    :param tracer: Tracer receiving scheduling events (see tracing.py).
+    :param log: Empty execution log to append to, e.g. a binlog.ExecutionLog or
+                ExecutionLogWriter. Defaults to a new list.
+    :return: Tuple of (updated data, execution_log).
+    """
+    if not quanta or any(q <= 0 for q in quanta):
+        raise ValueError("MLFQ needs a positive time quantum for every level")
+    if aging is not None and aging <= 0:
+        raise ValueError("The aging threshold must be positive")
+    if boost is not None and boost <= 0:
+        raise ValueError("The boost interval must be positive")
+
+    trace = tracer.enabled
+    arrivals = sorted(range(len(data)), key=lambda i: data[i]['at'])  # Stable, so ties keep index order
+    n = len(arrivals)
+    remaining = [task['bt'] for task in data]
+    used = [0] * n  # Time used of the current level's quantum
+    last = len(quanta) - 1
+    levels = [[] for _ in quanta]  # One heap of (time joined, sequence number, index) per level
+    # Heap entry of each waiting task. Aging takes tasks out of the middle of a heap,
+    # which leaves their old entry behind; entries other than these are skipped.
+    entries = [None] * n
+    level_of = [0] * n
+    ready_since = [0] * n  # When each task last went back to waiting
+    by_wait = [deque() for _ in quanta]  # (ready since, index) of tasks below the top level, oldest first
+    waiting_in = [0] * len(quanta)  # Waiting tasks in each level
+    sequence = 0  # Breaks ties between tasks joining a level at the same time
+    waiting = 0  # Tasks in any level
+    cursor = 0  # Next task in arrival order that has not joined the top level
+    curr_time = 0
+    next_boost = boost
+    execution_log = [] if log is None else log
+
+    def wait(index, level, entry):
+        heapq.heappush(levels[level], entry)
+        entries[index] = entry
+        level_of[index] = level
+        ready_since[index] = curr_time
+        waiting_in[level] += 1
+        if level > 0:
+            by_wait[level].append((curr_time, index))
+
+    while cursor < n or waiting:
+        if boost is not None and curr_time >= next_boost:
+            # Priority boost: every task moves to the top level, keeping its place in line
+            for level in range(1, last + 1):
+                for entry in levels[level]:
+                    index = entry[2]
+                    if entries[index] is entry:
+                        used[index] = 0
+                        level_of[index] = 0
+                        levels[0].append(entry)
+                levels[level].clear()
+                by_wait[level].clear()
+                waiting_in[0] += waiting_in[level]
+                waiting_in[level] = 0
+            heapq.heapify(levels[0])
+            next_boost = (curr_time // boost + 1) * boost
+
+        # Admit every task that has arrived by the current time
+        while cursor < n and data[arrivals[cursor]]['at'] <= curr_time:
+            index = arrivals[cursor]
+            wait(index, 0, (data[index]['at'], -1, index))  # Ahead of tasks rejoining at the same time
+            waiting += 1
+            cursor += 1
+            if trace:
+                tracer.emit('arrival', task=data[index], time=data[index]['at'])
+
+        if aging is not None:
+            for level in range(1, last + 1):
+                queue = by_wait[level]
+                while queue and curr_time - queue[0][0] >= aging:
+                    since, index = queue.popleft()
+                    if entries[index] is None or level_of[index] != level or ready_since[index] != since:
+                        continue  # It has run or moved since
+                    used[index] = 0
+                    waiting_in[level] -= 1
+                    wait(index, level - 1, (curr_time, sequence, index))
+                    sequence += 1
+
+        if not waiting:
+            # No task to execute, jump to the arrival time of the next task
+            next_arrival = data[arrivals[cursor]]['at']
+            if trace:
+                tracer.emit('idle', time=curr_time, next_time=next_arrival)
+            curr_time = next_arrival
+            continue
+
+        level = 0
+        while not waiting_in[level]:
+            level += 1
+        entry = heapq.heappop(levels[level])
+        while entries[entry[2]] is not entry:
+            entry = heapq.heappop(levels[level])
+        index = entry[2]
+        entries[index] = None
+        waiting_in[level] -= 1
+        waiting -= 1
+
+        # Run until the task completes or uses up its quantum; below the top level,
+        # stop early for the next arrival or priority boost
+        start_time = curr_time
+        curr_time += min(remaining[index], quanta[level] - used[index])
+        if level > 0:
+            if cursor < n and data[arrivals[cursor]]['at'] < curr_time:
+                curr_time = data[arrivals[cursor]]['at']
+            if boost is not None and next_boost < curr_time:
+                curr_time = next_boost
+        remaining[index] -= curr_time - start_time
+        used[index] += curr_time - start_time
+
+        if execution_log and execution_log[-1][0] == index and execution_log[-1][2] == start_time:
+            # The same task keeps the CPU, so extend its previous segment
+            execution_log[-1] = (index, execution_log[-1][1], curr_time)
         else:
-            # No task to execute, increment time
-            print(f"Current time {curr_time} - No task to execute. Incrementing time.")
-            curr_time += 1
+            execution_log.append((index, start_time, curr_time))  # (task_index, start, end)
+        if trace:
+            tracer.emit('dispatch', task=data[index], start=start_time, end=curr_time,
+                        remaining=remaining[index], ready=waiting)
+
+        if remaining[index] <= 0:
+            data[index]['ct'] = curr_time  # Set completion time
+            if trace:
+                tracer.emit('complete', task=data[index], time=curr_time)
+            continue
+        if used[index] >= quanta[level]:
+            # Quantum used up: move down a level (the last level just goes to the back)
+            used[index] = 0
+            level = min(level + 1, last)
+            entry = (curr_time, sequence, index)
+            sequence += 1
+        wait(index, level, entry)  # A preempted task keeps its place in line
+        waiting += 1
 
     return data, execution_log
+
+
+# Short names for every policy, used by the batch and command line tools.
+# Round Robin is the only one that needs an extra argument, the time quantum (tq).
+ALGORITHMS = {
+    'fcfs': first_come_first_serve,
+    'rr': round_robin,
+    'sjf': shortest_job_first,
+    'priority_np': priority_non_preemptive,
+    'priority_p': priority_preemptive,
+    'srtf': shortest_remaining_time_first,
+    'mlfq': multilevel_feedback_queue,
+}
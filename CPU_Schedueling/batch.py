@@ -0,0 +1,218 @@
+# batch.py
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithm import ALGORITHMS, avg_wt_tat, first_come_first_serve, round_robin
+from taskset import TaskSet, compute_metrics
+from workload import load_workload
+
+# Task set of the current worker process, installed once by _init_worker
+_WORKLOAD = None
+
+
+def _init_worker(data):
+    """
+    Process pool initializer: keep the shared task set in the worker.
+
+    :param data: List of task dictionaries.
+    """
+    global _WORKLOAD
+    _WORKLOAD = data
+
+
+def _run_job(name, tq):
+    """
+    Run one policy on the worker's task set and summarize it.
+
+    :param name: Key of algorithm.ALGORITHMS.
+    :param tq: Time quantum for Round Robin, None otherwise.
+    :return: Result row dictionary.
+    """
+    data = [dict(task) for task in _WORKLOAD]
+    start = time.perf_counter()
+    if tq is None:
+        result, execution_log = ALGORITHMS[name](data)
+    else:
+        result, execution_log = ALGORITHMS[name](data, tq)
+    elapsed = time.perf_counter() - start
+    avg = avg_wt_tat(result)
+    return {
+        'algorithm': name,
+        'tq': tq,
+        'avg_tat': avg['avg_tat'],
+        'avg_wt': avg['avg_wt'],
+        'max_wt': avg['max_wt'],
+        'segments': len(execution_log),
+        'seconds': elapsed,
+    }
+
+
+def compare_algorithms(data, quanta=(2, 4, 8), algorithms=None, max_workers=None):
+    """
+    Run several policies on the same workload in a process pool.
+
+    The task set is sent to each worker once, through the pool initializer, rather
+    than with every job.
+
+    :param data: List of task dictionaries (left unchanged).
+    :param quanta: Time quanta to run Round Robin with.
+    :param algorithms: Keys of algorithm.ALGORITHMS to run. Defaults to all of them.
+    :param max_workers: Number of worker processes. Defaults to the CPU count; 1 runs
+                        every job in the current process.
+    :return: List of result rows, in job order.
+    """
+    if algorithms is None:
+        algorithms = list(ALGORITHMS)
+    jobs = []
+    for name in algorithms:
+        if name not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{name}'")
+        if name == 'rr':
+            jobs.extend((name, tq) for tq in quanta)
+        else:
+            jobs.append((name, None))
+    if not jobs:
+        return []
+
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        _init_worker(data)
+        return [_run_job(name, tq) for name, tq in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+        futures = [pool.submit(_run_job, name, tq) for name, tq in jobs]
+        return [future.result() for future in futures]
+
+
+def _sweep_job(tq, as_fcfs):
+    """
+    Run Round Robin with one quantum on the worker's task set.
+
+    :param tq: Time quantum.
+    :param as_fcfs: True when tq is at least the longest burst, in which case every task
+                    finishes in its first quantum and the schedule is exactly FCFS.
+    :return: Dictionary of metrics for this quantum.
+    """
+    data = [dict(task) for task in _WORKLOAD]
+    if as_fcfs:
+        result, execution_log = first_come_first_serve(data)
+    else:
+        # Compact segments do not change completion times or the number of task switches
+        result, execution_log = round_robin(data, tq, compact=True)
+
+    context_switches = 0
+    last_index = None
+    for index, _, _ in execution_log:
+        if index != last_index:
+            context_switches += 1
+            last_index = index
+    metrics = compute_metrics(TaskSet.from_dicts(result), percentiles=(99,))
+    return {
+        'avg_tat': metrics['avg_tat'],
+        'avg_wt': metrics['avg_wt'],
+        'context_switches': context_switches - 1 if context_switches else 0,
+        'tat_p99': metrics['tat_p99'],
+        'wt_p99': metrics['wt_p99'],
+    }
+
+
+def sweep_quanta(data, quanta, max_workers=None):
+    """
+    Evaluate Round Robin over a range of time quanta.
+
+    Each quantum is a full, independent run; only duplicates are skipped (every
+    quantum at or above the longest burst time gives the same FCFS schedule). As
+    in compare_algorithms, the runs are spread over a process pool that receives
+    the task set once per worker. Small quanta cut the schedule into the most
+    slices and take the longest, so they are submitted first.
+
+    :param data: List of task dictionaries (left unchanged).
+    :param quanta: Iterable of time quanta, e.g. range(1, 1000).
+    :param max_workers: Number of worker processes. Defaults to the CPU count; 1 runs
+                        every job in the current process.
+    :return: List of rows with 'tq', 'avg_tat', 'avg_wt', 'context_switches'
+             (switches between different tasks), 'tat_p99' and 'wt_p99', in the order of quanta.
+    """
+    quanta = list(quanta)
+    if not quanta or not data:
+        return []
+    if any(tq <= 0 for tq in quanta):
+        raise ValueError("Time quanta must be positive")
+    max_bt = max(task['bt'] for task in data)
+
+    # Quanta at or above the longest burst all collapse onto the same FCFS run
+    effective = {tq: min(tq, max_bt) for tq in quanta}
+    distinct = sorted(set(effective.values()))
+    jobs = [(tq, tq >= max_bt) for tq in distinct]
+
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        _init_worker(data)
+        results = [_sweep_job(tq, as_fcfs) for tq, as_fcfs in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+            futures = [pool.submit(_sweep_job, tq, as_fcfs) for tq, as_fcfs in jobs]
+            results = [future.result() for future in futures]
+
+    by_quantum = dict(zip(distinct, results))
+    return [dict(by_quantum[effective[tq]], tq=tq) for tq in quanta]
+
+
+def format_sweep_table(rows):
+    """
+    Format the rows of sweep_quanta as a plain-text table.
+
+    :param rows: Rows returned by sweep_quanta.
+    :return: Table string.
+    """
+    lines = [f"{'TQ':>6} {'Avg TAT':>12} {'Avg WT':>12} {'Switches':>10} {'P99 TAT':>12} {'P99 WT':>12}"]
+    for row in rows:
+        lines.append(f"{row['tq']:>6} {row['avg_tat']:>12.2f} {row['avg_wt']:>12.2f} {row['context_switches']:>10} "
+                     f"{row['tat_p99']:>12.2f} {row['wt_p99']:>12.2f}")
+    return '\n'.join(lines)
+
+
+def format_table(rows):
+    """
+    Format result rows as a plain-text comparison table.
+
+    :param rows: Rows returned by compare_algorithms.
+    :return: Table string.
+    """
+    lines = [f"{'Algorithm':<12} {'TQ':>6} {'Avg TAT':>12} {'Avg WT':>12} {'Max WT':>10} {'Segments':>10} {'Seconds':>9}"]
+    for row in rows:
+        tq = '-' if row['tq'] is None else row['tq']
+        lines.append(f"{row['algorithm']:<12} {tq:>6} {row['avg_tat']:>12.2f} {row['avg_wt']:>12.2f} "
+                     f"{row['max_wt']:>10} {row['segments']:>10} {row['seconds']:>9.3f}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare every scheduling algorithm on one workload.")
+    parser.add_argument('workload', help="Workload file (.csv, .jsonl or .json) with 'id', 'at', 'bt' and 'pr'")
+    parser.add_argument('--quanta', type=int, nargs='+', default=[2, 4, 8], help="Round Robin time quanta")
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), help="Policies to run (default: all)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--sweep', type=int, nargs=3, metavar=('START', 'STOP', 'STEP'),
+                        help="Sweep Round Robin over range(START, STOP, STEP) instead of comparing algorithms")
+    parser.add_argument('--json', help="Also write the result rows to this JSON file")
+    args = parser.parse_args(argv)
+
+    data = load_workload(args.workload)
+    if args.sweep:
+        rows = sweep_quanta(data, range(*args.sweep), args.workers)
+        print(format_sweep_table(rows))
+    else:
+        rows = compare_algorithms(data, args.quanta, args.algorithms, args.workers)
+        print(format_table(rows))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
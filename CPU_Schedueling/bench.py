@@ -0,0 +1,210 @@
+# bench.py
+
+import argparse
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from algorithm import ALGORITHMS, avg_wt_tat
+from workload import generate_workload
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000, 1000000)
+# 'metrics' is avg_wt_tat on the FCFS result; 'gantt' renders the Round Robin log to a PNG
+BENCHMARKS = list(ALGORITHMS) + ['metrics', 'gantt']
+OPTIONAL_BENCHMARKS = ('gantt',)  # Needs matplotlib; only run when asked for
+
+
+def _prepare(name, workload, tq):
+    """
+    Build the call for one benchmark; the workload is copied here, outside the timing.
+
+    :return: Function running the benchmark once and returning its event count.
+    """
+    data = [dict(task) for task in workload]
+    n = len(data)
+    if name == 'metrics':
+        ALGORITHMS['fcfs'](data)
+
+        def metrics():
+            avg_wt_tat(data)
+            return n
+        return metrics
+    if name == 'gantt':
+        import matplotlib.figure  # noqa: F401 -- imported here, outside the timing
+        from gantt import save_gantt_chart
+        _, execution_log = ALGORITHMS['rr'](data, tq)
+
+        def gantt():
+            save_gantt_chart(execution_log, data, io.BytesIO())
+            return len(execution_log)
+        return gantt
+    if name == 'rr':
+        run = lambda: ALGORITHMS['rr'](data, tq)
+    else:
+        run = lambda: ALGORITHMS[name](data)
+    # Every task arrives and completes once, plus one event per execution_log segment
+    return lambda: 2 * n + len(run()[1])
+
+
+def run_benchmark(name, workload, tq=4, repeat=3, measure_memory=True):
+    """
+    Time one algorithm on one workload.
+
+    :param name: Key of BENCHMARKS.
+    :param workload: List of task dictionaries (left unchanged).
+    :param tq: Time quantum for Round Robin.
+    :param repeat: Number of timed runs; the fastest one is reported.
+    :param measure_memory: Do one more run under tracemalloc for the peak memory.
+    :return: Result row with 'seconds', 'events', 'events_per_sec' and 'peak_bytes'
+             (None when memory is not measured).
+    """
+    best = None
+    events = 0
+    for _ in range(repeat):
+        run = _prepare(name, workload, tq)
+        gc.collect()
+        start = time.perf_counter()
+        events = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if measure_memory:
+        # tracemalloc slows allocation down a lot, so it gets a run of its own
+        run = _prepare(name, workload, tq)
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        'algorithm': name,
+        'size': len(workload),
+        'seconds': best,
+        'events': events,
+        'events_per_sec': events / best if best > 0 else None,
+        'peak_bytes': peak,
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, algorithms=None, seed=0, tq=4, repeat=3, measure_memory=True, progress=None):
+    """
+    Run every benchmark at every workload size.
+
+    :param sizes: Workload sizes.
+    :param algorithms: Keys of BENCHMARKS to run. Defaults to all but OPTIONAL_BENCHMARKS.
+    :param seed: Seed of the generated workloads (see workload.generate_workload).
+    :param tq: Time quantum for Round Robin.
+    :param repeat: Timed runs per benchmark.
+    :param measure_memory: Also report the peak traced memory.
+    :param progress: Function called with each result row as it is produced.
+    :return: Dictionary with 'meta' (run settings and environment) and 'results'.
+    """
+    if algorithms is None:
+        algorithms = [name for name in BENCHMARKS if name not in OPTIONAL_BENCHMARKS]
+    algorithms = list(algorithms)
+    for name in algorithms:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark '{name}'")
+    results = []
+    for size in sizes:
+        workload = generate_workload(size, seed=seed)
+        for name in algorithms:
+            row = run_benchmark(name, workload, tq, repeat, measure_memory)
+            results.append(row)
+            if progress:
+                progress(row)
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    meta = {
+        'seed': seed,
+        'tq': tq,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': numpy_version,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    return {'meta': meta, 'results': results}
+
+
+def find_regressions(results, baseline, threshold=1.25, min_seconds=0.005):
+    """
+    Compare a run against a baseline run of the same benchmarks.
+
+    :param results: Result rows of the new run.
+    :param baseline: Result rows of the baseline run.
+    :param threshold: Ratio of new to baseline time (or peak memory) above which a
+                      benchmark counts as a regression.
+    :param min_seconds: Timings below this in both runs are too noisy to compare.
+    :return: List of (algorithm, size, metric, baseline value, new value) tuples.
+    """
+    previous = {(row['algorithm'], row['size']): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get((row['algorithm'], row['size']))
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if metric == 'seconds' and max(row['seconds'], old['seconds']) < min_seconds:
+                continue
+            if row[metric] is not None and old.get(metric) and row[metric] / old[metric] > threshold:
+                regressions.append((row['algorithm'], row['size'], metric, old[metric], row[metric]))
+    return regressions
+
+
+def format_row(row):
+    """
+    Format one result row as a line of the results table.
+    """
+    peak = '-' if row['peak_bytes'] is None else f"{row['peak_bytes'] / 2 ** 20:.1f}"
+    rate = '-' if row['events_per_sec'] is None else f"{row['events_per_sec']:.0f}"
+    return f"{row['algorithm']:<12} {row['size']:>9} {row['seconds']:>10.4f} {row['events']:>11} {rate:>13} {peak:>10}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every scheduling algorithm on generated workloads.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="Workload sizes")
+    parser.add_argument('--algorithms', nargs='+', choices=BENCHMARKS, help="Benchmarks to run (default: all but gantt)")
+    parser.add_argument('--seed', type=int, default=0, help="Workload seed")
+    parser.add_argument('--tq', type=int, default=4, help="Time quantum for Round Robin")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per benchmark; the fastest is kept")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc run")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against the results in this JSON file")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="Slowdown (or memory growth) ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    print(f"{'Algorithm':<12} {'Size':>9} {'Seconds':>10} {'Events':>11} {'Events/sec':>13} {'Peak MiB':>10}")
+    suite = run_suite(args.sizes, args.algorithms, args.seed, args.tq, max(args.repeat, 1), not args.no_memory,
+                      progress=lambda row: print(format_row(row), flush=True))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(suite, f, indent=2)
+
+    if baseline is not None:
+        regressions = find_regressions(suite['results'], baseline, args.threshold)
+        for name, size, metric, old, new in regressions:
+            print(f"REGRESSION {name} size {size}: {metric} {old:.4g} -> {new:.4g} ({new / old:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions above {args.threshold:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,397 @@
+# binlog.py
+
+import mmap
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, mapped logs are then read with struct
+    np = None
+
+# File layout: a 16 byte header, then one fixed-size little-endian record per segment
+# (task index, core, start, end), so a log can be appended to while it is written and
+# mapped as a record array when it is read.
+MAGIC = b'CPULOG\x00'
+VERSION = 1
+HEADER = struct.Struct('<7sBc?6x')  # Magic, version, time type ('q' int64 or 'd' float64), has core column
+RECORD_FORMATS = {'q': '<iiqq', 'd': '<iidd'}
+FLUSH_RECORDS = 65536  # Records buffered by ExecutionLogWriter between writes
+
+
+def _time_code(float_times):
+    return 'd' if float_times else 'q'
+
+
+def _check_core(with_core, core):
+    if with_core and core is None:
+        raise ValueError("This execution log has a core column; pass core with the other columns")
+
+
+def _record_dtype(time_code):
+    time_type = '<f8' if time_code == 'd' else '<i8'
+    return np.dtype([('task', '<i4'), ('core', '<i4'), ('start', time_type), ('end', time_type)])
+
+
+class ExecutionLog:
+    """
+    Execution log stored as one array per column instead of a list of tuples: 20
+    bytes per segment (24 with the core column) instead of about 100.
+
+    It behaves like the list the schedulers build, so it can be passed to them as
+    ``log``: entries are read and written as (task_index, start, end) tuples, or
+    (task_index, start, end, core) with ``with_core``. Times are int64 until a float
+    is appended, which switches the time columns to float64.
+    """
+
+    __slots__ = ('task', 'start', 'end', 'core')
+
+    def __init__(self, with_core=False, float_times=False):
+        """
+        :param with_core: Keep a core column, for multi-core logs (see smp.py).
+        :param float_times: Store times as float64 from the start.
+        """
+        code = _time_code(float_times)
+        self.task = array('i')
+        self.start = array(code)
+        self.end = array(code)
+        self.core = array('i') if with_core else None
+
+    @property
+    def with_core(self):
+        return self.core is not None
+
+    @property
+    def float_times(self):
+        return self.start.typecode == 'd'
+
+    @property
+    def nbytes(self):
+        """Memory used by the columns, in bytes."""
+        columns = self._arrays()
+        return sum(len(column) * column.itemsize for column in columns)
+
+    def _use_float_times(self):
+        self.start = array('d', self.start)
+        self.end = array('d', self.end)
+
+    def __len__(self):
+        return len(self.task)
+
+    def __iter__(self):
+        if self.core is None:
+            return zip(self.task, self.start, self.end)
+        return zip(self.task, self.start, self.end, self.core)
+
+    def __getitem__(self, i):
+        if self.core is None:
+            return self.task[i], self.start[i], self.end[i]
+        return self.task[i], self.start[i], self.end[i], self.core[i]
+
+    def __setitem__(self, i, entry):
+        try:
+            self.start[i] = entry[1]
+            self.end[i] = entry[2]
+        except TypeError:
+            self._use_float_times()
+            self.start[i] = entry[1]
+            self.end[i] = entry[2]
+        self.task[i] = entry[0]
+        if self.core is not None:
+            self.core[i] = entry[3]
+
+    def append(self, entry):
+        """
+        Add one (task_index, start, end[, core]) segment.
+        """
+        try:
+            self.start.append(entry[1])
+        except TypeError:
+            self._use_float_times()
+            self.start.append(entry[1])
+        try:
+            self.end.append(entry[2])
+        except TypeError:
+            self._use_float_times()
+            self.end.append(entry[2])
+        self.task.append(entry[0])
+        if self.core is not None:
+            self.core.append(entry[3])
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def extend_columns(self, task, start, end, core=None):
+        """
+        Add many segments at once from column sequences (e.g. NumPy arrays).
+        """
+        _check_core(self.with_core, core)
+        if np is not None and isinstance(start, np.ndarray):
+            if start.dtype.kind == 'f' or np.asarray(end).dtype.kind == 'f':
+                if not self.float_times:
+                    self._use_float_times()
+            time_type = np.float64 if self.float_times else np.int64
+            self.task.frombytes(np.asarray(task, dtype=np.int32).tobytes())
+            self.start.frombytes(np.asarray(start, dtype=time_type).tobytes())
+            self.end.frombytes(np.asarray(end, dtype=time_type).tobytes())
+            if self.core is not None:
+                self.core.frombytes(np.asarray(core, dtype=np.int32).tobytes())
+            return
+        if core is None:
+            self.extend(zip(task, start, end))
+        else:
+            self.extend(zip(task, start, end, core))
+
+    def _arrays(self):
+        columns = (self.task, self.start, self.end)
+        return columns if self.core is None else columns + (self.core,)
+
+    def columns(self):
+        """
+        The log as columns: (task_index, start, end), plus core with ``with_core``.
+
+        With NumPy these are arrays sharing memory with the log (the log cannot
+        grow while they are alive); without it they are the array.array columns.
+        """
+        columns = self._arrays()
+        if np is None:
+            return columns
+        return tuple(np.frombuffer(column, dtype=column.typecode) for column in columns)
+
+    def save(self, path):
+        """
+        Write the log to a binary log file (see open_log).
+        """
+        with ExecutionLogWriter(path, with_core=self.with_core, float_times=self.float_times) as writer:
+            writer.extend_columns(*self.columns())
+
+
+class ExecutionLogWriter:
+    """
+    Execution log that is written to a binary log file as it grows.
+
+    Schedulers can append to it directly (pass it as ``log``). Only the last entry
+    is kept in memory, since it is the only one a scheduler reads back (to extend a
+    segment); the others are written out in batches. Close it, or use it as a
+    context manager, to flush the file.
+
+    The time type is fixed in the file header, so unlike ExecutionLog the writer
+    cannot switch to float64 once records are written. By default it takes the
+    type of the first entry; a float entry in an int64 log raises ValueError.
+    """
+
+    def __init__(self, path, with_core=False, float_times=None):
+        """
+        :param path: Output file path.
+        :param with_core: Entries carry a fourth (core) field.
+        :param float_times: Store times as float64 (True) or int64 (False); None
+                            decides from the first entry.
+        """
+        self.with_core = with_core
+        self.float_times = float_times
+        self._record = None
+        self._file = open(path, 'wb')
+        self._buffer = bytearray()
+        self._buffered = 0
+        self._last = None
+        self._count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _check_last(self, i):
+        if self._last is None or i not in (-1, self._count - 1):
+            raise IndexError("Only the last entry of a log being written can be accessed")
+
+    def __getitem__(self, i):
+        self._check_last(i)
+        return self._last
+
+    def __setitem__(self, i, entry):
+        self._check_last(i)
+        self._last = entry
+
+    def _start_file(self, float_times):
+        # Write the header once the time type is known
+        if self.float_times is None:
+            self.float_times = float_times
+        self._record = struct.Struct(RECORD_FORMATS[_time_code(self.float_times)])
+        self._file.write(HEADER.pack(MAGIC, VERSION, _time_code(self.float_times).encode(), self.with_core))
+
+    def _pack_last(self):
+        entry = self._last
+        if self._record is None:
+            self._start_file(isinstance(entry[1], float) or isinstance(entry[2], float))
+        if not self.float_times and (isinstance(entry[1], float) or isinstance(entry[2], float)):
+            raise ValueError(f"Execution log entry {tuple(entry)} has float times, but the log stores "
+                             f"int64 times; open the writer with float_times=True")
+        self._buffer += self._record.pack(entry[0], entry[3] if self.with_core else 0, entry[1], entry[2])
+        self._buffered += 1
+        self._last = None
+        if self._buffered >= FLUSH_RECORDS:
+            self.flush()
+
+    def append(self, entry):
+        """
+        Add one (task_index, start, end[, core]) segment.
+        """
+        if self._last is not None:
+            self._pack_last()
+        self._last = entry
+        self._count += 1
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def extend_columns(self, task, start, end, core=None):
+        """
+        Add many segments at once from column sequences (e.g. NumPy arrays).
+        """
+        _check_core(self.with_core, core)
+        if np is None:
+            self.extend(zip(task, start, end, core) if core is not None else zip(task, start, end))
+            return
+        if self._last is not None:
+            self._pack_last()
+        float_columns = np.asarray(start).dtype.kind == 'f' or np.asarray(end).dtype.kind == 'f'
+        if self._record is None:
+            self._start_file(float_columns)
+        elif float_columns and not self.float_times:
+            raise ValueError("Float time columns cannot be written to a log that stores int64 times; "
+                             "open the writer with float_times=True")
+        self.flush()
+        records = np.empty(len(task), dtype=_record_dtype(_time_code(self.float_times)))
+        records['task'] = task
+        records['core'] = 0 if core is None else core
+        records['start'] = start
+        records['end'] = end
+        self._file.write(records.tobytes())
+        self._count += len(records)
+
+    def flush(self):
+        """
+        Write buffered entries to the file (all but the last one).
+        """
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+            self._buffered = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            if self._last is not None:
+                self._pack_last()
+            if self._record is None:
+                self._start_file(False)  # Empty log
+            self.flush()
+        finally:
+            self._file.close()
+
+
+class MappedLog:
+    """
+    Read-only execution log backed by a memory-mapped binary log file.
+
+    Nothing is read up front, so logs larger than memory can be opened; pages are
+    loaded by the OS as entries are accessed. With NumPy, columns() returns views
+    into the mapping without copying.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is not an execution log file")
+            magic, version, time_code, with_core = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an execution log file")
+            if version != VERSION:
+                raise ValueError(f"Unsupported execution log version {version}")
+            self.float_times = time_code == b'd'
+            self.with_core = with_core
+            self._record = struct.Struct(RECORD_FORMATS[time_code.decode()])
+            size = f.seek(0, 2)
+            self._count = (size - HEADER.size) // self._record.size
+            self._map = None
+            if self._count:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._records = None
+        if np is not None:
+            dtype = _record_dtype(time_code.decode())
+            if self._map is None:
+                self._records = np.empty(0, dtype=dtype)
+            else:
+                self._records = np.frombuffer(self._map, dtype=dtype, count=self._count, offset=HEADER.size)
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, record):
+        task, core, start, end = record
+        return (task, start, end, core) if self.with_core else (task, start, end)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("execution log index out of range")
+        return self._entry(self._record.unpack_from(self._map, HEADER.size + i * self._record.size))
+
+    def __iter__(self):
+        if self._map is None:
+            return
+        view = memoryview(self._map)[HEADER.size:HEADER.size + self._count * self._record.size]
+        try:
+            for record in self._record.iter_unpack(view):
+                yield self._entry(record)
+        finally:
+            view.release()
+
+    def columns(self):
+        """
+        The log as columns: (task_index, start, end), plus core for multi-core logs.
+
+        With NumPy these are strided views of the mapped file; without it they are
+        array.array copies.
+        """
+        names = ('task', 'start', 'end', 'core') if self.with_core else ('task', 'start', 'end')
+        if self._records is not None:
+            return tuple(self._records[name] for name in names)
+        time_code = 'd' if self.float_times else 'q'
+        columns = (array('i'), array(time_code), array(time_code), array('i'))
+        for entry in self:
+            for column, value in zip(columns, entry):
+                column.append(value)
+        return columns[:len(names)]
+
+    def close(self):
+        """
+        Release the mapping. Views returned by columns() must not be used afterwards.
+        """
+        self._records = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Column views are still alive; the mapping goes away with them
+            self._map = None
+
+
+def open_log(path):
+    """
+    Open a binary execution log file written by ExecutionLogWriter or ExecutionLog.save.
+
+    :param path: File path.
+    :return: MappedLog.
+    """
+    return MappedLog(path)
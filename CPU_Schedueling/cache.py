@@ -0,0 +1,158 @@
+# cache.py
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from taskset import TaskSet
+
+DEFAULT_MEMORY_BYTES = 256 * 2 ** 20
+DEFAULT_DISK_BYTES = 2 * 2 ** 30
+
+
+def result_key(data, algorithm, params=()):
+    """
+    Content hash identifying one run: the task set, the algorithm and its parameters.
+
+    Only 'id', 'at', 'bt' and 'pr' are hashed, so results of earlier runs stored on
+    the task dictionaries do not change the key.
+
+    :param data: List of task dictionaries.
+    :param algorithm: Algorithm name.
+    :param params: Extra arguments of the run, e.g. (tq,) for Round Robin.
+    :return: Hex SHA-256 digest.
+    """
+    task_set = TaskSet.from_dicts(data)
+    digest = hashlib.sha256()
+    digest.update(repr((algorithm, tuple(params), len(task_set))).encode())
+    # repr keeps the ID type apart: 1 and '1' are different tasks to the caller
+    digest.update('\x00'.join(map(repr, task_set.id)).encode())
+    for column in (task_set.at, task_set.bt, task_set.pr):
+        # The element type is part of the key: 5 and 5.0 give differently typed results
+        digest.update(str(getattr(column, 'dtype', None) or column.typecode).encode())
+        digest.update(column.tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of scheduling results.
+
+    Values are stored pickled, so every hit returns a fresh copy that the caller may
+    modify, and the memory tier can be held to an exact byte budget. The memory tier
+    evicts the least recently used entries; the optional disk tier keeps one file per
+    key and evicts the files with the oldest access time. Safe to use from several
+    threads.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MEMORY_BYTES, directory=None, max_disk_bytes=DEFAULT_DISK_BYTES):
+        """
+        :param max_bytes: Memory budget for pickled values.
+        :param directory: Directory of the disk tier, or None for memory only.
+        :param max_disk_bytes: Budget of the disk tier.
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> pickled value, least recently used first
+        self._size = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.pkl')
+
+    def _remember(self, key, blob):
+        # Caller holds the lock
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        if len(blob) > self.max_bytes:
+            return
+        self._entries[key] = blob
+        self._size += len(blob)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def get(self, key):
+        """
+        Look up a value, memory tier first.
+
+        :param key: Key from result_key.
+        :return: A copy of the cached value, or None on a miss.
+        """
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+            elif self.directory:
+                try:
+                    with open(self._path(key), 'rb') as f:
+                        blob = f.read()
+                    os.utime(self._path(key))  # Mark as recently used for disk eviction
+                except OSError:
+                    blob = None
+                if blob is not None:
+                    self._remember(key, blob)
+            if blob is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return pickle.loads(blob)
+
+    def put(self, key, value):
+        """
+        Store a value in both tiers, evicting old entries to stay within budget.
+
+        :param key: Key from result_key.
+        :param value: Any picklable value.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, blob)
+            if self.directory and len(blob) <= self.max_disk_bytes:
+                path = self._path(key)
+                temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp, 'wb') as f:
+                    f.write(blob)
+                os.replace(temp, path)  # Readers never see a partly written file
+                self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl'):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """
+        Drop every entry from both tiers.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if self.directory:
+                for name in os.listdir(self.directory):
+                    if name.endswith('.pkl'):
+                        os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,224 @@
+# cli.py
+
+import argparse
+import csv
+import json
+import logging
+import sys
+
+from algorithm import ALGORITHMS, avg_wt_tat
+from binlog import ExecutionLog, ExecutionLogWriter, open_log
+from instrument import Instrumentation, format_report
+from smp import POLICIES, QUEUE_MODES, smp_schedule
+from streaming import STREAMING_ALGORITHMS, RunningMetrics
+from tracing import NULL_TRACER, LoggingTracer
+from workload import iter_workload, load_workload
+
+RESULT_FIELDS = ('id', 'at', 'bt', 'pr', 'ct', 'tat', 'wt')
+LOG_FIELDS = ('task_id', 'start', 'end')
+
+
+def _open_csv(path, header):
+    """
+    Open a CSV output file and write its header.
+
+    :return: Tuple of (file object, csv writer), or (None, None) if path is empty.
+    """
+    if not path:
+        return None, None
+    f = open(path, 'w', newline='')
+    writer = csv.writer(f)
+    writer.writerow(header)
+    return f, writer
+
+
+def _make_tracer(path):
+    """
+    Build a tracer writing one line per scheduler event to path.
+
+    :param path: Trace file path, or None for no tracing.
+    :return: Tracer.
+    """
+    if not path:
+        return NULL_TRACER
+    logger = logging.getLogger('cpu_scheduling.cli')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = logging.FileHandler(path, mode='w')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    return LoggingTracer(logger)
+
+
+def _metrics(args, result, execution_log, tracer):
+    if args.cores:
+        return avg_wt_tat(result, tracer=tracer, execution_log=execution_log, cores=args.cores)
+    return avg_wt_tat(result, tracer=tracer)
+
+
+def run_batch(args):
+    """
+    Load the whole workload, run the algorithm and write the output files.
+
+    :return: Metrics dictionary.
+    """
+    data = load_workload(args.workload)
+    if not data:
+        raise ValueError("The workload is empty")
+    tracer = _make_tracer(args.trace)
+    algorithm = ALGORITHMS[args.algorithm]
+    instrumentation = None
+    if args.instrument or args.profile or args.memory:
+        instrumentation = Instrumentation(tracer, profile=args.profile, memory=args.memory)
+        tracer = instrumentation
+
+    log = None
+    binary_log = bool(args.log) and args.log.lower().endswith('.bin')
+    if binary_log:
+        float_times = any(isinstance(task['at'], float) or isinstance(task['bt'], float) for task in data)
+        if args.cores:
+            log = ExecutionLog(with_core=True, float_times=float_times)  # Multi-core runs revisit older segments
+        else:
+            log = ExecutionLogWriter(args.log, float_times=float_times)  # Segments go straight to the file
+    run_log = log
+    if instrumentation:
+        run_log = instrumentation.wrap_log(log)
+        instrumentation.start()
+    try:
+        if args.cores:
+            result, execution_log = smp_schedule(data, args.algorithm, args.cores, tq=args.tq,
+                                                 queue_mode=args.queue_mode, tracer=tracer, log=run_log)
+        elif args.algorithm == 'rr':
+            result, execution_log = algorithm(data, args.tq, compact=args.compact, tracer=tracer, log=run_log)
+        elif args.algorithm == 'mlfq':
+            result, execution_log = algorithm(data, quanta=args.levels, aging=args.aging, boost=args.boost,
+                                              tracer=tracer, log=run_log)
+        else:
+            result, execution_log = algorithm(data, tracer=tracer, log=run_log)
+    finally:
+        if isinstance(log, ExecutionLogWriter):
+            log.close()
+    if instrumentation:
+        execution_log = run_log.target
+    if isinstance(log, ExecutionLog):
+        log.save(args.log)
+    if binary_log:
+        execution_log = open_log(args.log)
+    if instrumentation:
+        with instrumentation.phase('metrics'):
+            metrics = _metrics(args, result, execution_log, instrumentation.tracer)
+        instrumentation.stop()
+        metrics['instrumentation'] = instrumentation.report()
+    else:
+        metrics = _metrics(args, result, execution_log, tracer)
+
+    f, writer = _open_csv(args.results, RESULT_FIELDS)
+    if writer:
+        with f:
+            writer.writerows([task[field] for field in RESULT_FIELDS] for task in result)
+    f, writer = _open_csv(None if binary_log else args.log, LOG_FIELDS + ('core',) if args.cores else LOG_FIELDS)
+    if writer:
+        with f:
+            writer.writerows((result[entry[0]]['id'],) + tuple(entry[1:]) for entry in execution_log)
+    if args.gantt:
+        from gantt import save_gantt_chart  # Only needs matplotlib when a chart is requested
+        save_gantt_chart(execution_log, result, args.gantt)
+    return metrics
+
+
+def run_stream(args):
+    """
+    Stream the workload through the algorithm, writing segments and results as they
+    are produced. The workload must be sorted by arrival time.
+
+    :return: Metrics dictionary.
+    """
+    tasks = iter_workload(args.workload)
+    if args.algorithm == 'rr':
+        events = STREAMING_ALGORITHMS['rr'](tasks, args.tq)
+    else:
+        events = STREAMING_ALGORITHMS[args.algorithm](tasks)
+    metrics = RunningMetrics()
+
+    results_file, results = _open_csv(args.results, RESULT_FIELDS)
+    log_file, log = _open_csv(args.log, LOG_FIELDS)
+    try:
+        for event in metrics.observe(events):
+            if event[0] == 'segment':
+                if log:
+                    log.writerow((event[1]['id'], event[2], event[3]))
+            elif results:
+                results.writerow([event[1][field] for field in RESULT_FIELDS])
+    finally:
+        for f in (results_file, log_file):
+            if f:
+                f.close()
+    return metrics.snapshot()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a CPU scheduling algorithm on a workload file without the GUI.")
+    parser.add_argument('workload', help="Workload file: .csv with a header row, .jsonl or .json "
+                                         "(columns 'id', 'at', 'bt' and optionally 'pr')")
+    parser.add_argument('-a', '--algorithm', choices=list(ALGORITHMS), default='fcfs', help="Scheduling algorithm")
+    parser.add_argument('--tq', type=int, help="Time quantum for Round Robin")
+    parser.add_argument('--compact', action='store_true', help="Round Robin: merge back-to-back quanta of a lone task")
+    parser.add_argument('--levels', type=int, nargs='+', default=[4, 8, 16], metavar='TQ',
+                        help="MLFQ: time quantum of each level, top level first")
+    parser.add_argument('--aging', type=int, help="MLFQ: move a task up a level after waiting this long")
+    parser.add_argument('--boost', type=int, help="MLFQ: move every task to the top level at this interval")
+    parser.add_argument('--cores', type=int, help="Simulate a multi-core machine with this many cores")
+    parser.add_argument('--queue-mode', choices=QUEUE_MODES, default='global',
+                        help="With --cores: one shared ready queue, or per-core queues with work stealing")
+    parser.add_argument('--results', help="Write per-task CT/TAT/WT to this CSV file")
+    parser.add_argument('--log', help="Write the execution log (task_id, start, end) to this CSV file, or to a "
+                                         "compact binary file if the name ends in .bin (task indexes instead of IDs)")
+    parser.add_argument('--trace', help="Write one line per scheduler event to this file (not with --stream)")
+    parser.add_argument('--gantt', help="Render the Gantt chart to this image file (.png, .svg, ...; not with --stream)")
+    parser.add_argument('--summary', help="Write the summary metrics to this JSON file")
+    parser.add_argument('--stream', action='store_true',
+                        help="Process the workload as a stream (it must be sorted by arrival time)")
+    parser.add_argument('--instrument', action='store_true',
+                        help="Report time per scheduler phase, context switches, preemptions and queue lengths")
+    parser.add_argument('--profile', action='store_true', help="Also profile the run with cProfile (implies --instrument)")
+    parser.add_argument('--memory', action='store_true',
+                        help="Also report the peak memory and top allocation sites (implies --instrument)")
+    args = parser.parse_args(argv)
+
+    if args.algorithm == 'rr' and (args.tq is None or args.tq <= 0):
+        parser.error("Round Robin needs a positive --tq")
+    if args.stream and (args.trace or args.gantt):
+        parser.error("--trace and --gantt are not available with --stream; use --log instead")
+    if args.stream and (args.instrument or args.profile or args.memory):
+        parser.error("--instrument, --profile and --memory need a batch run")
+    if args.cores is not None and (args.cores < 1 or args.stream):
+        parser.error("--cores needs a positive core count and is not available with --stream")
+    if args.stream and args.log and args.log.lower().endswith('.bin'):
+        parser.error("--stream writes the log as CSV; binary .bin logs need a batch run")
+    if args.cores is not None and args.algorithm not in POLICIES:
+        parser.error(f"--cores supports {', '.join(POLICIES)}")
+    if args.stream and args.algorithm not in STREAMING_ALGORITHMS:
+        parser.error(f"--stream supports {', '.join(STREAMING_ALGORITHMS)}")
+
+    try:
+        metrics = run_stream(args) if args.stream else run_batch(args)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    for key, value in metrics.items():
+        if key == 'instrumentation':
+            continue
+        if isinstance(value, list):
+            value = ', '.join(f"{v:.2f}" for v in value)
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+    if 'instrumentation' in metrics:
+        print(format_report(metrics['instrumentation']))
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(metrics, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
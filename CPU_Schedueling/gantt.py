@@ -0,0 +1,296 @@
+# gantt.py
+
+import math
+
+from taskset import log_chunks
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, segments are then binned in plain Python
+    np = None
+
+BAR_HEIGHT = 0.4
+BAR_COLOR = 'skyblue'
+MAX_LABELS = 300  # Segment labels drawn at most, beyond that the chart is unreadable anyway
+MAX_EDGED_SEGMENTS = 2000  # Above this many visible segments, bar outlines are dropped
+MAX_VECTOR_SEGMENTS = 20000  # Above this many, vector formats (SVG, PDF) embed the bars as an image
+MAX_ROW_COLLECTIONS = 200  # Above this many visible task rows, all bars share one collection
+MAX_TICK_LABELS = 50  # Above this many task rows, only some rows get a y tick label
+
+
+def _task_label(task):
+    return f"P{task['id']}"
+
+
+def _label_order(task_details):
+    """
+    Order of the task rows on the y axis: numerically by ID when every ID is a
+    number, otherwise alphabetically.
+
+    :return: List of task indexes, top row last.
+    """
+    indexes = range(len(task_details))
+    try:
+        return sorted(indexes, key=lambda i: float(task_details[i]['id']))
+    except (TypeError, ValueError):
+        return sorted(indexes, key=lambda i: str(task_details[i]['id']))
+
+
+def _row_index(execution_log, task_details):
+    """
+    Assign the tasks in the execution log to y axis rows, in one pass over the log.
+
+    :param execution_log: Sequence of (task_index, start_time, end_time), or a log
+                          with columns() such as binlog.ExecutionLog or MappedLog.
+    :param task_details: List of task dictionaries.
+    :return: Tuple of (order, row_of, first, last): the task index of each row (see
+             _label_order; only tasks in the log), the row of each task index (an
+             array with -1 for tasks not in the log, or a dictionary without NumPy),
+             and the first segment start and last segment end.
+    """
+    first, last = None, None
+    if np is not None:
+        present = np.zeros(len(task_details), dtype=bool)
+        for chunk in log_chunks(execution_log):
+            present[chunk[0].astype(np.int64, copy=False)] = True
+            start, end = chunk[1].min().item(), chunk[2].max().item()
+            first = start if first is None or start < first else first
+            last = end if last is None or end > last else last
+        order = [index for index in _label_order(task_details) if present[index]]
+        row_of = np.full(len(task_details), -1, dtype=np.int64)
+        row_of[order] = np.arange(len(order))
+        return order, row_of, first, last
+
+    present = set()
+    for entry in execution_log:
+        present.add(entry[0])
+        first = entry[1] if first is None or entry[1] < first else first
+        last = entry[2] if last is None or entry[2] > last else last
+    order = [index for index in _label_order(task_details) if index in present]
+    return order, {index: row for row, index in enumerate(order)}, first, last
+
+
+def _visible_bars(execution_log, row_of, first_row, last_row, rows_per_lane, x0, x1, pixels):
+    """
+    Bin the segments in view into a grid of lanes by pixel columns, and return the
+    busy runs of each lane as bars.
+
+    Rows are grouped into lanes of ``rows_per_lane`` rows (one lane per pixel when
+    there are more rows than pixels). Every segment overlapping [x0, x1] marks the
+    pixel columns it touches in its lane, at least one so that short segments stay
+    visible, and each run of marked columns becomes one bar. The log is read in
+    chunks (see taskset.log_chunks), so memory use depends on the grid size rather
+    than on the log size.
+
+    :param row_of: Row of each task index, from _row_index.
+    :param pixels: Width of [x0, x1] in pixels.
+    :return: Tuple of (lanes, starts, widths) of the bars, by lane then start time.
+    """
+    first_lane = first_row // rows_per_lane
+    count = last_row // rows_per_lane - first_lane + 1
+    time_per_px = (x1 - x0) / pixels
+    if np is not None:
+        # Difference array per lane: +1 where a segment's columns begin, -1 past their end
+        size = count * (pixels + 1)
+        marks = np.zeros(size, dtype=np.int64)
+        for chunk in log_chunks(execution_log):
+            rows = row_of[chunk[0].astype(np.int64, copy=False)]
+            starts, ends = chunk[1], chunk[2]
+            keep = (rows >= first_row) & (rows <= last_row) & (ends > x0) & (starts < x1)
+            if not keep.any():
+                continue
+            offsets = (rows[keep] // rows_per_lane - first_lane) * (pixels + 1)
+            begin = np.clip(np.floor((starts[keep] - x0) / time_per_px), 0, pixels - 1).astype(np.int64)
+            stop = np.minimum(np.maximum(np.ceil((ends[keep] - x0) / time_per_px), begin + 1), pixels)
+            marks += np.bincount(offsets + begin, minlength=size)
+            marks -= np.bincount(offsets + stop.astype(np.int64), minlength=size)
+        busy = np.zeros((count, pixels + 2), dtype=np.int8)
+        busy[:, 1:-1] = np.cumsum(marks.reshape(count, pixels + 1), axis=1)[:, :pixels] > 0
+        edges = np.diff(busy, axis=1)
+        # Starts and ends come out lane by lane, left to right, so they pair up
+        lanes, begin = np.nonzero(edges == 1)
+        _, stop = np.nonzero(edges == -1)
+        return lanes + first_lane, x0 + begin * time_per_px, (stop - begin) * time_per_px
+
+    grid = [bytearray(pixels) for _ in range(count)]
+    for entry in execution_log:
+        row, start, end = row_of[entry[0]], entry[1], entry[2]
+        if first_row <= row <= last_row and end > x0 and start < x1:
+            begin = min(max(math.floor((start - x0) / time_per_px), 0), pixels - 1)
+            stop = min(max(math.ceil((end - x0) / time_per_px), begin + 1), pixels)
+            grid[row // rows_per_lane - first_lane][begin:stop] = b'\x01' * (stop - begin)
+    lanes, starts, widths = [], [], []
+    for lane, cells in enumerate(grid):
+        begin = cells.find(1)
+        while begin >= 0:
+            stop = cells.find(0, begin)
+            stop = pixels if stop < 0 else stop
+            lanes.append(first_lane + lane)
+            starts.append(x0 + begin * time_per_px)
+            widths.append((stop - begin) * time_per_px)
+            begin = cells.find(1, stop)
+    return lanes, starts, widths
+
+
+class GanttChart:
+    """
+    Gantt chart drawn with one broken_barh collection per task.
+
+    The collections are rebuilt whenever the visible range changes (e.g. when
+    zooming), keeping only the visible rows and segments, binned down to pixel
+    resolution, so drawing cost depends on the screen size rather than on the log
+    size. Only the row of each task is kept in memory; the log itself is read in
+    chunks on every redraw, so a memory-mapped log larger than memory can be drawn.
+    When more task rows are visible than there are pixels, neighbouring rows share
+    a lane of one pixel, and when more lanes are visible than MAX_ROW_COLLECTIONS,
+    all bars go into a single collection instead.
+    """
+
+    def __init__(self, ax, execution_log, task_details, min_label_px=24, draw=True):
+        """
+        :param ax: Matplotlib Axes to draw into.
+        :param execution_log: Sequence of (task_index, start_time, end_time).
+        :param task_details: List of task dictionaries.
+        :param min_label_px: Segments narrower than this many pixels get no text label.
+        :param draw: Draw the bars right away. Pass False when the layout is still
+                     going to change, and call redraw() once it is final.
+        """
+        self.ax = ax
+        self.task_details = task_details
+        self.min_label_px = min_label_px
+        self.execution_log = execution_log
+        self.order, self.row_of, x0, x1 = _row_index(execution_log, task_details)
+        self._artists = []
+
+        ax.set_xlabel("Time")
+        ax.set_ylabel("Tasks")
+        ax.set_title("Gantt Chart")
+        ax.grid(axis='x', linestyle='--', alpha=0.7)
+        labels = [_task_label(task_details[i]) for i in self.order]
+        if len(labels) <= MAX_TICK_LABELS:
+            ax.set_yticks(range(len(labels)))
+            ax.set_yticklabels(labels)
+        else:
+            from matplotlib.ticker import FuncFormatter, MaxNLocator
+            ax.yaxis.set_major_locator(MaxNLocator(nbins=20, integer=True))
+            ax.yaxis.set_major_formatter(FuncFormatter(
+                lambda y, _: labels[int(y)] if 0 <= y < len(labels) and y == int(y) else ''))
+        ax.set_ylim(-0.5, len(self.order) - 0.5)
+
+        if self.order:
+            ax.set_xlim(x0, x1 if x1 > x0 else x0 + 1)
+        ax.set_autoscale_on(False)
+        if draw:
+            self.redraw()
+        ax.callbacks.connect('xlim_changed', lambda _: self.redraw())
+        ax.callbacks.connect('ylim_changed', lambda _: self.redraw())
+
+    def redraw(self):
+        """
+        Rebuild the bars and labels for the current view.
+        """
+        for artist in self._artists:
+            artist.remove()
+        self._artists = []
+        if not self.order:
+            return
+
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = sorted(self.ax.get_ylim())
+        first_row = max(int(y0 + 0.5 - BAR_HEIGHT / 2), 0)
+        last_row = min(int(y1 + 0.5 + BAR_HEIGHT / 2), len(self.order) - 1)
+        if first_row > last_row:
+            return
+        extent = self.ax.get_window_extent()
+        pixels = max(int(extent.width), 1)
+        time_per_px = (x1 - x0) / pixels
+        rows_per_lane = -(-(last_row - first_row + 1) // max(int(extent.height), 1))
+        lanes, starts, widths = _visible_bars(self.execution_log, self.row_of, first_row, last_row, rows_per_lane,
+                                              x0, x1, pixels)
+        total = len(starts)
+        edge = {'edgecolor': 'black', 'linewidth': 0.5} if total <= MAX_EDGED_SEGMENTS else {'linewidth': 0}
+        low = -BAR_HEIGHT / 2
+        height = rows_per_lane - 1 + BAR_HEIGHT  # A lane covers the bars of all its rows
+        min_label_width = self.min_label_px * time_per_px
+        vectorized = np is not None and isinstance(starts, np.ndarray)
+        if vectorized:
+            lane_bounds = (np.flatnonzero(np.diff(lanes)) + 1).tolist()
+            labelled = np.flatnonzero(widths >= min_label_width)[:MAX_LABELS].tolist()
+        else:
+            lane_bounds = [i for i in range(1, total) if lanes[i] != lanes[i - 1]]
+            labelled = [i for i, width in enumerate(widths) if width >= min_label_width][:MAX_LABELS]
+
+        if total and len(lane_bounds) < MAX_ROW_COLLECTIONS:
+            if vectorized:
+                lanes, starts, widths = lanes.tolist(), starts.tolist(), widths.tolist()
+            for begin, end in zip([0] + lane_bounds, lane_bounds + [total]):
+                self._artists.append(self.ax.broken_barh(
+                    list(zip(starts[begin:end], widths[begin:end])),
+                    (lanes[begin] * rows_per_lane + low, height), facecolors=BAR_COLOR, **edge))
+        elif total:
+            from matplotlib.collections import PolyCollection
+            if vectorized:
+                bottoms = lanes * rows_per_lane + low
+                verts = np.empty((total, 4, 2))
+                verts[:, :2, 0] = starts[:, None]
+                verts[:, 2:, 0] = (starts + widths)[:, None]
+                verts[:, (0, 3), 1] = bottoms[:, None]
+                verts[:, 1:3, 1] = (bottoms + height)[:, None]
+            else:
+                verts = [((start, bottom), (start, bottom + height), (start + width, bottom + height),
+                          (start + width, bottom))
+                         for start, width, bottom in zip(starts, widths, [lane * rows_per_lane + low for lane in lanes])]
+            # The bars are binned to pixel size anyway, so nothing is lost by rasterizing them
+            bars = PolyCollection(verts, facecolors=BAR_COLOR, rasterized=total > MAX_VECTOR_SEGMENTS, **edge)
+            self._artists.append(self.ax.add_collection(bars, autolim=False))
+
+        if rows_per_lane == 1:
+            for i in labelled:
+                row, start, width = int(lanes[i]), float(starts[i]), float(widths[i])
+                self._artists.append(self.ax.text(start + width / 2, row,
+                                                  _task_label(self.task_details[self.order[row]]),
+                                                  ha='center', va='center', color='black', clip_on=True))
+        self.ax.figure.canvas.draw_idle()
+
+
+def plot_gantt_chart(execution_log, task_details):
+    """
+    Show an interactive Gantt chart window.
+
+    :param execution_log: Sequence of (task_index, start_time, end_time).
+    :param task_details: List of task dictionaries.
+    :return: GanttChart, or None if the log is empty.
+    """
+    if not len(execution_log):
+        print("Execution log is empty. No Gantt chart to display.")
+        return None
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    chart = GanttChart(ax, execution_log, task_details, draw=False)
+    fig.tight_layout()
+    chart.redraw()
+    plt.show()
+    return chart
+
+
+def save_gantt_chart(execution_log, task_details, path, dpi=100, figsize=(12, 6)):
+    """
+    Render a Gantt chart straight to an image file, without a display or pyplot.
+
+    :param execution_log: Sequence of (task_index, start_time, end_time).
+    :param task_details: List of task dictionaries.
+    :param path: Output path; the format (e.g. PNG or SVG) follows the extension.
+    :param dpi: Resolution for raster formats.
+    :param figsize: Figure size in inches.
+    """
+    if not len(execution_log):
+        raise ValueError("Execution log is empty. No Gantt chart to render.")
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    chart = GanttChart(ax, execution_log, task_details, draw=False)
+    fig.tight_layout()
+    chart.redraw()
+    fig.savefig(path)
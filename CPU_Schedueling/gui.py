@@ -1,12 +1,49 @@
 # gui.py
 
+import os
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from collections import OrderedDict
+from tkinter import ttk, messagebox, filedialog
 from algorithm import (first_come_first_serve, round_robin, shortest_job_first,
-                      priority_non_preemptive, priority_preemptive, avg_wt_tat)
-import copy
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+                      priority_non_preemptive, priority_preemptive, shortest_remaining_time_first,
+                      multilevel_feedback_queue, avg_wt_tat)
+from cache import ResultCache, result_key
+from gantt import plot_gantt_chart
+from incremental import IncrementalScheduler
+from tracing import ProgressTracer, RunCancelled
+from workload import load_workload
+import matplotlib
+
+# Use the TkAgg backend for Tkinter compatibility
+matplotlib.use('TkAgg')
+
+# Scheduler behind each entry of the algorithm menu
+SCHEDULERS = {
+    "First Come First Serve": first_come_first_serve,
+    "Round Robin": round_robin,
+    "Shortest Job First": shortest_job_first,
+    "Priority Non-Preemptive": priority_non_preemptive,
+    "Priority Preemptive": priority_preemptive,
+    "Shortest Remaining Time First": shortest_remaining_time_first,
+    "Multilevel Feedback Queue": multilevel_feedback_queue,
+}
+
+# Menu entries that are kept up to date incrementally as the task list is edited (see incremental.py)
+INCREMENTAL_POLICIES = {
+    "First Come First Serve": 'fcfs',
+    "Round Robin": 'rr',
+    "Shortest Job First": 'sjf',
+    "Priority Non-Preemptive": 'priority_np',
+    "Priority Preemptive": 'priority_p',
+    "Shortest Remaining Time First": 'srtf',
+}
+
+POLL_INTERVAL_MS = 100  # How often the Tk loop checks on a background run
+PAGE_SIZE = 200  # Rows shown by the task table at a time
+CACHE_DIR_ENV = 'CPU_SCHEDULING_CACHE_DIR'  # Set to keep results on disk between sessions too
+MAX_INCREMENTAL = 4  # Incremental schedulers kept, least recently run dropped first; each holds a copy of the tasks
 
 
 class TaskSchedulerGUI:
@@ -16,20 +53,23 @@ class TaskSchedulerGUI:
         self.root.geometry("1200x700")  # Increased window size to accommodate Gantt chart
 
         self.tasks = []
+        self.task_ids = set()  # IDs in self.tasks, for O(1) uniqueness checks
+        self.page = 0  # Page of self.tasks shown in the task table
+        self.results_cache = ResultCache(directory=os.environ.get(CACHE_DIR_ENV) or None)
+        self.incremental = OrderedDict()  # (algorithm, args) -> IncrementalScheduler following self.tasks, LRU order
         self.selected_algorithm = tk.StringVar()
         self.time_quantum = tk.StringVar()
 
+        # State of the background run, if any
+        self.worker = None
+        self.worker_results = None
+        self.cancel_event = None
+
         self.create_widgets()
 
     def create_widgets(self):
         # Dropdown to select algorithm
-        algorithms = [
-            "First Come First Serve",
-            "Round Robin",
-            "Shortest Job First",
-            "Priority Non-Preemptive",
-            "Priority Preemptive"
-        ]
+        algorithms = list(SCHEDULERS)
         ttk.Label(self.root, text="Select Algorithm:").grid(row=0, column=0, padx=10, pady=10, sticky='W')
         self.algorithm_menu = ttk.Combobox(self.root, values=algorithms, textvariable=self.selected_algorithm, state='readonly')
         self.algorithm_menu.grid(row=0, column=1, padx=10, pady=10, sticky='W')
@@ -75,10 +115,32 @@ class TaskSchedulerGUI:
             self.task_table.heading(col, text=col)
         self.task_table.grid(row=7, column=0, columnspan=2, padx=10, pady=10)
 
+        # Bulk import and page navigation for the task table
+        table_controls = ttk.Frame(self.root)
+        table_controls.grid(row=11, column=0, columnspan=2, padx=10, pady=5, sticky='W')
+        ttk.Button(table_controls, text="Import File", command=self.import_tasks).pack(side='left', padx=(0, 20))
+        self.prev_page_button = ttk.Button(table_controls, text="< Prev", command=lambda: self.show_page(self.page - 1))
+        self.prev_page_button.pack(side='left')
+        self.page_label = tk.StringVar()
+        ttk.Label(table_controls, textvariable=self.page_label).pack(side='left', padx=10)
+        self.next_page_button = ttk.Button(table_controls, text="Next >", command=lambda: self.show_page(self.page + 1))
+        self.next_page_button.pack(side='left')
+        self.update_page_label()
+
         # Run Algorithm Button
         self.run_button = ttk.Button(self.root, text="Run Algorithm", command=self.run_algorithm)
         self.run_button.grid(row=8, column=0, padx=10, pady=10, sticky='W')
 
+        # Cancel Button, only enabled while a run is in progress
+        self.cancel_button = ttk.Button(self.root, text="Cancel", command=self.cancel_run, state='disabled')
+        self.cancel_button.grid(row=8, column=1, padx=10, pady=10, sticky='W')
+
+        # Progress of the current run
+        self.progress = ttk.Progressbar(self.root, mode='determinate', length=300)
+        self.progress.grid(row=9, column=0, columnspan=2, padx=10, pady=5, sticky='W')
+        self.status = tk.StringVar()
+        ttk.Label(self.root, textvariable=self.status).grid(row=10, column=0, columnspan=2, padx=10, sticky='W')
+
         # Output Area
         self.output_text = tk.Text(self.root, height=25, width=80)
         self.output_text.grid(row=7, column=2, rowspan=4, padx=10, pady=10)
@@ -94,7 +156,7 @@ class TaskSchedulerGUI:
         priority = self.priority.get()
 
         # Check if Task ID is unique
-        if any(task['id'] == task_id for task in self.tasks):
+        if task_id in self.task_ids:
             messagebox.showerror("Input Error", f"Task ID '{task_id}' already exists. Please use a unique Task ID.")
             return
 
@@ -106,7 +168,15 @@ class TaskSchedulerGUI:
                 'pr': int(priority)
             }
             self.tasks.append(task)
-            self.update_task_table()
+            self.task_ids.add(task_id)
+            self.edit_incremental(lambda scheduler: scheduler.add_task(task))
+            last_page = self.last_page()
+            if self.page == last_page:
+                # The new task lands on the page being shown, so only its row is inserted
+                self.task_table.insert("", "end", values=(task['id'], task['at'], task['bt'], task['pr']))
+                self.update_page_label()
+            else:
+                self.show_page(last_page)
             self.clear_input_fields()
         else:
             messagebox.showerror("Input Error", "Please enter valid Task ID, Arrival Time, Burst Time, and Priority.")
@@ -117,22 +187,101 @@ class TaskSchedulerGUI:
         """
         selected_item = self.task_table.selection()
         if selected_item:
-            task_index = self.task_table.index(selected_item[0])
-            del self.tasks[task_index]
-            self.update_task_table()
+            task_index = self.page * PAGE_SIZE + self.task_table.index(selected_item[0])
+            task = self.tasks.pop(task_index)
+            self.task_ids.discard(task['id'])
+            self.edit_incremental(lambda scheduler: scheduler.remove_task(task['id']))
+            self.task_table.delete(selected_item[0])
+
+            # Pull the first task of the next page up so the page stays full
+            page_end = (self.page + 1) * PAGE_SIZE
+            if page_end <= len(self.tasks):
+                moved = self.tasks[page_end - 1]
+                self.task_table.insert("", "end", values=(moved['id'], moved['at'], moved['bt'], moved['pr']))
+            if not self.task_table.get_children() and self.page > 0:
+                self.show_page(self.page - 1)
+            else:
+                self.update_page_label()
         else:
             messagebox.showerror("Selection Error", "Please select a task to delete.")
 
+    def import_tasks(self):
+        """
+        Bulk-load tasks from a CSV, JSON Lines or JSON workload file (see workload.py).
+        The whole file is rejected if it repeats a Task ID or reuses an existing one.
+        """
+        path = filedialog.askopenfilename(
+            title="Import Tasks",
+            filetypes=[("Workload files", "*.csv *.jsonl *.ndjson *.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            tasks = load_workload(path)
+        except (OSError, ValueError) as exc:
+            messagebox.showerror("Import Error", str(exc))
+            return
+        duplicates = [task['id'] for task in tasks if task['id'] in self.task_ids]
+        if duplicates:
+            messagebox.showerror("Import Error", f"Task ID '{duplicates[0]}' already exists. Please use unique Task IDs.")
+            return
+
+        self.tasks.extend(tasks)
+        self.task_ids.update(task['id'] for task in tasks)
+        # A bulk import usually lands all over the timeline, so rolling back saves little
+        self.incremental.clear()
+        self.show_page(self.page)
+        self.status.set(f"Imported {len(tasks)} tasks from {path}.")
+
+    def edit_incremental(self, edit):
+        """
+        Apply a task list edit to every incremental scheduler, so that the next run
+        only re-simulates from the edited task's arrival time.
+
+        :param edit: Function called with each IncrementalScheduler.
+        """
+        if self.worker is not None:
+            # A background run may be using one of them; start over on the next run
+            self.incremental.clear()
+            return
+        for scheduler in self.incremental.values():
+            edit(scheduler)
+
+    def last_page(self):
+        """
+        :return: Index of the last page of the task table.
+        """
+        return max(len(self.tasks) - 1, 0) // PAGE_SIZE
+
+    def show_page(self, page):
+        """
+        Show one page of PAGE_SIZE tasks in the task table.
+
+        :param page: Page index; clamped to the valid range.
+        """
+        self.page = min(max(page, 0), self.last_page())
+        self.update_task_table()
+
     def update_task_table(self):
         """
-        Refresh the task table to display the current list of tasks.
+        Refresh the task table to display the current page of tasks.
         """
         # Clear existing entries
-        for item in self.task_table.get_children():
-            self.task_table.delete(item)
-        # Insert all tasks
-        for task in self.tasks:
+        children = self.task_table.get_children()
+        if children:
+            self.task_table.delete(*children)
+        # Insert the tasks of the current page
+        start = self.page * PAGE_SIZE
+        for task in self.tasks[start:start + PAGE_SIZE]:
             self.task_table.insert("", "end", values=(task['id'], task['at'], task['bt'], task['pr']))
+        self.update_page_label()
+
+    def update_page_label(self):
+        """
+        Update the page indicator and the state of the navigation buttons.
+        """
+        self.page_label.set(f"Page {self.page + 1} / {self.last_page() + 1} ({len(self.tasks)} tasks)")
+        self.prev_page_button.config(state='normal' if self.page > 0 else 'disabled')
+        self.next_page_button.config(state='normal' if self.page < self.last_page() else 'disabled')
 
     def clear_input_fields(self):
         """
@@ -145,62 +294,154 @@ class TaskSchedulerGUI:
 
     def run_algorithm(self):
         """
-        Execute the selected scheduling algorithm and display the results.
+        Start the selected scheduling algorithm on a background thread.
+
+        The Tk event loop stays free while the simulation runs; progress and results
+        come back through a queue that is polled with root.after.
         """
+        if self.worker is not None:
+            return
         algorithm = self.selected_algorithm.get()
         if not algorithm:
             messagebox.showerror("Selection Error", "Please select an algorithm.")
             return
+        if algorithm not in SCHEDULERS:
+            messagebox.showerror("Selection Error", "Invalid algorithm selected.")
+            return
 
-        data_copy = copy.deepcopy(self.tasks)
-
-        result, order_or_log = None, None
-        if algorithm == "First Come First Serve":
-            result, order_or_log = first_come_first_serve(data_copy)
-        elif algorithm == "Round Robin":
+        args = ()
+        if algorithm == "Round Robin":
             tq = self.time_quantum.get()
-            if not tq.isdigit():
+            if not tq.isdigit() or int(tq) == 0:
                 messagebox.showerror("Input Error", "Please enter a valid Time Quantum for Round Robin.")
                 return
-            result, order_or_log = round_robin(data_copy, int(tq))
-        elif algorithm == "Shortest Job First":
-            result, order_or_log = shortest_job_first(data_copy)
-        elif algorithm == "Priority Non-Preemptive":
-            result, order_or_log = priority_non_preemptive(data_copy)
-        elif algorithm == "Priority Preemptive":
-            result, order_or_log = priority_preemptive(data_copy)
-        else:
-            messagebox.showerror("Selection Error", "Invalid algorithm selected.")
-            return
+            args = (int(tq),)
+
+        tasks = list(self.tasks)  # Snapshot; the worker copies the tasks only if the result is not cached
+        incremental = None
+        load = False
+        if algorithm in INCREMENTAL_POLICIES:
+            incremental = self.incremental.get((algorithm, args))
+            if incremental is None:
+                incremental = IncrementalScheduler(INCREMENTAL_POLICIES[algorithm], *args)
+                load = True
+                self.incremental[(algorithm, args)] = incremental
+                while len(self.incremental) > MAX_INCREMENTAL:
+                    self.incremental.popitem(last=False)
+            else:
+                self.incremental.move_to_end((algorithm, args))
+
+        results = queue.Queue()
+        self.worker_results = results
+        self.cancel_event = threading.Event()
+        tracer = ProgressTracer(callback=lambda completed: results.put(('progress', completed)),
+                                cancel_event=self.cancel_event)
+        self.worker = threading.Thread(target=self._run_worker,
+                                       args=(SCHEDULERS[algorithm], tasks, args, tracer, results,
+                                             self.results_cache, incremental, load),
+                                       daemon=True)
+
+        self.run_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        self.progress.config(maximum=max(len(self.tasks), 1), value=0)
+        self.status.set(f"Running {algorithm} on {len(self.tasks)} tasks...")
+        self.worker.start()
+        self.root.after(POLL_INTERVAL_MS, self._poll_worker, algorithm)
+
+    @staticmethod
+    def _run_worker(scheduler, tasks, args, tracer, results, cache=None, incremental=None, load=False):
+        """
+        Body of the background thread. It must not touch any Tk widget; everything
+        goes back to the main thread through the results queue.
 
-        if result is not None:
+        The result cache is checked first. On a miss, the run goes through the
+        IncrementalScheduler if there is one (``load`` if it is new and needs the
+        task list), or else the scheduler itself, and the result is cached.
+        """
+        try:
+            if load:
+                incremental.add_tasks(tasks)  # Even on a cache hit, so it follows later edits
+            key = result_key(tasks, scheduler.__name__, args) if cache is not None else None
+            cached = cache.get(key) if key is not None else None
+            if cached is not None:
+                results.put(('done',) + cached)
+                return
+            if incremental is not None:
+                result, execution_log = incremental.run(tracer=tracer)
+            else:
+                # Schedulers only add 'ct', 'tat' and 'wt' keys, so a shallow copy of each task is enough
+                data = [dict(task) for task in tasks]
+                result, execution_log = scheduler(data, *args, tracer=tracer)
             # Ensure all tasks have completion time
-            missing_ct = [task for task in result if 'ct' not in task]
-            if missing_ct:
-                messagebox.showerror("Algorithm Error", "Some tasks did not complete. 'ct' not set for all tasks.")
+            if any('ct' not in task for task in result):
+                results.put(('error', "Some tasks did not complete. 'ct' not set for all tasks."))
                 return
+            avg_times = avg_wt_tat(result) if result else None
+            if key is not None:
+                cache.put(key, (result, execution_log, avg_times))
+            results.put(('done', result, execution_log, avg_times))
+        except RunCancelled:
+            results.put(('cancelled',))
+        except Exception as exc:  # Report any scheduler failure in the GUI instead of losing it
+            results.put(('error', str(exc)))
+
+    def _poll_worker(self, algorithm):
+        """
+        Drain messages from the background run; reschedules itself until the run ends.
+        """
+        message = None
+        try:
+            while True:
+                message = self.worker_results.get_nowait()
+                if message[0] == 'progress':
+                    self.progress.config(value=message[1])
+                    self.status.set(f"{algorithm}: {message[1]} tasks completed...")
+                else:
+                    break
+        except queue.Empty:
+            message = None
+
+        if message is None:
+            self.root.after(POLL_INTERVAL_MS, self._poll_worker, algorithm)
+            return
 
-            avg_times = avg_wt_tat(result)
+        self.worker = None
+        self.worker_results = None
+        self.run_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+
+        if message[0] == 'cancelled':
+            self.progress.config(value=0)
+            self.status.set("Run cancelled.")
+        elif message[0] == 'error':
+            self.status.set("Run failed.")
+            messagebox.showerror("Algorithm Error", message[1])
+        else:
+            _, result, execution_log, avg_times = message
+            self.progress.config(value=self.progress.cget('maximum'))
+            self.status.set(f"{algorithm} finished.")
+            if avg_times is not None:
+                self.show_results(algorithm, result, execution_log, avg_times)
 
-            if algorithm == "Round Robin":
-                # For RR, order_or_log is execution_log
-                # Format execution order as list of strings
-                execution_order = [f"P{exec[0]}" for exec in order_or_log]
-                self.display_output(result, avg_times, execution_order)
-                # Generate Gantt chart using execution_log
-                plot_gantt_chart(order_or_log, result)
-            else:
-                # For other algorithms, order_or_log is execution_log
-                print("Execution Log:", order_or_log)  # Debugging statement
-                try:
-                    # Attempt to access by task_index
-                    execution_order = [f"P{result[exec[0]]['id']}" for exec in order_or_log]
-                except TypeError:
-                    # If exec[0] is not integer, handle accordingly
-                    execution_order = [f"P{exec[0]}" for exec in order_or_log]
-                self.display_output(result, avg_times, execution_order)
-                # Generate Gantt chart
-                plot_gantt_chart(order_or_log, result)
+    def cancel_run(self):
+        """
+        Ask the background run to stop; it unwinds at its next progress check.
+        """
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.status.set("Cancelling...")
+
+    def show_results(self, algorithm, result, execution_log, avg_times):
+        """
+        Display the results of a finished run and draw its Gantt chart.
+        """
+        if algorithm == "Round Robin":
+            # Format execution order as list of strings
+            execution_order = [f"P{exec[0]}" for exec in execution_log]
+        else:
+            execution_order = [f"P{result[exec[0]]['id']}" for exec in execution_log]
+        self.display_output(result, avg_times, execution_order)
+        plot_gantt_chart(execution_log, result)
 
     def display_output(self, result, avg_times, order):
         """
@@ -211,12 +452,15 @@ class TaskSchedulerGUI:
         :param order: List representing the execution order of tasks.
         """
         self.output_text.delete("1.0", tk.END)
-        for task in result:
-            self.output_text.insert(
-                tk.END, f"Task {task['id']}: CT={task['ct']}, TAT={task['tat']}, WT={task['wt']}\n"
-            )
+        # One insert for all task lines is much cheaper for the Text widget than one per task
+        self.output_text.insert(tk.END, ''.join(
+            f"Task {task['id']}: CT={task['ct']}, TAT={task['tat']}, WT={task['wt']}\n" for task in result))
         self.output_text.insert(tk.END, f"\nAverage TAT: {avg_times['avg_tat']:.2f}\n")
         self.output_text.insert(tk.END, f"Average WT: {avg_times['avg_wt']:.2f}\n")
+        if 'max_wt' in avg_times:
+            self.output_text.insert(tk.END, f"Max WT: {avg_times['max_wt']}\n")
+            self.output_text.insert(tk.END, f"P90 TAT: {avg_times['tat_p90']:.2f}, P90 WT: {avg_times['wt_p90']:.2f}\n")
+            self.output_text.insert(tk.END, f"Throughput: {avg_times['throughput']:.4f} tasks/unit time\n")
         if isinstance(order, list):
             # If order is execution_log, extract task execution order
             if all(isinstance(item, tuple) and len(item) == 3 for item in order):
@@ -231,51 +475,6 @@ class TaskSchedulerGUI:
                 self.output_text.insert(tk.END, f"\nExecution Order: {' -> '.join(order)}\n")
 
 
-def plot_gantt_chart(execution_log, task_details):
-    """
-    Plot Gantt chart based on execution_log and task_details.
-
-    :param execution_log: List of tuples (task_index, start_time, end_time)
-    :param task_details: List of task dictionaries
-    """
-    if not execution_log:
-        print("Execution log is empty. No Gantt chart to display.")
-        return
-
-    # Set Chinese font path (adjust the path as per your system)
-    font_path = 'C:/Windows/Fonts/simhei.ttf'  # Windows path for SimHei font
-    try:
-        font_prop = fm.FontProperties(fname=font_path)
-    except FileNotFoundError:
-        print(f"Font file not found: {font_path}")
-        print("Please ensure the path is correct or use another Chinese-supporting font.")
-        return
-
-    fig, ax = plt.subplots(figsize=(12, 6))  # Increased figure size
-
-    for exec in execution_log:
-        task_index, start_time, end_time = exec
-        # According to task_index, get task ID
-        task_id = task_details[task_index]['id']
-        task_label = f"P{task_id}"
-        ax.barh(task_label, width=(end_time - start_time), left=start_time, height=0.4, color='skyblue', edgecolor='black')
-        ax.text(start_time + (end_time - start_time)/2, task_label, task_label, ha='center', va='center', color='black', fontproperties=font_prop)
-
-    # Customize the chart
-    ax.set_xlabel("Time", fontproperties=font_prop)
-    ax.set_ylabel("Tasks", fontproperties=font_prop)
-    ax.set_title("Gantt Chart", fontproperties=font_prop)
-    ax.grid(axis='x', linestyle='--', alpha=0.7)
-
-    # Set y-axis task labels
-    task_ids = sorted(list(set([f"P{task['id']}" for task in task_details])), key=lambda x: int(x[1:]))
-    ax.set_yticks(range(len(task_ids)))
-    ax.set_yticklabels(task_ids, fontproperties=font_prop)
-
-    plt.tight_layout()
-    plt.show()  # Keeps the window open
-
-
 if __name__ == "__main__":
     root = tk.Tk()
     app = TaskSchedulerGUI(root)
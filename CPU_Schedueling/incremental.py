@@ -0,0 +1,317 @@
+# incremental.py
+
+import heapq
+from bisect import bisect_left, insort
+from collections import deque
+
+from smp import POLICY_KEYS  # Ties fall back to arrival time, then slot
+from tracing import NULL_TRACER
+
+POLICIES = ('fcfs', 'rr', 'sjf', 'priority_np', 'priority_p', 'srtf')
+CHECKPOINT_EVERY = 1024  # Scheduling decisions between checkpoints, at least
+
+
+class _Checkpoint:
+    """Scheduler state at the top of one scheduling decision."""
+
+    __slots__ = ('time', 'cursor', 'ready', 'remaining', 'log_length', 'last_segment')
+
+    def __init__(self, time, cursor, ready, remaining, log_length, last_segment):
+        self.time = time
+        self.cursor = cursor
+        self.ready = ready
+        self.remaining = remaining
+        self.log_length = log_length
+        self.last_segment = last_segment
+
+
+class IncrementalScheduler:
+    """
+    Scheduler that keeps its simulation between runs, so editing the task list only
+    re-simulates from the edit onwards.
+
+    Tasks live in stable slots (numbered in the order they were added, which is
+    also their tie-break order, like the task index in algorithm.py). While running,
+    the scheduler saves a checkpoint of its state every CHECKPOINT_EVERY decisions,
+    or every as many decisions as there are queued tasks if that is more, so that
+    copying the queues stays proportional to the work done. Adding or removing a
+    task rolls back to the last checkpoint taken before the task's arrival time;
+    nothing before that point can depend on the task. The next run() resumes from
+    there.
+
+    Queue entries are tuples and are never modified in place, so a checkpoint only
+    needs shallow copies of the queue and of the remaining times of started tasks.
+
+    Results match the batch schedulers of algorithm.py ('rr' without compaction).
+    """
+
+    def __init__(self, policy, tq=None, checkpoint_every=CHECKPOINT_EVERY):
+        """
+        :param policy: One of 'fcfs', 'rr', 'sjf', 'priority_np', 'priority_p' or 'srtf'.
+        :param tq: Time quantum, required for 'rr'.
+        :param checkpoint_every: Minimum number of decisions between checkpoints.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'")
+        if policy == 'rr' and (tq is None or tq <= 0):
+            raise ValueError("Round Robin needs a positive time quantum")
+        self.policy = policy
+        self.tq = tq
+        self.checkpoint_every = checkpoint_every
+        self._fifo = policy == 'rr'
+        self._preemptive = policy in ('priority_p', 'srtf')
+        self._by_remaining = policy == 'srtf'
+        self._key = POLICY_KEYS.get(policy)
+
+        self._tasks = []  # Task dictionary copies by slot; None once removed
+        self._slot_of = {}  # Task ID -> slot
+        self._arrivals = []  # (arrival time, slot) of every live task, sorted
+        self._log = []  # (slot, start, end)
+        self._checkpoints = []
+        self._checkpoint_times = []  # Time of each checkpoint, for bisection
+        self._restore(None)
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    @property
+    def finished(self):
+        """True if the simulation covers every task."""
+        return self._cursor == len(self._arrivals) and not self._ready
+
+    def _restore(self, checkpoint):
+        """
+        Reset the live state to a checkpoint, or to the start if checkpoint is None.
+        """
+        if checkpoint is None:
+            self._time = 0
+            self._cursor = 0
+            self._ready = deque() if self._fifo else []
+            self._remaining = {}
+            del self._log[:]
+        else:
+            self._time = checkpoint.time
+            self._cursor = checkpoint.cursor
+            self._ready = type(checkpoint.ready)(checkpoint.ready)
+            self._remaining = dict(checkpoint.remaining)
+            del self._log[checkpoint.log_length:]
+            if checkpoint.last_segment is not None:
+                self._log[-1] = checkpoint.last_segment  # It may have been extended since
+        self._since_checkpoint = 0
+
+    def _checkpoint(self):
+        self._checkpoints.append(_Checkpoint(self._time, self._cursor, type(self._ready)(self._ready),
+                                             dict(self._remaining), len(self._log),
+                                             self._log[-1] if self._log else None))
+        self._checkpoint_times.append(self._time)
+        self._since_checkpoint = 0
+
+    def _rollback(self, time):
+        """
+        Go back to the last checkpoint taken before ``time``.
+        """
+        if self._time < time:
+            # Nothing has been simulated at or after time, so the live state is still valid
+            return
+        keep = bisect_left(self._checkpoint_times, time)
+        del self._checkpoints[keep:]
+        del self._checkpoint_times[keep:]
+        self._restore(self._checkpoints[-1] if self._checkpoints else None)
+
+    def add_task(self, task):
+        """
+        Add a task; it is copied, and later results are written to the copy.
+
+        :param task: Task dictionary with a unique 'id'.
+        :return: Slot of the task.
+        """
+        if task['id'] in self._slot_of:
+            raise ValueError(f"Task ID '{task['id']}' already exists")
+        slot = len(self._tasks)
+        self._rollback(task['at'])
+        self._tasks.append(dict(task))
+        self._slot_of[task['id']] = slot
+        insort(self._arrivals, (task['at'], slot))
+        return slot
+
+    def add_tasks(self, tasks):
+        """
+        Add many tasks at once, rolling back only once.
+
+        :param tasks: Iterable of task dictionaries with unique IDs.
+        """
+        tasks = [dict(task) for task in tasks]
+        if not tasks:
+            return
+        for task in tasks:
+            if task['id'] in self._slot_of:
+                raise ValueError(f"Task ID '{task['id']}' already exists")
+        self._rollback(min(task['at'] for task in tasks))
+        for task in tasks:
+            slot = len(self._tasks)
+            self._tasks.append(task)
+            self._slot_of[task['id']] = slot
+            self._arrivals.append((task['at'], slot))
+        self._arrivals.sort()
+
+    def remove_task(self, task_id):
+        """
+        Remove the task with the given ID.
+
+        :param task_id: ID of a task added earlier.
+        """
+        slot = self._slot_of.pop(task_id)
+        task = self._tasks[slot]
+        self._rollback(task['at'])
+        del self._arrivals[bisect_left(self._arrivals, (task['at'], slot))]
+        self._tasks[slot] = None
+
+    def run(self, tracer=NULL_TRACER):
+        """
+        Simulate from the current state until every task has completed.
+
+        If the tracer raises (e.g. RunCancelled), the scheduler goes back to its last
+        checkpoint and the exception propagates; a later run() carries on from there.
+
+        :param tracer: Tracer receiving scheduling events (see tracing.py).
+        :return: Tuple of (task dictionaries, execution_log) like the schedulers in
+                 algorithm.py, with tasks in the order they were added.
+        """
+        try:
+            if self._fifo:
+                self._run_round_robin(tracer)
+            elif self._preemptive:
+                self._run_preemptive(tracer)
+            else:
+                self._run_ready_queue(tracer)
+        except BaseException:
+            self._restore(self._checkpoints[-1] if self._checkpoints else None)
+            raise
+
+        if len(self._slot_of) == len(self._tasks):
+            return list(self._tasks), list(self._log)  # No removed slots, so slots are the task indexes
+        index_of = [0] * len(self._tasks)
+        data = []
+        for slot, task in enumerate(self._tasks):
+            if task is not None:
+                index_of[slot] = len(data)
+                data.append(task)
+        return data, [(index_of[slot], start, end) for slot, start, end in self._log]
+
+    def _due(self):
+        # Checkpoint when enough decisions were made to pay for copying the queues
+        self._since_checkpoint += 1
+        return self._since_checkpoint >= max(self.checkpoint_every, len(self._ready) + len(self._remaining))
+
+    def _admit(self, tracer):
+        arrivals, tasks, ready = self._arrivals, self._tasks, self._ready
+        while self._cursor < len(arrivals) and arrivals[self._cursor][0] <= self._time:
+            slot = arrivals[self._cursor][1]
+            task = tasks[slot]
+            if self._fifo:
+                ready.append(slot)
+            else:
+                heapq.heappush(ready, (self._key(task), task['at'], slot))
+            self._cursor += 1
+            if tracer.enabled:
+                tracer.emit('arrival', task=task, time=task['at'])
+
+    def _idle(self, tracer):
+        next_arrival = self._arrivals[self._cursor][0]
+        if tracer.enabled:
+            tracer.emit('idle', time=self._time, next_time=next_arrival)
+        self._time = next_arrival
+
+    def _run_ready_queue(self, tracer):
+        # Mirrors algorithm._run_ready_queue
+        trace = tracer.enabled
+        ready, tasks, log = self._ready, self._tasks, self._log
+        while self._cursor < len(self._arrivals) or ready:
+            if self._due():
+                self._checkpoint()
+            self._admit(tracer)
+            if ready:
+                slot = ready[0][2]
+                task = tasks[slot]
+                start_time = self._time
+                end_time = start_time + task['bt']
+                log.append((slot, start_time, end_time))
+                task['ct'] = end_time
+                heapq.heappop(ready)
+                self._time = end_time
+                if trace:
+                    tracer.emit('dispatch', task=task, start=start_time, end=end_time, remaining=0, ready=len(ready))
+                    tracer.emit('complete', task=task, time=end_time)
+            else:
+                self._idle(tracer)
+
+    def _run_preemptive(self, tracer):
+        # Mirrors algorithm._run_preemptive
+        trace = tracer.enabled
+        ready, tasks, log, remaining = self._ready, self._tasks, self._log, self._remaining
+        arrivals = self._arrivals
+        while self._cursor < len(arrivals) or ready:
+            if self._due():
+                self._checkpoint()
+            self._admit(tracer)
+            if ready:
+                slot = ready[0][2]
+                task = tasks[slot]
+                left = remaining.get(slot, task['bt'])
+                start_time = self._time
+                end_time = start_time + left
+                if self._cursor < len(arrivals) and arrivals[self._cursor][0] < end_time:
+                    end_time = arrivals[self._cursor][0]
+                left -= end_time - start_time
+
+                if log and log[-1][0] == slot and log[-1][2] == start_time:
+                    log[-1] = (slot, log[-1][1], end_time)  # The same task keeps the CPU
+                else:
+                    log.append((slot, start_time, end_time))
+                if left == 0:
+                    heapq.heappop(ready)
+                    remaining.pop(slot, None)
+                    task['ct'] = end_time
+                else:
+                    remaining[slot] = left
+                    if self._by_remaining:
+                        heapq.heapreplace(ready, (left, task['at'], slot))  # Still the top
+                self._time = end_time
+                if trace:
+                    tracer.emit('dispatch', task=task, start=start_time, end=end_time, remaining=left,
+                                ready=len(ready) - (left > 0))
+                    if left == 0:
+                        tracer.emit('complete', task=task, time=end_time)
+            else:
+                self._idle(tracer)
+
+    def _run_round_robin(self, tracer):
+        # Mirrors algorithm.round_robin (compact=False)
+        trace = tracer.enabled
+        ready, tasks, log, remaining, tq = self._ready, self._tasks, self._log, self._remaining, self.tq
+        while self._cursor < len(self._arrivals) or ready:
+            if self._due():
+                self._checkpoint()
+            self._admit(tracer)
+            if ready:
+                slot = ready.popleft()
+                task = tasks[slot]
+                left = remaining.pop(slot, task['bt'])
+                exec_time = min(tq, left)
+                start_time = self._time
+                self._time = end_time = start_time + exec_time
+                left -= exec_time
+                log.append((slot, start_time, end_time))
+                if trace:
+                    tracer.emit('dispatch', task=task, start=start_time, end=end_time, remaining=left,
+                                ready=len(ready))
+                self._admit(tracer)  # Tasks that arrived during the slice go ahead of this one
+                if left > 0:
+                    remaining[slot] = left
+                    ready.append(slot)
+                else:
+                    task['ct'] = end_time
+                    if trace:
+                        tracer.emit('complete', task=task, time=end_time)
+            else:
+                self._idle(tracer)
@@ -0,0 +1,301 @@
+# instrument.py
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from tracing import NULL_TRACER, Tracer
+
+# Phase charged with the time spent in the scheduler before each kind of event
+EVENT_PHASES = {
+    'arrival': 'admission',
+    'dispatch': 'dispatch',
+    'preempt': 'dispatch',
+    'complete': 'completion',
+    'idle': 'idle',
+}
+PHASES = ('setup', 'admission', 'dispatch', 'completion', 'idle', 'logging', 'metrics', 'tracing', 'other')
+
+
+def _bucket(length):
+    """Lower bound of the power-of-two histogram bucket of a queue length."""
+    return 0 if length <= 0 else 1 << (length.bit_length() - 1)
+
+
+def _bucket_label(lower):
+    return str(lower) if lower < 2 else f"{lower}-{2 * lower - 1}"
+
+
+class _TimedLog:
+    """
+    Execution log wrapper charging the time spent writing entries to 'logging'.
+    Everything else is passed through to the wrapped log.
+    """
+
+    def __init__(self, instrumentation, target):
+        self.target = target
+        self._instrumentation = instrumentation
+
+    def __len__(self):
+        return len(self.target)
+
+    def __iter__(self):
+        return iter(self.target)
+
+    def __getitem__(self, i):
+        return self.target[i]
+
+    def __setitem__(self, i, entry):
+        start = time.perf_counter()
+        self.target[i] = entry
+        self._instrumentation._add_logging(time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+    def append(self, entry):
+        start = time.perf_counter()
+        self.target.append(entry)
+        self._instrumentation._add_logging(time.perf_counter() - start)
+
+    def extend(self, entries):
+        start = time.perf_counter()
+        self.target.extend(entries)
+        self._instrumentation._add_logging(time.perf_counter() - start)
+
+
+class Instrumentation(Tracer):
+    """
+    Tracer measuring where a scheduler run spends its time.
+
+    Schedulers only build events for enabled tracers, so instrumentation costs
+    nothing unless it is passed as the tracer. Phase timers work by charging the
+    time between two events to the phase of the second one: the time before an
+    'arrival' is admission, before a 'dispatch' it is ready-queue selection and
+    dispatch, and so on. The time spent in the instrumentation itself and in the
+    tracer it forwards to is charged to 'tracing' instead. Writing the execution
+    log is timed separately when the log is wrapped with wrap_log.
+
+    Counters cover events, context switches (a core starts a different task than
+    the one it ran last), preemptions (the task switched out was not finished, or
+    a 'preempt' event from schedulers whose dispatch events only know the planned
+    end of a slice, like smp.py) and idle jumps. The queue-length histogram counts dispatches by the number of
+    tasks left waiting, in power-of-two buckets.
+
+    Optionally, the run is also profiled with cProfile and/or tracemalloc between
+    start() and stop(); both slow the run down, and the phase timers with it.
+    """
+
+    enabled = True
+
+    def __init__(self, tracer=NULL_TRACER, profile=False, memory=False, top=20):
+        """
+        :param tracer: Tracer to forward every event to, e.g. a ProgressTracer.
+        :param profile: Profile the run with cProfile.
+        :param memory: Trace allocations with tracemalloc for the peak memory.
+        :param top: Number of functions and allocation sites in the report.
+        """
+        self.tracer = tracer
+        self.top = top
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.counters = dict.fromkeys(('arrivals', 'dispatches', 'completions', 'idle_jumps',
+                                       'context_switches', 'preemptions'), 0)
+        self.idle_time = 0
+        self.queue_lengths = {}  # Bucket lower bound -> dispatches
+        self.max_queue_length = 0
+        self._queue_total = 0
+        self._queue_samples = 0
+        self._last_task = {}  # Core (None on one CPU) -> (task, remaining) of its last dispatch
+        self._profiler = cProfile.Profile() if profile else None
+        self._memory = memory
+        self._pending_logging = 0.0  # Logging time since the last event, not to charge twice
+        self._started = None
+        self._mark = None
+        self._first = True
+        self.wall_seconds = None
+        self.peak_bytes = None
+        self.profile_text = None
+        self.top_allocations = None
+
+    def wrap_log(self, log=None):
+        """
+        Wrap an execution log so that writing to it is timed as 'logging'.
+
+        :param log: Log to wrap, or None for a new list.
+        :return: Log to pass to the scheduler; its ``target`` is the wrapped log.
+        """
+        return _TimedLog(self, [] if log is None else log)
+
+    def _add_logging(self, seconds):
+        self.phases['logging'] += seconds
+        self._pending_logging += seconds
+
+    def _charge(self, phase, now):
+        self.phases[phase] += now - self._mark - self._pending_logging
+        self._pending_logging = 0.0
+
+    def start(self):
+        """
+        Start the clock (and the profilers). Call right before running the scheduler.
+        """
+        if self._memory:
+            tracemalloc.start()
+        if self._profiler is not None:
+            self._profiler.enable()
+        self._started = self._mark = time.perf_counter()
+        self._first = True
+
+    def stop(self):
+        """
+        Stop the clock and the profilers; time since the last event counts as 'other'.
+        """
+        now = time.perf_counter()
+        self._charge('other', now)
+        self.wall_seconds = now - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(self.top)
+            self.profile_text = out.getvalue()
+        if self._memory:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            statistics = tracemalloc.take_snapshot().statistics('lineno')
+            tracemalloc.stop()
+            self.top_allocations = [(str(stat.traceback), stat.size, stat.count) for stat in statistics[:self.top]]
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of code as phase ``name``, e.g. computing the metrics.
+        """
+        start = time.perf_counter()
+        self._charge('other', start)
+        try:
+            yield
+        finally:
+            self._mark = time.perf_counter()
+            self.phases[name] = self.phases.get(name, 0.0) + self._mark - start
+
+    def emit(self, event, **fields):
+        now = time.perf_counter()
+        self._charge('setup' if self._first else EVENT_PHASES.get(event, 'other'), now)
+        self._first = False
+
+        counters = self.counters
+        if event == 'dispatch':
+            counters['dispatches'] += 1
+            core = fields.get('core')
+            task = fields['task']
+            last = self._last_task.get(core)
+            if last is not None and last[0] is not task:
+                counters['context_switches'] += 1
+                if last[1] > 0:
+                    counters['preemptions'] += 1
+            self._last_task[core] = (task, fields['remaining'])
+            ready = fields.get('ready')
+            if ready is not None:
+                bucket = _bucket(ready)
+                self.queue_lengths[bucket] = self.queue_lengths.get(bucket, 0) + 1
+                if ready > self.max_queue_length:
+                    self.max_queue_length = ready
+                self._queue_total += ready
+                self._queue_samples += 1
+        elif event == 'preempt':
+            counters['preemptions'] += 1
+            # Counted here, so the next dispatch on this core only counts the context switch
+            self._last_task[fields.get('core')] = (fields['task'], 0)
+        elif event == 'arrival':
+            counters['arrivals'] += 1
+        elif event == 'complete':
+            counters['completions'] += 1
+        elif event == 'idle':
+            counters['idle_jumps'] += 1
+            self.idle_time += fields['next_time'] - fields['time']
+
+        if self.tracer.enabled:
+            self.tracer.emit(event, **fields)
+        self._mark = time.perf_counter()
+        self.phases['tracing'] += self._mark - now
+
+    def report(self):
+        """
+        Collect the measurements.
+
+        :return: Dictionary with 'wall_seconds', 'phases' (seconds per phase),
+                 'counters', 'idle_time', 'queue_length' ('max', 'mean' and the
+                 'histogram' of dispatches by bucket label) and, when enabled,
+                 'peak_bytes', 'top_allocations' and 'profile'.
+        """
+        report = {
+            'wall_seconds': self.wall_seconds,
+            'phases': dict(self.phases),
+            'counters': dict(self.counters),
+            'idle_time': self.idle_time,
+            'queue_length': {
+                'max': self.max_queue_length,
+                'mean': self._queue_total / self._queue_samples if self._queue_samples else 0.0,
+                'histogram': {_bucket_label(lower): self.queue_lengths[lower] for lower in sorted(self.queue_lengths)},
+            },
+        }
+        if self._memory:
+            report['peak_bytes'] = self.peak_bytes
+            report['top_allocations'] = self.top_allocations
+        if self._profiler is not None:
+            report['profile'] = self.profile_text
+        return report
+
+
+def profile_run(scheduler, data, *args, tracer=NULL_TRACER, log=None, profile=False, memory=False, top=20, **kwargs):
+    """
+    Run a scheduler under instrumentation.
+
+    :param scheduler: Scheduling function, e.g. algorithm.round_robin or smp.smp_schedule.
+    :param data: List of task dictionaries.
+    :param args: Further positional arguments of the scheduler (e.g. the time quantum).
+    :param tracer: Tracer to forward events to.
+    :param log: Execution log to pass to the scheduler, or None for a new list.
+    :param profile: Also profile the run with cProfile.
+    :param memory: Also trace allocations with tracemalloc.
+    :param top: Number of functions and allocation sites in the report.
+    :param kwargs: Further keyword arguments of the scheduler.
+    :return: Tuple of (updated data, execution_log, Instrumentation).
+    """
+    instrumentation = Instrumentation(tracer, profile=profile, memory=memory, top=top)
+    timed_log = instrumentation.wrap_log(log)
+    instrumentation.start()
+    try:
+        result, execution_log = scheduler(data, *args, tracer=instrumentation, log=timed_log, **kwargs)
+    finally:
+        instrumentation.stop()
+    if execution_log is timed_log:
+        execution_log = timed_log.target
+    return result, execution_log, instrumentation
+
+
+def format_report(report):
+    """
+    Format a report of Instrumentation.report as text.
+    """
+    lines = [f"Wall time: {report['wall_seconds']:.4f} s"]
+    measured = sum(report['phases'].values()) or 1.0
+    for name, seconds in report['phases'].items():
+        if seconds:
+            lines.append(f"  {name:<11} {seconds:>10.4f} s {100 * seconds / measured:>6.1f}%")
+    lines.append("Counters:")
+    for name, count in report['counters'].items():
+        lines.append(f"  {name:<17} {count}")
+    lines.append(f"  {'idle_time':<17} {report['idle_time']}")
+    queue = report['queue_length']
+    lines.append(f"Ready queue length at dispatch: max {queue['max']}, mean {queue['mean']:.2f}")
+    for label, count in queue['histogram'].items():
+        lines.append(f"  {label:>13} {count}")
+    if 'peak_bytes' in report:
+        lines.append(f"Peak traced memory: {report['peak_bytes'] / 2 ** 20:.2f} MiB")
+        for site, size, count in report['top_allocations']:
+            lines.append(f"  {size / 1024:>10.1f} KiB {count:>8} blocks  {site}")
+    if 'profile' in report:
+        lines.append(report['profile'].rstrip())
+    return '\n'.join(lines)
@@ -0,0 +1,281 @@
+# montecarlo.py
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+
+from algorithm import ALGORITHMS
+from streaming import RunningStats
+from workload import (bursty_priorities, exponential_bursts, pareto_bursts, poisson_arrivals, uniform_arrivals,
+                      uniform_bursts)
+
+ARRIVALS = ('poisson', 'uniform', 'batch')
+BURSTS = ('pareto', 'exponential', 'uniform')
+COLUMNS = 3  # at, bt, pr; each an int64 column of one workload slot
+METRICS = ('avg_tat', 'avg_wt')
+
+# Shared workload slots of the current worker process, attached once by _init_worker
+_SHARED = None
+_COLUMNS = None
+
+
+def random_workload(n, rng, arrival='poisson', burst='pareto', load=0.9, mean_burst=8, alpha=1.5,
+                    priority_levels=10, max_burst=None):
+    """
+    Draw the columns of one random workload.
+
+    Every burst distribution is scaled to the same mean burst time, and the arrival
+    rate is set from it, so workloads from different distributions offer the same load.
+
+    :param n: Number of tasks.
+    :param rng: random.Random instance.
+    :param arrival: 'poisson' (exponential gaps), 'uniform' (uniform over the window
+                    the load implies) or 'batch' (everything at time 0).
+    :param burst: 'pareto' (heavy tail of shape alpha), 'exponential' or 'uniform'.
+    :param load: Offered load, mean burst time times arrival rate.
+    :param mean_burst: Mean burst time.
+    :param alpha: Pareto shape; must be above 1.
+    :param priority_levels: Number of distinct priorities (see workload.bursty_priorities).
+    :param max_burst: Largest burst time, or None for no cap.
+    :return: Tuple of (arrival times, burst times, priorities) lists, in arrival order.
+    """
+    if arrival == 'poisson':
+        at = poisson_arrivals(n, load / mean_burst, rng)
+    elif arrival == 'uniform':
+        at = uniform_arrivals(n, n * mean_burst / load, rng)
+    elif arrival == 'batch':
+        at = [0] * n
+    else:
+        raise ValueError(f"Unknown arrival distribution '{arrival}'")
+
+    if burst == 'pareto':
+        if alpha <= 1:
+            raise ValueError("The Pareto shape must be above 1")
+        # Rounding up adds half a time unit on average
+        bt = pareto_bursts(n, alpha, max(mean_burst - 0.5, 0.5) * (alpha - 1) / alpha, rng, max_burst)
+    elif burst == 'exponential':
+        bt = exponential_bursts(n, max(mean_burst - 0.5, 0.5), rng, max_burst)
+    elif burst == 'uniform':
+        bt = uniform_bursts(n, 1, max(2 * round(mean_burst) - 1, 1), rng)
+    else:
+        raise ValueError(f"Unknown burst distribution '{burst}'")
+    return at, bt, bursty_priorities(n, priority_levels, rng)
+
+
+def _to_dicts(at, bt, pr):
+    return [{'id': str(i), 'at': a, 'bt': b, 'pr': p} for i, (a, b, p) in enumerate(zip(at, bt, pr))]
+
+
+def _evaluate(data, name, tq):
+    """
+    Run one policy and return its (average TAT, average WT).
+    """
+    if name == 'rr':
+        result, _ = ALGORITHMS[name](data, tq)
+    else:
+        result, _ = ALGORITHMS[name](data)
+    # Only the means are needed, so skip avg_wt_tat and its percentiles
+    tat = sum(task['ct'] for task in result) - sum(task['at'] for task in result)
+    wt = tat - sum(task['bt'] for task in result)
+    return tat / len(result), wt / len(result)
+
+
+def _init_worker(name, n):
+    """
+    Process pool initializer: attach the shared workload slots.
+
+    :param name: Name of the SharedMemory block.
+    :param n: Tasks per workload.
+    """
+    global _SHARED, _COLUMNS
+    _SHARED = SharedMemory(name=name)
+    _COLUMNS = (_SHARED.buf.cast('q'), n)
+
+
+def _run_job(slot, name, tq):
+    """
+    Run one policy on the workload in one shared slot.
+
+    :param slot: Slot index.
+    :param name: Key of algorithm.ALGORITHMS.
+    :param tq: Time quantum for Round Robin.
+    :return: Tuple of (average TAT, average WT).
+    """
+    view, n = _COLUMNS
+    base = slot * COLUMNS * n
+    columns = [view[base + c * n:base + (c + 1) * n].tolist() for c in range(COLUMNS)]
+    return _evaluate(_to_dicts(*columns), name, tq)
+
+
+def _summarize(name, tq, stats, level):
+    row = {'algorithm': name, 'tq': tq if name == 'rr' else None, 'runs': stats['avg_tat'].count}
+    for metric in METRICS:
+        interval = stats[metric].confidence_interval(level)
+        row[metric] = stats[metric].mean
+        row[f'{metric}_std'] = stats[metric].std
+        row[f'{metric}_low'] = None if interval is None else interval[0]
+        row[f'{metric}_high'] = None if interval is None else interval[1]
+    return row
+
+
+def monte_carlo(runs, n, algorithms=None, tq=4, seed=0, confidence=0.95, max_workers=None, progress=None,
+                **distribution):
+    """
+    Evaluate policies over many random workloads.
+
+    Workload i is drawn from random.Random(f"{seed}:{i}"), so results do not depend
+    on the number of workers (up to rounding, as results come in in a different
+    order). Every policy runs on the same workloads. Per-workload
+    averages are folded into running statistics as they come in, so memory does
+    not grow with ``runs``.
+
+    With several workers, the parent process writes each workload once into a slot
+    of a shared memory block, and the workers read it from there for every policy.
+    Only twice as many workloads as there are workers are in flight at a time; a
+    slot is refilled once every policy has finished with it.
+
+    :param runs: Number of workloads.
+    :param n: Tasks per workload.
+    :param algorithms: Keys of algorithm.ALGORITHMS to run. Defaults to all of them.
+    :param tq: Time quantum for Round Robin.
+    :param seed: Base seed.
+    :param confidence: Level of the confidence intervals.
+    :param max_workers: Number of worker processes. Defaults to the CPU count; 1 runs
+                        everything in the current process.
+    :param progress: Function called with the number of finished workloads.
+    :param distribution: Keyword arguments of random_workload (arrival, burst, load, ...).
+    :return: Dictionary with 'meta' (settings) and 'results', one row per policy with
+             the mean, standard deviation and confidence interval ('_low', '_high')
+             of 'avg_tat' and 'avg_wt' across workloads.
+    """
+    algorithms = list(ALGORITHMS) if algorithms is None else list(algorithms)
+    for name in algorithms:
+        if name not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{name}'")
+    if 'rr' in algorithms and (tq is None or tq <= 0):
+        raise ValueError("Round Robin needs a positive time quantum")
+    if n <= 0:
+        raise ValueError("Workloads need at least one task")
+    random_workload(1, random.Random(0), **distribution)  # Check the distribution settings up front
+    stats = {name: {metric: RunningStats() for metric in METRICS} for name in algorithms}
+
+    def record(name, result):
+        for metric, value in zip(METRICS, result):
+            stats[name][metric].add(value)
+
+    workers = min(max_workers or os.cpu_count() or 1, max(runs, 1))
+    if workers == 1 or not algorithms:
+        for i in range(runs if algorithms else 0):
+            columns = random_workload(n, random.Random(f"{seed}:{i}"), **distribution)
+            for name in algorithms:
+                record(name, _evaluate(_to_dicts(*columns), name, tq))
+            if progress:
+                progress(i + 1)
+    else:
+        slots = 2 * workers
+        shared = SharedMemory(create=True, size=slots * COLUMNS * n * 8)
+        view = shared.buf.cast('q')
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.name, n)) as pool:
+                free = list(range(slots))
+                jobs_left = [0] * slots  # Unfinished jobs reading each slot
+                pending = {}  # Future -> (slot, algorithm)
+                started = finished = 0
+                while started < runs or pending:
+                    while started < runs and free:
+                        slot = free.pop()
+                        base = slot * COLUMNS * n
+                        columns = random_workload(n, random.Random(f"{seed}:{started}"), **distribution)
+                        for c, column in enumerate(columns):
+                            view[base + c * n:base + (c + 1) * n] = array('q', column)
+                        for name in algorithms:
+                            pending[pool.submit(_run_job, slot, name, tq)] = (slot, name)
+                        jobs_left[slot] = len(algorithms)
+                        started += 1
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        slot, name = pending.pop(future)
+                        record(name, future.result())
+                        jobs_left[slot] -= 1
+                        if jobs_left[slot] == 0:
+                            free.append(slot)
+                            finished += 1
+                            if progress:
+                                progress(finished)
+        finally:
+            view.release()
+            shared.close()
+            shared.unlink()
+
+    meta = {'runs': runs, 'tasks': n, 'seed': seed, 'tq': tq, 'confidence': confidence}
+    meta.update(distribution)
+    return {'meta': meta, 'results': [_summarize(name, tq, stats[name], confidence) for name in algorithms]}
+
+
+def format_table(rows, confidence=0.95):
+    """
+    Format the result rows of monte_carlo as a plain-text table.
+    """
+    ci = f"{confidence:.0%} CI"
+    lines = [f"{'Algorithm':<12} {'TQ':>4} {'Runs':>6} {'Avg TAT':>11} {'TAT ' + ci:>23} "
+             f"{'Avg WT':>11} {'WT ' + ci:>23}"]
+
+    def interval(row, metric):
+        if row[f'{metric}_low'] is None:
+            return '-'
+        return f"[{row[f'{metric}_low']:.2f}, {row[f'{metric}_high']:.2f}]"
+
+    for row in rows:
+        tq = '-' if row['tq'] is None else row['tq']
+        lines.append(f"{row['algorithm']:<12} {tq:>4} {row['runs']:>6} {row['avg_tat']:>11.2f} "
+                     f"{interval(row, 'avg_tat'):>23} {row['avg_wt']:>11.2f} {interval(row, 'avg_wt'):>23}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate scheduling algorithms over many random workloads.")
+    parser.add_argument('--runs', type=int, default=1000, help="Number of random workloads")
+    parser.add_argument('--tasks', type=int, default=200, help="Tasks per workload")
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), help="Policies to run (default: all)")
+    parser.add_argument('--tq', type=int, default=4, help="Time quantum for Round Robin")
+    parser.add_argument('--arrival', choices=ARRIVALS, default='poisson', help="Arrival time distribution")
+    parser.add_argument('--burst', choices=BURSTS, default='pareto', help="Burst time distribution")
+    parser.add_argument('--load', type=float, default=0.9, help="Offered load (mean burst time x arrival rate)")
+    parser.add_argument('--mean-burst', type=float, default=8, help="Mean burst time")
+    parser.add_argument('--alpha', type=float, default=1.5, help="Pareto shape of the burst times")
+    parser.add_argument('--max-burst', type=int, help="Largest burst time")
+    parser.add_argument('--seed', type=int, default=0, help="Base seed")
+    parser.add_argument('--confidence', type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--json', help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    if args.runs < 1 or args.tasks < 1:
+        parser.error("--runs and --tasks must be positive")
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence must be between 0 and 1")
+
+    start = time.perf_counter()
+    try:
+        suite = monte_carlo(args.runs, args.tasks, args.algorithms, args.tq, args.seed, args.confidence, args.workers,
+                            arrival=args.arrival, burst=args.burst, load=args.load, mean_burst=args.mean_burst,
+                            alpha=args.alpha, max_burst=args.max_burst)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(format_table(suite['results'], args.confidence))
+    print(f"{args.runs} workloads in {time.perf_counter() - start:.1f} s")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(suite, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
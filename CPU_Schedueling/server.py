@@ -0,0 +1,494 @@
+# server.py
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from queue import Empty
+
+from algorithm import ALGORITHMS, avg_wt_tat
+from streaming import P2Quantile, RunningStats
+from tracing import RunCancelled
+from workload import parse_tasks
+
+MAX_BODY_BYTES = 64 * 2 ** 20
+FLUSH_SEGMENTS = 512  # Segments per streamed chunk
+QUEUE_CHUNKS = 16  # Chunks buffered per request before the scheduler waits for the client
+POLL_SECONDS = 0.5  # How often a stalled stream checks whether its worker process died
+RATE_WINDOW = 60  # Seconds of finished requests behind the throughput figures
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+ROUTES = {'/schedule': 'POST', '/metrics': 'GET'}
+
+
+class HTTPError(Exception):
+    """Request that gets an error response instead of a schedule."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class _StreamingLog:
+    """
+    Execution log that passes segments to the server while the scheduler is still
+    running in a worker process.
+
+    Like binlog.ExecutionLogWriter, only the last entry is kept, since it is the only
+    one a scheduler reads back; the others are formatted as NDJSON lines and handed
+    over in chunks through the request's queue. Handing a chunk over waits while the
+    queue is full, so a slow client slows its own scheduler down instead of filling
+    up memory. Once ``cancelled`` is set (the client went away), the next hand-over
+    raises RunCancelled to stop the scheduler.
+    """
+
+    def __init__(self, data, queue, cancelled):
+        self._data = data
+        self._queue = queue
+        self._cancelled = cancelled
+        self._lines = []
+        self._last = None
+        self._count = 0
+        self.segments = 0
+
+    def __len__(self):
+        return self._count
+
+    def _check_last(self, i):
+        if self._last is None or i not in (-1, self._count - 1):
+            raise IndexError("Only the last entry of a streamed log can be accessed")
+
+    def __getitem__(self, i):
+        self._check_last(i)
+        return self._last
+
+    def __setitem__(self, i, entry):
+        self._check_last(i)
+        self._last = entry
+
+    def append(self, entry):
+        if self._last is not None:
+            self._emit(self._last)
+        self._last = entry
+        self._count += 1
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def _emit(self, entry):
+        self._lines.append(json.dumps({'id': self._data[entry[0]]['id'], 'start': entry[1], 'end': entry[2]}))
+        self.segments += 1
+        if len(self._lines) >= FLUSH_SEGMENTS:
+            self._hand_over()
+
+    def _hand_over(self, final=None):
+        if self._cancelled.is_set():
+            raise RunCancelled()
+        lines = self._lines
+        self._lines = []
+        if final is not None:
+            lines.append(final)
+        if lines:
+            chunk = ('\n'.join(lines) + '\n').encode()
+            self._queue.put(chunk)
+
+    def finish(self, final):
+        """
+        Hand over the remaining segments followed by the ``final`` line.
+        """
+        if self._last is not None:
+            self._emit(self._last)
+            self._last = None
+        self._hand_over(final)
+
+
+class _RequestStats:
+    """Counters and latency estimates of the /schedule requests."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.total = 0
+        self.active = 0
+        self.rejected = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.tasks = 0
+        self.segments = 0
+        self.latency = RunningStats()
+        self.latency_quantiles = [P2Quantile(q) for q in (50, 90, 99)]
+        self.first_segment = RunningStats()
+        self.max_latency = 0.0
+        self._recent = deque()  # (finish time, tasks, segments) within RATE_WINDOW
+
+    def finished(self, latency, first_segment, tasks, segments):
+        now = time.monotonic()
+        self.tasks += tasks
+        self.segments += segments
+        self.latency.add(latency)
+        for estimator in self.latency_quantiles:
+            estimator.add(latency)
+        self.max_latency = max(self.max_latency, latency)
+        if first_segment is not None:
+            self.first_segment.add(first_segment)
+        self._recent.append((now, tasks, segments))
+        self._expire(now)
+
+    def _expire(self, now):
+        while self._recent and self._recent[0][0] < now - RATE_WINDOW:
+            self._recent.popleft()
+
+    def snapshot(self):
+        now = time.monotonic()
+        self._expire(now)
+        uptime = time.time() - self.started
+        window = min(RATE_WINDOW, uptime) or 1.0
+        latency = {'count': self.latency.count, 'mean': self.latency.mean, 'max': self.max_latency}
+        for estimator in self.latency_quantiles:
+            latency[f'p{estimator.q:g}'] = estimator.value()
+        return {
+            'uptime_seconds': uptime,
+            'requests': {'total': self.total, 'active': self.active, 'rejected': self.rejected,
+                         'failed': self.failed, 'cancelled': self.cancelled},
+            'tasks_total': self.tasks,
+            'segments_total': self.segments,
+            'throughput': {
+                'window_seconds': window,
+                'requests_per_second': len(self._recent) / window,
+                'tasks_per_second': sum(entry[1] for entry in self._recent) / window,
+                'segments_per_second': sum(entry[2] for entry in self._recent) / window,
+            },
+            'latency_seconds': latency,
+            'first_segment_seconds': {'count': self.first_segment.count, 'mean': self.first_segment.mean},
+        }
+
+
+async def _read_line(reader):
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        # Longer than the stream limit (64 KiB)
+        raise HTTPError(400, "Request line or header too long") from None
+
+
+def _positive_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def _parse_request(body):
+    """
+    Validate a /schedule request body.
+
+    :return: Tuple of (task dictionaries, algorithm name, scheduler keyword arguments).
+    """
+    try:
+        request = json.loads(body)
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise HTTPError(400, f"Invalid JSON: {exc}") from None
+    if not isinstance(request, dict):
+        raise HTTPError(400, "Expected a JSON object with 'tasks'")
+    name = request.get('algorithm', 'fcfs')
+    if not isinstance(name, str) or name not in ALGORITHMS:
+        raise HTTPError(400, f"Unknown algorithm '{name}' (expected one of {', '.join(ALGORITHMS)})")
+    kwargs = {}
+    if name == 'rr':
+        if not _positive_int(request.get('tq')):
+            raise HTTPError(400, "Round Robin needs a positive integer 'tq'")
+        kwargs = {'tq': request['tq'], 'compact': bool(request.get('compact', False))}
+    elif name == 'mlfq':
+        levels = request.get('levels')
+        if levels is not None:
+            if not isinstance(levels, list) or not levels or not all(_positive_int(tq) for tq in levels):
+                raise HTTPError(400, "'levels' must be a non-empty list of positive integers")
+            kwargs['quanta'] = levels
+        for key in ('aging', 'boost'):
+            if request.get(key) is not None:
+                if not _positive_int(request[key]):
+                    raise HTTPError(400, f"'{key}' must be a positive integer")
+                kwargs[key] = request[key]
+    tasks = request.get('tasks')
+    if not isinstance(tasks, list) or not tasks:
+        raise HTTPError(400, "'tasks' must be a non-empty list of task objects")
+    try:
+        data = parse_tasks(tasks)
+    except ValueError as exc:
+        raise HTTPError(400, str(exc)) from None
+    return data, name, kwargs
+
+
+def _run_schedule(body, queue, cancelled):
+    """
+    Worker process job: parse the request and run the scheduler, streaming its log.
+
+    The first item put on ``queue`` is (200, number of tasks) for a valid request,
+    or (status, message) of the error response; then come the NDJSON chunks, the
+    last one ending with the results or the error line, and finally None.
+
+    :return: Number of segments streamed.
+    """
+    try:
+        try:
+            data, name, kwargs = _parse_request(body)
+        except HTTPError as exc:
+            queue.put((exc.status, str(exc)))
+            return 0
+        queue.put((200, len(data)))
+        log = _StreamingLog(data, queue, cancelled)
+        try:
+            result, _ = ALGORITHMS[name](data, log=log, **kwargs)
+            metrics = avg_wt_tat(result)
+            tasks = [{field: task[field] for field in ('id', 'ct', 'tat', 'wt')} for task in result]
+            final = json.dumps({'done': True, 'metrics': metrics, 'tasks': tasks})
+        except RunCancelled:
+            raise
+        except Exception as exc:
+            final = json.dumps({'error': f"{type(exc).__name__}: {exc}"})
+            log.finish(final)
+            raise
+        log.finish(final)
+        return log.segments
+    finally:
+        queue.put(None)
+
+
+class SchedulingServer:
+    """
+    HTTP/JSON front end for the schedulers, on asyncio.
+
+    POST /schedule takes {"algorithm": ..., "tq": ..., "tasks": [...]} (tasks as in
+    the JSON workload files; "compact" for Round Robin, "levels", "aging" and "boost"
+    for MLFQ) and answers with NDJSON: one {"id", "start", "end"} line per execution
+    log segment as the scheduler produces it, then {"done": true, "metrics": ...,
+    "tasks": [...]} or {"error": ...}. GET /metrics returns request counts,
+    throughput over the last minute and latency figures. Invalid requests get a 400
+    response with {"error": ...}.
+
+    Requests are parsed and scheduled in a process pool, so runs use several cores;
+    each run streams its segments back through a bounded queue of a
+    multiprocessing Manager while it runs. At most ``max_pending`` requests are
+    accepted at once, running or waiting for a worker; the rest get 503 with
+    Retry-After, rather than queueing without bound.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, workers=None, max_pending=None, max_body=MAX_BODY_BYTES):
+        """
+        :param host: Address to listen on.
+        :param port: Port to listen on; 0 picks a free one (see ``port`` after start()).
+        :param workers: Scheduler processes. Defaults to the CPU count.
+        :param max_pending: Requests accepted at once. Defaults to twice the workers.
+        :param max_body: Largest accepted request body, in bytes.
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.max_body = max_body
+        self.stats = _RequestStats()
+        self._server = None
+        self._executor = None
+        self._manager = None
+        self._readers = None
+
+    async def start(self):
+        """
+        Start listening.
+
+        :return: The port the server listens on.
+        """
+        # Spawned rather than forked: the server process already runs threads
+        context = multiprocessing.get_context('spawn')
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self._manager = context.Manager()
+        # Threads waiting on the request queues, which block
+        self._readers = ThreadPoolExecutor(max_workers=self.max_pending, thread_name_prefix='stream')
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stop listening and wait for running schedulers to finish.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        await loop.run_in_executor(None, self._readers.shutdown)
+        self._manager.shutdown()
+
+    async def _handle(self, reader, writer):
+        try:
+            try:
+                method, path, body = await self._read_request(reader, writer)
+                if path not in ROUTES:
+                    raise HTTPError(404, f"No such endpoint: {path}")
+                if method != ROUTES[path]:
+                    raise HTTPError(405, f"{path} only accepts {ROUTES[path]}")
+                if path == '/metrics':
+                    await self._respond(writer, 200, self.stats.snapshot())
+                else:
+                    await self._schedule(body, writer)
+            except HTTPError as exc:
+                await self._respond(writer, exc.status, {'error': str(exc)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # The client went away
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader, writer):
+        """
+        Read one request, answering ``Expect: 100-continue`` before the body.
+
+        :return: Tuple of (method, path, body bytes).
+        """
+        request_line = await _read_line(reader)
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise HTTPError(400, "Malformed request line")
+        method, target, _ = parts
+        headers = {}
+        while True:
+            line = await _read_line(reader)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length") from None
+        if length > self.max_body:
+            raise HTTPError(413, f"Request body is larger than {self.max_body} bytes")
+        body = b''
+        if length > 0:
+            if headers.get('expect', '').lower() == '100-continue':
+                # The client waits for this before sending the body
+                writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+                await writer.drain()
+            body = await reader.readexactly(length)
+        return method, target.split('?', 1)[0], body
+
+    async def _respond(self, writer, status, payload, headers=()):
+        body = json.dumps(payload).encode()
+        head = [f"HTTP/1.1 {status} {REASONS[status]}", 'Content-Type: application/json',
+                f"Content-Length: {len(body)}", 'Connection: close']
+        head.extend(f"{name}: {value}" for name, value in headers)
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + body)
+        await writer.drain()
+
+    async def _receive(self, queue, job):
+        """
+        :return: The next item the worker put on ``queue``, or None if the worker
+                 process is gone without finishing.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return await loop.run_in_executor(self._readers, queue.get, True, POLL_SECONDS)
+            except Empty:
+                if job.done():
+                    # Everything the worker put is in the queue by now
+                    try:
+                        return await loop.run_in_executor(self._readers, queue.get_nowait)
+                    except Empty:
+                        return None
+
+    async def _schedule(self, body, writer):
+        stats = self.stats
+        if stats.active >= self.max_pending:
+            stats.rejected += 1
+            await self._respond(writer, 503, {'error': "Too many requests in progress, retry later"},
+                                headers=[('Retry-After', '1')])
+            return
+        received = time.perf_counter()
+        stats.total += 1
+        stats.active += 1
+        loop = asyncio.get_running_loop()
+        try:
+            queue = self._manager.Queue(QUEUE_CHUNKS)
+            cancelled = self._manager.Event()
+            job = loop.run_in_executor(self._executor, _run_schedule, body, queue, cancelled)
+            status, detail = await self._receive(queue, job) or (500, "The scheduler worker stopped")
+            if status != 200:
+                stats.failed += 1
+                raise HTTPError(status, detail)
+
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n'
+                         b'Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n')
+            streaming = True
+            first = None
+            while True:
+                chunk = await self._receive(queue, job)
+                if chunk is None:
+                    break
+                if first is None:
+                    first = time.perf_counter() - received
+                if streaming:
+                    try:
+                        writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                        await writer.drain()
+                    except ConnectionError:
+                        streaming = False
+                        cancelled.set()  # Stop the scheduler; keep draining until it has
+            try:
+                segments = await job
+            except RunCancelled:
+                stats.cancelled += 1
+                return
+            except Exception:
+                stats.failed += 1  # The error line has been streamed instead of the results
+                failed = True
+            else:
+                failed = False
+            if streaming:
+                writer.write(b'0\r\n\r\n')
+                await writer.drain()
+            if failed:
+                return
+            stats.finished(time.perf_counter() - received, first, detail, segments)
+        finally:
+            stats.active -= 1
+
+
+async def serve(host='127.0.0.1', port=8080, workers=None, max_pending=None):
+    server = SchedulingServer(host, port, workers, max_pending)
+    await server.start()
+    print(f"Listening on http://{host}:{server.port}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the scheduling algorithms over HTTP/JSON.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on")
+    parser.add_argument('--port', type=int, default=8080, help="Port to listen on (0 picks a free one)")
+    parser.add_argument('--workers', type=int, help="Scheduler processes (default: CPU count)")
+    parser.add_argument('--max-pending', type=int,
+                        help="Requests accepted at once before answering 503 (default: twice the workers)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+# smp.py
+
+import heapq
+from collections import deque
+
+from tracing import NULL_TRACER
+
+# Ready-queue ordering of the keyed policies; ties fall back to arrival time, then task index.
+# Shared with incremental.py, which also runs 'srtf' (ordered by remaining time from there on).
+POLICY_KEYS = {
+    'fcfs': lambda task: 0,
+    'sjf': lambda task: task['bt'],
+    'priority_np': lambda task: task['pr'],
+    'priority_p': lambda task: task['pr'],
+    'srtf': lambda task: task['bt'],
+}
+POLICIES = ('fcfs', 'rr', 'sjf', 'priority_np', 'priority_p')
+QUEUE_MODES = ('global', 'per_core')
+
+
+class _ReadyQueue:
+    """
+    Ready queue of one policy: a heap of (key, arrival time, index) entries, or a
+    FIFO deque of task indexes for Round Robin.
+    """
+
+    __slots__ = ('items', 'fifo')
+
+    def __init__(self, fifo):
+        self.fifo = fifo
+        self.items = deque() if fifo else []
+
+    def __len__(self):
+        return len(self.items)
+
+    def push(self, entry):
+        if self.fifo:
+            self.items.append(entry)
+        else:
+            heapq.heappush(self.items, entry)
+
+    def pop(self):
+        return self.items.popleft() if self.fifo else heapq.heappop(self.items)
+
+    def steal(self):
+        # Thieves take from the tail of a FIFO, leaving the owner its oldest work
+        return self.items.pop() if self.fifo else heapq.heappop(self.items)
+
+    def top(self):
+        return self.items[0]
+
+
+def smp_schedule(data, policy, cores, tq=None, queue_mode='global', tracer=NULL_TRACER, log=None):
+    """
+    Multi-processor (SMP) scheduling simulation.
+
+    The simulation is event-driven: the clock jumps between arrivals and slice ends
+    (completions, Round Robin quanta), with a heap of pending slice ends across cores.
+
+    With queue_mode='global' all cores share one ready queue and an idle core always
+    takes the next task (lowest core number first). With queue_mode='per_core' every
+    core has its own ready queue: an arriving task goes to an idle core if there is
+    one, otherwise to the next core in turn, and a core whose queue runs dry steals
+    from the longest queue. Round Robin tasks rejoin the queue of the core they ran on.
+
+    For 'priority_p', a task preempts the running task with the lowest priority (the
+    one on its own core in per_core mode) when it has a strictly higher priority.
+
+    :param data: List of task dictionaries.
+    :param policy: One of 'fcfs', 'rr', 'sjf', 'priority_np' or 'priority_p'.
+    :param cores: Number of CPU cores.
+    :param tq: Time quantum, required for 'rr'.
+    :param queue_mode: 'global' or 'per_core'.
+    :param tracer: Tracer receiving scheduling events (see tracing.py).
+    :param log: Empty execution log to append to, e.g. binlog.ExecutionLog(with_core=True).
+                Segments are extended in place after being appended, so it needs
+                random access. Defaults to a new list.
+    :return: Tuple of (updated data, execution_log) where execution_log entries are
+             (task_index, start, end, core). Adjacent segments of the same task on
+             the same core are merged.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}'")
+    if queue_mode not in QUEUE_MODES:
+        raise ValueError(f"Unknown queue mode '{queue_mode}'")
+    if cores < 1:
+        raise ValueError("At least one core is required")
+    if policy == 'rr' and (tq is None or tq <= 0):
+        raise ValueError("Round Robin needs a positive time quantum")
+
+    trace = tracer.enabled
+    n = len(data)
+    arrivals = sorted(range(n), key=lambda i: data[i]['at'])  # Stable, so ties keep index order
+    remaining = [task['bt'] for task in data]
+    fifo = policy == 'rr'
+    preemptive = policy == 'priority_p'
+    key = POLICY_KEYS.get(policy)
+    per_core = queue_mode == 'per_core'
+    queues = [_ReadyQueue(fifo) for _ in range(cores if per_core else 1)]
+
+    running = [None] * cores  # Ready-queue entry of the task on each core
+    slice_start = [0] * cores
+    generation = [0] * cores  # Bumped on every dispatch, invalidating older slice-end events
+    last_segment = [-1] * cores  # Position in execution_log of each core's latest segment
+    events = []  # Heap of (slice end time, core, generation)
+    victims = []  # Preemptive, global: max-heap of running tasks as (negated entry, core, generation)
+    idle = list(range(cores))  # Global: heap of idle cores
+    parked = list(range(cores))  # Per-core: heap of idle cores that found nothing to run or steal
+    execution_log = [] if log is None else log
+    cursor = 0
+    completed = 0
+    next_home = 0
+    waiting = 0  # Per-core: tasks sitting in any ready queue, so idle cores only look for work to steal when there is some
+    sizes = [0] * cores  # Per-core: queue lengths, kept in a plain list so finding the longest queue stays in C
+
+    def make_entry(index):
+        if fifo:
+            return index
+        task = data[index]
+        return (key(task), task['at'], index)
+
+    def record(core, index, start, end):
+        position = last_segment[core]
+        if position >= 0:
+            segment = execution_log[position]
+            if segment[0] == index and segment[2] == start:
+                execution_log[position] = (index, segment[1], end, core)
+                return
+        last_segment[core] = len(execution_log)
+        execution_log.append((index, start, end, core))
+
+    def dispatch(core, entry, now):
+        index = entry if fifo else entry[2]
+        run = remaining[index] if not fifo or remaining[index] < tq else tq
+        running[core] = entry
+        slice_start[core] = now
+        generation[core] += 1
+        heapq.heappush(events, (now + run, core, generation[core]))
+        if preemptive and not per_core:
+            heapq.heappush(victims, ((-entry[0], -entry[1], -entry[2]), core, generation[core]))
+        if trace:
+            tracer.emit('dispatch', task=data[index], start=now, end=now + run,
+                        remaining=remaining[index] - run, core=core, ready=len(queues[core if per_core else 0]))
+
+    def preempt(core, now):
+        entry = running[core]
+        index = entry[2]
+        if now > slice_start[core]:
+            record(core, index, slice_start[core], now)
+            remaining[index] -= now - slice_start[core]
+        running[core] = None
+        generation[core] += 1
+        if trace:
+            # Dispatch events carry the projected remaining time; this is what was actually left
+            tracer.emit('preempt', task=data[index], time=now, remaining=remaining[index], core=core)
+        return entry
+
+    while completed < n:
+        next_arrival = data[arrivals[cursor]]['at'] if cursor < n else None
+        if events and (next_arrival is None or events[0][0] <= next_arrival):
+            curr_time = events[0][0]
+        else:
+            curr_time = next_arrival
+        woken = set()  # Per-core: cores that should look for work
+
+        # Close every slice that ends now
+        requeue = []
+        while events and events[0][0] <= curr_time:
+            end, core, gen = heapq.heappop(events)
+            if gen != generation[core]:
+                continue  # The slice was cut short by a preemption
+            entry = running[core]
+            index = entry if fifo else entry[2]
+            running[core] = None
+            record(core, index, slice_start[core], end)
+            remaining[index] -= end - slice_start[core]
+            if remaining[index] <= 0:
+                data[index]['ct'] = end
+                completed += 1
+                if trace:
+                    tracer.emit('complete', task=data[index], time=end, core=core)
+            else:
+                requeue.append((core, entry))
+            if per_core:
+                woken.add(core)
+            else:
+                heapq.heappush(idle, core)
+
+        # Admit arrivals, then let preempted Round Robin tasks rejoin behind them
+        while cursor < n and data[arrivals[cursor]]['at'] <= curr_time:
+            index = arrivals[cursor]
+            cursor += 1
+            if per_core:
+                if parked:
+                    home = heapq.heappop(parked)
+                else:
+                    home = next_home
+                    next_home = (next_home + 1) % cores
+                queues[home].push(make_entry(index))
+                sizes[home] += 1
+                waiting += 1
+                woken.add(home)
+            else:
+                queues[0].push(make_entry(index))
+            if trace:
+                tracer.emit('arrival', task=data[index], time=data[index]['at'])
+        for core, entry in requeue:
+            queues[core if per_core else 0].push(entry)
+        if per_core:
+            for core, _ in requeue:
+                sizes[core] += 1
+            waiting += len(requeue)
+
+            for core in sorted(woken):
+                queue = queues[core]
+                if running[core] is None:
+                    if queue:
+                        entry = queue.pop()
+                        sizes[core] -= 1
+                    elif waiting:
+                        victim = sizes.index(max(sizes))
+                        entry = queues[victim].steal()
+                        sizes[victim] -= 1
+                    else:
+                        if core not in parked:
+                            heapq.heappush(parked, core)
+                        continue
+                    waiting -= 1
+                    dispatch(core, entry, curr_time)
+                elif preemptive and queue and queue.top() < running[core]:
+                    queue.push(preempt(core, curr_time))
+                    dispatch(core, queue.pop(), curr_time)
+            # Work left waiting behind a busy core (e.g. a Round Robin task rejoining) goes to parked cores
+            while parked and waiting:
+                victim = sizes.index(max(sizes))
+                sizes[victim] -= 1
+                waiting -= 1
+                dispatch(heapq.heappop(parked), queues[victim].steal(), curr_time)
+        else:
+            queue = queues[0]
+            while queue:
+                if idle:
+                    dispatch(heapq.heappop(idle), queue.pop(), curr_time)
+                    continue
+                if not preemptive:
+                    break
+                # Preempt the lowest priority running task if the best ready task beats it
+                while victims and (victims[0][2] != generation[victims[0][1]] or running[victims[0][1]] is None):
+                    heapq.heappop(victims)
+                if not victims or not queue.top() < running[victims[0][1]]:
+                    break
+                core = heapq.heappop(victims)[1]
+                queue.push(preempt(core, curr_time))
+                heapq.heappush(idle, core)
+
+    return data, execution_log
@@ -0,0 +1,395 @@
+# streaming.py
+
+import heapq
+import math
+from collections import deque
+from statistics import NormalDist
+
+from taskset import percentile
+
+
+class _Arrivals:
+    """
+    One-task lookahead over an arrival-sorted task iterator.
+
+    Tasks are numbered in stream order; the number breaks ties between tasks with
+    equal keys, like the task index does in algorithm.py.
+    """
+
+    def __init__(self, tasks):
+        self._tasks = iter(tasks)
+        self._seq = 0
+        self.next_task = None
+        self._advance()
+
+    def _advance(self):
+        previous = self.next_task
+        self.next_task = next(self._tasks, None)
+        if previous is not None and self.next_task is not None and self.next_task['at'] < previous['at']:
+            raise ValueError(f"Task {self.next_task['id']} arrives at {self.next_task['at']}, "
+                             f"before the previous task at {previous['at']}; the stream must be sorted by arrival")
+
+    def pop(self):
+        """
+        :return: Tuple of (task, sequence number) for the next arrival.
+        """
+        task, seq = self.next_task, self._seq
+        self._seq += 1
+        self._advance()
+        return task, seq
+
+
+def _stream_ready_queue(tasks, key):
+    """
+    Streaming counterpart of algorithm._run_ready_queue (non-preemptive).
+
+    :param tasks: Iterable of task dictionaries sorted by arrival time.
+    :param key: Function mapping a task dictionary to its heap ordering value.
+    """
+    arrivals = _Arrivals(tasks)
+    ready = []  # Heap of (key, arrival time, sequence number, task)
+    curr_time = 0
+
+    while True:
+        # Admit every task that has arrived by the current time
+        while arrivals.next_task is not None and arrivals.next_task['at'] <= curr_time:
+            task, seq = arrivals.pop()
+            heapq.heappush(ready, (key(task), task['at'], seq, task))
+
+        if ready:
+            task = heapq.heappop(ready)[3]
+            start_time = curr_time
+            curr_time += task['bt']
+            task['ct'] = curr_time
+            yield ('segment', task, start_time, curr_time)
+            yield ('complete', task)
+        elif arrivals.next_task is not None:
+            curr_time = arrivals.next_task['at']  # Idle until the next arrival
+        else:
+            return
+
+
+def stream_first_come_first_serve(tasks):
+    """
+    Streaming First Come First Serve (FCFS).
+
+    :param tasks: Iterable of task dictionaries sorted by arrival time.
+    :return: Generator of ('segment', task, start, end) and ('complete', task) events.
+    """
+    return _stream_ready_queue(tasks, key=lambda task: 0)
+
+
+def stream_shortest_job_first(tasks):
+    """
+    Streaming Shortest Job First (SJF).
+
+    :param tasks: Iterable of task dictionaries sorted by arrival time.
+    :return: Generator of ('segment', task, start, end) and ('complete', task) events.
+    """
+    return _stream_ready_queue(tasks, key=lambda task: task['bt'])
+
+
+def stream_priority_non_preemptive(tasks):
+    """
+    Streaming Priority Non-Preemptive.
+
+    :param tasks: Iterable of task dictionaries sorted by arrival time.
+    :return: Generator of ('segment', task, start, end) and ('complete', task) events.
+    """
+    return _stream_ready_queue(tasks, key=lambda task: task['pr'])
+
+
+def stream_priority_preemptive(tasks):
+    """
+    Streaming Priority Preemptive.
+
+    A segment is yielded once it is over, that is when its task completes, is
+    preempted by a higher priority arrival or the CPU goes idle; segments of a task
+    that keeps the CPU across arrivals are merged, as in algorithm.priority_preemptive.
+
+    :param tasks: Iterable of task dictionaries sorted by arrival time.
+    :return: Generator of ('segment', task, start, end) and ('complete', task) events.
+    """
+    arrivals = _Arrivals(tasks)
+    ready = []  # Heap of [priority, arrival time, sequence number, task, remaining time]
+    curr_time = 0
+    segment = None  # Open segment as [task, start, end]
+
+    while True:
+        while arrivals.next_task is not None and arrivals.next_task['at'] <= curr_time:
+            task, seq = arrivals.pop()
+            heapq.heappush(ready, [task['pr'], task['at'], seq, task, task['bt']])
+
+        if ready:
+            entry = ready[0]
+            task = entry[3]
+            start_time = curr_time
+            curr_time += entry[4]
+            if arrivals.next_task is not None and arrivals.next_task['at'] < curr_time:
+                curr_time = arrivals.next_task['at']
+            entry[4] -= curr_time - start_time
+
+            if segment is not None and segment[0] is task and segment[2] == start_time:
+                segment[2] = curr_time  # The same task keeps the CPU
+            else:
+                if segment is not None:
+                    yield ('segment', segment[0], segment[1], segment[2])
+                segment = [task, start_time, curr_time]
+
+            if entry[4] == 0:
+                heapq.heappop(ready)
+                task['ct'] = curr_time
+                yield ('segment', task, segment[1], segment[2])
+                segment = None
+                yield ('complete', task)
+        elif arrivals.next_task is not None:
+            if segment is not None:
+                yield ('segment', segment[0], segment[1], segment[2])
+                segment = None
+            curr_time = arrivals.next_task['at']
+        else:
+            return
+
+
+def stream_round_robin(tasks, tq):
+    """
+    Streaming Round Robin (RR), yielding one segment per quantum.
+
+    :param tasks: Iterable of task dictionaries sorted by arrival time.
+    :param tq: Time quantum.
+    :return: Generator of ('segment', task, start, end) and ('complete', task) events.
+    """
+    arrivals = _Arrivals(tasks)
+    queue = deque()  # Entries are [task, remaining time]
+    curr_time = 0
+
+    while True:
+        while arrivals.next_task is not None and arrivals.next_task['at'] <= curr_time:
+            task, _ = arrivals.pop()
+            queue.append([task, task['bt']])
+
+        if queue:
+            entry = queue.popleft()
+            exec_time = min(tq, entry[1])
+            start_time = curr_time
+            curr_time += exec_time
+            entry[1] -= exec_time
+            yield ('segment', entry[0], start_time, curr_time)
+
+            # Tasks arriving during the quantum queue up before the preempted task
+            while arrivals.next_task is not None and arrivals.next_task['at'] <= curr_time:
+                task, _ = arrivals.pop()
+                queue.append([task, task['bt']])
+
+            if entry[1] > 0:
+                queue.append(entry)
+            else:
+                entry[0]['ct'] = curr_time
+                yield ('complete', entry[0])
+        elif arrivals.next_task is not None:
+            curr_time = arrivals.next_task['at']
+        else:
+            return
+
+
+STREAMING_ALGORITHMS = {
+    'fcfs': stream_first_come_first_serve,
+    'rr': stream_round_robin,
+    'sjf': stream_shortest_job_first,
+    'priority_np': stream_priority_non_preemptive,
+    'priority_p': stream_priority_preemptive,
+}
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate in constant memory (the P-square algorithm of Jain
+    and Chlamtac), used for running percentiles over unbounded streams.
+    """
+
+    def __init__(self, q):
+        """
+        :param q: Percentile to track, in the range [0, 100].
+        """
+        self.q = q
+        self.count = 0
+        p = q / 100
+        self._heights = []  # Marker heights; the raw observations until there are 5
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        """
+        :param x: New observation.
+        """
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        # Find the cell containing x, stretching the extreme markers if needed
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self._positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the three middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self._desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + d * (heights[i + d] - heights[i]) / (positions[i + d] - positions[i])
+                heights[i] = height
+                positions[i] += d
+
+    def _parabolic(self, i, d):
+        h, n = self._heights, self._positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        """
+        :return: Current estimate (exact while fewer than 5 values were seen), or None if empty.
+        """
+        if not self.count:
+            return None
+        if self.count <= 5:
+            return percentile(self._heights, [self.q])[0]
+        return float(self._heights[2])
+
+
+class RunningMetrics:
+    """Incrementally updated TAT/WT mean and percentiles of completed tasks."""
+
+    def __init__(self, percentiles=(50, 90, 99)):
+        """
+        :param percentiles: Percentiles of TAT and WT to track.
+        """
+        self.count = 0
+        self.avg_tat = 0.0
+        self.avg_wt = 0.0
+        self._tat_quantiles = [P2Quantile(q) for q in percentiles]
+        self._wt_quantiles = [P2Quantile(q) for q in percentiles]
+
+    def update(self, task):
+        """
+        Record a completed task and set its 'tat' and 'wt'.
+
+        :param task: Task dictionary with 'ct' set.
+        """
+        tat = task['ct'] - task['at']
+        wt = tat - task['bt']
+        task['tat'] = tat
+        task['wt'] = wt
+        self.count += 1
+        self.avg_tat += (tat - self.avg_tat) / self.count
+        self.avg_wt += (wt - self.avg_wt) / self.count
+        for estimator in self._tat_quantiles:
+            estimator.add(tat)
+        for estimator in self._wt_quantiles:
+            estimator.add(wt)
+
+    def observe(self, events):
+        """
+        Pass scheduler events through, updating the metrics on every completion.
+
+        :param events: Event generator from one of the stream_* functions.
+        :return: Generator of the same events.
+        """
+        for event in events:
+            if event[0] == 'complete':
+                self.update(event[1])
+            yield event
+
+    def snapshot(self):
+        """
+        :return: Dictionary with 'count', 'avg_tat', 'avg_wt' and 'tat_p<q>' / 'wt_p<q>'.
+        """
+        metrics = {'count': self.count, 'avg_tat': self.avg_tat, 'avg_wt': self.avg_wt}
+        for estimator in self._tat_quantiles:
+            metrics[f'tat_p{estimator.q:g}'] = estimator.value()
+        for estimator in self._wt_quantiles:
+            metrics[f'wt_p{estimator.q:g}'] = estimator.value()
+        return metrics
+
+
+class RunningStats:
+    """
+    Running mean and variance in constant memory (Welford's algorithm), with a
+    confidence interval for the mean.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the current mean
+
+    def add(self, value):
+        """
+        Record one sample.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """Sample variance, or None with fewer than two samples."""
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def std(self):
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    def confidence_interval(self, level=0.95):
+        """
+        Student-t confidence interval for the mean.
+
+        :param level: Confidence level, e.g. 0.95.
+        :return: Tuple of (low, high), or None with fewer than two samples.
+        """
+        if self.count < 2:
+            return None
+        half_width = t_quantile((1 + level) / 2, self.count - 1) * self.std / math.sqrt(self.count)
+        return self.mean - half_width, self.mean + half_width
+
+
+def t_quantile(p, df):
+    """
+    Quantile of Student's t distribution. Exact for one and two degrees of
+    freedom; above that, the Cornish-Fisher expansion around the normal quantile,
+    which is within 1% of the exact value (0.1% from df = 5 at p = 0.975).
+
+    :param p: Probability, e.g. 0.975.
+    :param df: Degrees of freedom.
+    :return: Quantile.
+    """
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    z2 = z * z
+    return z * (1 + (z2 + 1) / (4 * df) + (5 * z2 * z2 + 16 * z2 + 3) / (96 * df ** 2)
+                + (3 * z2 ** 3 + 19 * z2 * z2 + 17 * z2 - 15) / (384 * df ** 3)
+                + (79 * z2 ** 4 + 776 * z2 ** 3 + 1482 * z2 * z2 - 1920 * z2 - 945) / (92160 * df ** 4))
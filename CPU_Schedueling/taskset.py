@@ -0,0 +1,249 @@
+# taskset.py
+
+from array import array
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, columns fall back to array.array
+    np = None
+
+CHUNK_SEGMENTS = 1 << 16  # Segments per chunk when a log is scanned in pieces (see log_chunks)
+
+
+def _column(values):
+    """
+    Build a numeric column from a sequence of numbers.
+
+    Integer data stays integral (int64 / 'q'), anything else becomes float64 / 'd',
+    so results written back to task dictionaries keep the type the user entered.
+    """
+    if np is not None:
+        column = np.asarray(values)
+        if column.dtype.kind not in 'iuf':
+            column = column.astype(np.float64)
+        return column
+    try:
+        return array('q', values)
+    except TypeError:
+        return array('d', values)
+
+
+class TaskSet:
+    """
+    Columnar storage for a set of tasks.
+
+    Each attribute is a column: ``id`` is a list of task IDs and ``at``, ``bt``, ``pr``
+    and ``ct`` are NumPy arrays, or ``array.array`` when NumPy is not installed.
+    ``ct`` is None until completion times are known.
+    """
+
+    def __init__(self, ids, at, bt, pr, ct=None):
+        """
+        :param ids: Sequence of task IDs.
+        :param at: Sequence of arrival times.
+        :param bt: Sequence of burst times.
+        :param pr: Sequence of priorities.
+        :param ct: Optional sequence of completion times.
+        """
+        self.id = list(ids)
+        self.at = _column(at)
+        self.bt = _column(bt)
+        self.pr = _column(pr)
+        self.ct = _column(ct) if ct is not None else None
+        if not len(self.id) == len(self.at) == len(self.bt) == len(self.pr):
+            raise ValueError("All task columns must have the same length")
+        if self.ct is not None and len(self.ct) != len(self.id):
+            raise ValueError("All task columns must have the same length")
+
+    @classmethod
+    def from_dicts(cls, data):
+        """
+        Build a TaskSet from the list-of-dicts representation used by algorithm.py.
+
+        :param data: List of task dictionaries. 'ct' is read when every task has one.
+        :return: TaskSet.
+        """
+        ct = None
+        if data and all('ct' in task for task in data):
+            ct = [task['ct'] for task in data]
+        return cls([task['id'] for task in data],
+                   [task['at'] for task in data],
+                   [task['bt'] for task in data],
+                   [task.get('pr', 0) for task in data],
+                   ct)
+
+    def to_dicts(self):
+        """
+        Convert back to a fresh list of task dictionaries.
+
+        :return: List of task dictionaries with 'id', 'at', 'bt', 'pr' and, if known, 'ct'.
+        """
+        columns = [self.id, self.at.tolist(), self.bt.tolist(), self.pr.tolist()]
+        data = [{'id': i, 'at': a, 'bt': b, 'pr': p} for i, a, b, p in zip(*columns)]
+        if self.ct is not None:
+            for task, ct in zip(data, self.ct.tolist()):
+                task['ct'] = ct
+        return data
+
+    def __len__(self):
+        return len(self.id)
+
+    def turnaround_times(self):
+        """
+        :return: Column of Turnaround Times (CT - AT).
+        """
+        self._require_ct()
+        if np is not None:
+            return self.ct - self.at
+        return _column([c - a for c, a in zip(self.ct, self.at)])
+
+    def waiting_times(self, tat=None):
+        """
+        :param tat: Turnaround Time column, if already computed.
+        :return: Column of Waiting Times (TAT - BT).
+        """
+        if tat is None:
+            tat = self.turnaround_times()
+        if np is not None:
+            return tat - self.bt
+        return _column([t - b for t, b in zip(tat, self.bt)])
+
+    def _require_ct(self):
+        if self.ct is None:
+            raise KeyError("TaskSet has no completion times ('ct')")
+
+
+def percentile(values, qs):
+    """
+    Percentiles with linear interpolation between closest ranks (NumPy's default method).
+
+    :param values: Column or sequence of numbers.
+    :param qs: Sequence of percentiles in the range [0, 100].
+    :return: List of percentile values as floats, in the order of ``qs``.
+    """
+    if np is not None:
+        return [float(v) for v in np.percentile(values, qs)]
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("percentile of an empty sequence")
+    result = []
+    for q in qs:
+        rank = (len(ordered) - 1) * q / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        result.append(float(ordered[low] + (ordered[high] - ordered[low]) * (rank - low)))
+    return result
+
+
+def compute_metrics(task_set, percentiles=(50, 90, 99)):
+    """
+    Compute summary metrics for a completed TaskSet.
+
+    :param task_set: TaskSet with completion times.
+    :param percentiles: Percentiles of TAT and WT to report.
+    :return: Dictionary with 'avg_tat', 'avg_wt', 'max_wt', 'throughput' (tasks per
+             time unit between the first arrival and the last completion) and
+             'tat_p<q>' / 'wt_p<q>' for every requested percentile.
+    """
+    n = len(task_set)
+    if n == 0:
+        raise ValueError("Cannot compute metrics for an empty task set")
+    tat = task_set.turnaround_times()
+    wt = task_set.waiting_times(tat)
+
+    if np is not None:
+        total_tat, total_wt, max_wt = tat.sum().item(), wt.sum().item(), wt.max().item()
+        makespan = task_set.ct.max().item() - task_set.at.min().item()
+    else:
+        total_tat, total_wt, max_wt = sum(tat), sum(wt), max(wt)
+        makespan = max(task_set.ct) - min(task_set.at)
+
+    metrics = {
+        'avg_tat': total_tat / n,
+        'avg_wt': total_wt / n,
+        'max_wt': max_wt,
+        'throughput': n / makespan if makespan > 0 else 0.0,  # Zero-length schedule
+    }
+    percentiles = list(percentiles)
+    if percentiles:
+        for q, tat_q, wt_q in zip(percentiles, percentile(tat, percentiles), percentile(wt, percentiles)):
+            metrics[f'tat_p{q:g}'] = tat_q
+            metrics[f'wt_p{q:g}'] = wt_q
+    return metrics
+
+
+def log_chunks(execution_log, size=None):
+    """
+    Read an execution log in fixed-size chunks of NumPy columns.
+
+    Logs with columns() (binlog.ExecutionLog and MappedLog) are sliced without
+    copying, so a memory-mapped log is paged in one chunk at a time; any other
+    sequence is read through its iterator. Requires NumPy.
+
+    :param execution_log: Sequence of (task_index, start, end) or (task_index, start, end, core).
+    :param size: Segments per chunk, CHUNK_SEGMENTS by default.
+    :return: Iterator of column lists (task_index, start, end[, core]) of at most
+             ``size`` segments each.
+    """
+    size = size or CHUNK_SEGMENTS
+    if hasattr(execution_log, 'columns'):
+        columns = execution_log.columns()
+        for begin in range(0, len(columns[0]), size):
+            yield [np.asarray(column[begin:begin + size]) for column in columns]
+        return
+    entries = iter(execution_log)
+    while True:
+        chunk = list(islice(entries, size))
+        if not chunk:
+            return
+        yield list(np.asarray(chunk).T)
+
+
+def core_utilization(execution_log, cores=None):
+    """
+    Fraction of the schedule each core spent running tasks.
+
+    With NumPy the log is read in chunks (see log_chunks), so memory use does not
+    grow with the log size.
+
+    :param execution_log: Sequence of (task_index, start, end, core); entries without
+                          a core (single CPU logs) count as core 0.
+    :param cores: Number of cores, so that cores that never ran anything report 0.0.
+                  Defaults to the highest core number in the log plus one.
+    :return: List of utilizations in [0, 1], indexed by core. The schedule spans from
+             the first segment start to the last segment end.
+    """
+    if not len(execution_log):
+        return [0.0] * (cores or 0)
+    first, last = None, None
+    if np is not None:
+        busy = np.zeros(cores or 0)
+        for chunk in log_chunks(execution_log):
+            starts, ends = chunk[1], chunk[2]
+            if len(chunk) > 3:
+                core_ids = chunk[3].astype(np.int64, copy=False)
+            else:
+                core_ids = np.zeros(len(starts), dtype=np.int64)
+            chunk_busy = np.bincount(core_ids, weights=np.subtract(ends, starts, dtype=np.float64),
+                                     minlength=len(busy))
+            chunk_busy[:len(busy)] += busy
+            busy = chunk_busy
+            start, end = starts.min().item(), ends.max().item()
+            first = start if first is None or start < first else first
+            last = end if last is None or end > last else last
+        busy = busy.tolist()
+    else:
+        busy = []
+        for entry in execution_log:
+            core = entry[3] if len(entry) > 3 else 0
+            if core >= len(busy):
+                busy.extend([0] * (core + 1 - len(busy)))
+            busy[core] += entry[2] - entry[1]
+            first = entry[1] if first is None or entry[1] < first else first
+            last = entry[2] if last is None or entry[2] > last else last
+        busy.extend([0] * ((cores or 0) - len(busy)))
+    span = last - first
+    if span <= 0:
+        return [0.0] * len(busy)  # Zero-length schedule
+    return [b / span for b in busy]
@@ -0,0 +1,171 @@
+# test_algorithm.py
+
+import random
+
+import pytest
+
+from algorithm import (multilevel_feedback_queue, priority_non_preemptive, priority_preemptive, round_robin,
+                       shortest_job_first, shortest_remaining_time_first)
+
+
+def _tasks(*rows):
+    return [{'id': task_id, 'at': at, 'bt': bt, 'pr': pr} for task_id, at, bt, pr in rows]
+
+
+# Equal burst times, priorities and arrival times, and an idle gap
+TIES = _tasks(('A', 0, 3, 2), ('B', 1, 3, 1), ('C', 1, 3, 1), ('D', 1, 2, 3), ('E', 12, 2, 0), ('F', 12, 2, 0))
+# Preemption by higher priorities, and equal priorities arriving while one runs
+PREEMPT = _tasks(('A', 0, 8, 3), ('B', 2, 3, 1), ('C', 3, 2, 1), ('D', 4, 4, 0), ('E', 20, 1, 2), ('F', 20, 1, 2),
+                 ('G', 21, 5, 1))
+# Arrivals at the end of a quantum, and a task left alone after an idle gap
+ARRIVALS = _tasks(('A', 0, 5, 0), ('B', 2, 3, 0), ('C', 4, 4, 0), ('D', 4, 1, 0), ('E', 30, 7, 0))
+
+# Completion times and execution logs of the original schedulers; Priority Preemptive
+# used to log one segment per time unit, the same schedule with segments merged
+EXPECTED = [
+    (shortest_job_first, (), TIES, [3, 8, 11, 5, 14, 16],
+     [(0, 0, 3), (3, 3, 5), (1, 5, 8), (2, 8, 11), (4, 12, 14), (5, 14, 16)]),
+    (shortest_job_first, (), PREEMPT, [8, 13, 10, 17, 21, 22, 27],
+     [(0, 0, 8), (2, 8, 10), (1, 10, 13), (3, 13, 17), (4, 20, 21), (5, 21, 22), (6, 22, 27)]),
+    (shortest_job_first, (), ARRIVALS, [5, 9, 13, 6, 37],
+     [(0, 0, 5), (3, 5, 6), (1, 6, 9), (2, 9, 13), (4, 30, 37)]),
+    (priority_non_preemptive, (), TIES, [3, 6, 9, 11, 14, 16],
+     [(0, 0, 3), (1, 3, 6), (2, 6, 9), (3, 9, 11), (4, 12, 14), (5, 14, 16)]),
+    (priority_non_preemptive, (), PREEMPT, [8, 15, 17, 12, 21, 27, 26],
+     [(0, 0, 8), (3, 8, 12), (1, 12, 15), (2, 15, 17), (4, 20, 21), (6, 21, 26), (5, 26, 27)]),
+    (priority_preemptive, (), TIES, [9, 4, 7, 11, 14, 16],
+     [(0, 0, 1), (1, 1, 4), (2, 4, 7), (0, 7, 9), (3, 9, 11), (4, 12, 14), (5, 14, 16)]),
+    (priority_preemptive, (), PREEMPT, [17, 9, 11, 8, 21, 27, 26],
+     [(0, 0, 2), (1, 2, 4), (3, 4, 8), (1, 8, 9), (2, 9, 11), (0, 11, 17), (4, 20, 21), (6, 21, 26), (5, 26, 27)]),
+    (priority_preemptive, (), ARRIVALS, [5, 8, 12, 13, 37],
+     [(0, 0, 5), (1, 5, 8), (2, 8, 12), (3, 12, 13), (4, 30, 37)]),
+    (round_robin, (2,), TIES, [9, 10, 11, 8, 14, 16],
+     [(0, 0, 2), (1, 2, 4), (2, 4, 6), (3, 6, 8), (0, 8, 9), (1, 9, 10), (2, 10, 11), (4, 12, 14), (5, 14, 16)]),
+    (round_robin, (2,), PREEMPT, [17, 11, 8, 15, 21, 22, 27],
+     [(0, 0, 2), (1, 2, 4), (0, 4, 6), (2, 6, 8), (3, 8, 10), (1, 10, 11), (0, 11, 13), (3, 13, 15), (0, 15, 17),
+      (4, 20, 21), (5, 21, 22), (6, 22, 24), (6, 24, 26), (6, 26, 27)]),
+    (round_robin, (2,), ARRIVALS, [11, 10, 13, 9, 37],
+     [(0, 0, 2), (1, 2, 4), (0, 4, 6), (2, 6, 8), (3, 8, 9), (1, 9, 10), (0, 10, 11), (2, 11, 13), (4, 30, 32),
+      (4, 32, 34), (4, 34, 36), (4, 36, 37)]),
+    (round_robin, (3,), ARRIVALS, [8, 6, 13, 12, 37],
+     [(0, 0, 3), (1, 3, 6), (0, 6, 8), (2, 8, 11), (3, 11, 12), (2, 12, 13), (4, 30, 33), (4, 33, 36), (4, 36, 37)]),
+]
+
+
+@pytest.mark.parametrize('scheduler, args, tasks, ct, execution_log', EXPECTED)
+def test_schedules_match_the_original_schedulers(scheduler, args, tasks, ct, execution_log):
+    result, log = scheduler([dict(task) for task in tasks], *args)
+    assert [task['ct'] for task in result] == ct
+    assert list(log) == execution_log
+
+
+def test_compact_round_robin_merges_only_lone_quanta():
+    result, log = round_robin([dict(task) for task in ARRIVALS], 2, compact=True)
+    assert [task['ct'] for task in result] == [11, 10, 13, 9, 37]
+    # E runs alone after the idle gap, so its four quanta are one segment
+    assert log == [(0, 0, 2), (1, 2, 4), (0, 4, 6), (2, 6, 8), (3, 8, 9), (1, 9, 10), (0, 10, 11), (2, 11, 13),
+                   (4, 30, 37)]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_compact_round_robin_keeps_completion_times(seed):
+    rng = random.Random(seed)
+    tasks = [{'id': str(i), 'at': rng.randint(0, 60), 'bt': rng.randint(1, 15), 'pr': 0} for i in range(30)]
+    tq = rng.randint(1, 6)
+    default, default_log = round_robin([dict(task) for task in tasks], tq)
+    compact, compact_log = round_robin([dict(task) for task in tasks], tq, compact=True)
+    assert [task['ct'] for task in compact] == [task['ct'] for task in default]
+    assert len(compact_log) <= len(default_log)
+    # Same time on the CPU per task
+    busy = {}
+    for index, start, end in default_log:
+        busy[index] = busy.get(index, 0) + end - start
+    for index, start, end in compact_log:
+        busy[index] -= end - start
+    assert set(busy.values()) == {0}
+
+
+def _srtf_by_time_unit(tasks):
+    """
+    Reference SRTF, one time unit at a time: the running task keeps the CPU unless a
+    waiting task has strictly less time left, otherwise the least time left wins,
+    then the earliest arrival, then the lowest index.
+    """
+    remaining = [task['bt'] for task in tasks]
+    ct = [None] * len(tasks)
+    running = None
+    time = 0
+    while None in ct:
+        ready = [i for i, task in enumerate(tasks) if task['at'] <= time and ct[i] is None]
+        if not ready:
+            time += 1
+            continue
+        best = min(ready, key=lambda i: (remaining[i], tasks[i]['at'], i))
+        if running is None or ct[running] is not None or remaining[best] < remaining[running]:
+            running = best
+        remaining[running] -= 1
+        time += 1
+        if remaining[running] == 0:
+            ct[running] = time
+    return ct
+
+
+def test_srtf_preempts_for_shorter_tasks_only():
+    tasks = _tasks(('A', 0, 8, 0), ('B', 1, 4, 0), ('C', 2, 9, 0), ('D', 3, 5, 0), ('E', 30, 4, 0), ('F', 32, 2, 0))
+    result, log = shortest_remaining_time_first([dict(task) for task in tasks])
+    assert [task['ct'] for task in result] == [17, 5, 26, 10, 34, 36]
+    # F arrives with as much time left as E, so E keeps the CPU
+    assert log == [(0, 0, 1), (1, 1, 5), (3, 5, 10), (0, 10, 17), (2, 17, 26), (4, 30, 34), (5, 34, 36)]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_srtf_matches_a_step_by_step_simulation(seed):
+    rng = random.Random(seed)
+    tasks = [{'id': str(i), 'at': rng.randint(0, 40), 'bt': rng.randint(1, 10), 'pr': 0} for i in range(15)]
+    result, log = shortest_remaining_time_first([dict(task) for task in tasks])
+    assert [task['ct'] for task in result] == _srtf_by_time_unit(tasks)
+    assert all(log[i][0] != log[i + 1][0] or log[i][2] != log[i + 1][1] for i in range(len(log) - 1))
+
+
+@pytest.mark.parametrize('tasks, kwargs, ct, execution_log', [
+    # A uses up the top quantum and moves down; B's arrival preempts it there, and
+    # A later finishes its second-level quantum and the rest in the last level
+    (_tasks(('A', 0, 7, 0), ('B', 3, 2, 0)), {'quanta': (2, 4)}, [9, 5],
+     [(0, 0, 3), (1, 3, 5), (0, 5, 9)]),
+    # The boost at 5 cuts A's second-level slice short and moves both tasks back up;
+    # the one at 10 moves B up again
+    (_tasks(('A', 0, 6, 0), ('B', 0, 6, 0)), {'quanta': (2, 2), 'boost': 5}, [10, 12],
+     [(0, 0, 2), (1, 2, 4), (0, 4, 7), (1, 7, 9), (0, 9, 10), (1, 10, 12)]),
+    # B has waited in the second level for 20 units when A's slice ends, so it moves up
+    (_tasks(('A', 0, 30, 0), ('B', 0, 3, 0)), {'quanta': (2, 20), 'aging': 5}, [33, 25],
+     [(0, 0, 2), (1, 2, 4), (0, 4, 24), (1, 24, 25), (0, 25, 33)]),
+    # A was preempted by C at 14 after resuming at 10, so at 18 it has only waited 4
+    # units and stays in the second level
+    (_tasks(('A', 0, 40, 0), ('B', 6, 4, 0), ('C', 14, 30, 0)), {'quanta': (4, 50), 'aging': 12}, [48, 10, 74],
+     [(0, 0, 6), (1, 6, 10), (0, 10, 14), (2, 14, 18), (0, 18, 48), (2, 48, 74)]),
+])
+def test_mlfq_levels_boost_and_aging(tasks, kwargs, ct, execution_log):
+    result, log = multilevel_feedback_queue([dict(task) for task in tasks], **kwargs)
+    assert [task['ct'] for task in result] == ct
+    assert log == execution_log
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_mlfq_runs_every_task_to_completion(seed):
+    rng = random.Random(seed)
+    tasks = [{'id': str(i), 'at': rng.randint(0, 60), 'bt': rng.randint(1, 25), 'pr': 0} for i in range(25)]
+    result, log = multilevel_feedback_queue([dict(task) for task in tasks], quanta=(2, 4, 8), aging=10, boost=40)
+    busy = [0] * len(tasks)
+    for index, start, end in log:
+        assert start >= tasks[index]['at']
+        busy[index] += end - start
+    assert busy == [task['bt'] for task in tasks]
+    assert [task['ct'] for task in result] == [max(end for index, _, end in log if index == i)
+                                               for i in range(len(tasks))]
+    assert all(log[i][2] <= log[i + 1][1] for i in range(len(log) - 1))
+
+
+@pytest.mark.parametrize('kwargs', [{'quanta': ()}, {'quanta': (2, 0)}, {'aging': 0}, {'boost': -1}])
+def test_mlfq_rejects_bad_settings(kwargs):
+    with pytest.raises(ValueError):
+        multilevel_feedback_queue(_tasks(('A', 0, 1, 0)), **kwargs)
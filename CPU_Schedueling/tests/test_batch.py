@@ -0,0 +1,28 @@
+# test_batch.py
+
+import random
+
+import pytest
+
+from algorithm import avg_wt_tat, round_robin
+from batch import sweep_quanta
+
+
+def _workload(n=200, seed=3):
+    rng = random.Random(seed)
+    return [{'id': str(i), 'at': rng.randint(0, 400), 'bt': rng.choice((1, 2, 3, 5, 8, 40, 300)), 'pr': 1}
+            for i in range(n)]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sweep_matches_separate_round_robin_runs(workers):
+    data = _workload()
+    quanta = [1, 4, 4, 7, 300, 1000]
+    rows = sweep_quanta(data, quanta, max_workers=workers)
+    assert [row['tq'] for row in rows] == quanta
+    for row in rows:
+        result, _ = round_robin([dict(task) for task in data], row['tq'])
+        avg = avg_wt_tat(result)
+        assert row['avg_tat'] == pytest.approx(avg['avg_tat'], abs=0.01)
+        assert row['avg_wt'] == pytest.approx(avg['avg_wt'], abs=0.01)
+    assert rows[-2] == dict(rows[-1], tq=300)
@@ -0,0 +1,110 @@
+# test_binlog.py
+
+import pytest
+
+import taskset
+from binlog import ExecutionLog, ExecutionLogWriter, open_log
+from smp import smp_schedule
+from taskset import core_utilization
+
+FLOAT_TASKS = [
+    {'id': 'A', 'at': 0.0, 'bt': 2.5, 'pr': 1},
+    {'id': 'B', 'at': 0.5, 'bt': 1.25, 'pr': 0},
+    {'id': 'C', 'at': 1.0, 'bt': 3.0, 'pr': 2},
+]
+
+
+def _read(path):
+    log = open_log(path)
+    try:
+        return log.with_core, log.float_times, [tuple(entry) for entry in log]
+    finally:
+        log.close()
+
+
+def test_execution_log_round_trips_float_times(tmp_path):
+    entries = [(0, 0, 2), (1, 2, 3.5), (0, 3.5, 4.25)]
+    log = ExecutionLog()
+    log.extend(entries)
+    assert log.float_times
+    log.save(tmp_path / 'log.bin')
+    assert _read(tmp_path / 'log.bin') == (False, True, entries)
+
+
+def test_execution_log_round_trips_core_column(tmp_path):
+    entries = [(0, 0, 2, 1), (1, 0, 3, 0), (2, 2, 5, 1)]
+    log = ExecutionLog(with_core=True)
+    log.extend(entries)
+    log.save(tmp_path / 'log.bin')
+    assert _read(tmp_path / 'log.bin') == (True, False, entries)
+
+
+def test_writer_takes_the_time_type_of_the_first_entry(tmp_path):
+    entries = [(0, 0.0, 1.5), (1, 1.5, 2.75)]
+    with ExecutionLogWriter(tmp_path / 'log.bin') as writer:
+        writer.extend(entries)
+    assert _read(tmp_path / 'log.bin') == (False, True, entries)
+
+    with ExecutionLogWriter(tmp_path / 'ints.bin') as writer:
+        writer.extend([(0, 0, 1), (1, 1, 3)])
+    assert _read(tmp_path / 'ints.bin') == (False, False, [(0, 0, 1), (1, 1, 3)])
+
+
+def test_writer_rejects_float_times_in_an_int_log(tmp_path):
+    writer = ExecutionLogWriter(tmp_path / 'log.bin', float_times=False)
+    writer.append((0, 0, 1))
+    writer.append((1, 1, 2.5))
+    with pytest.raises(ValueError, match='float_times=True'):
+        writer.close()
+
+
+def test_smp_float_workload_round_trips_through_the_writer(tmp_path):
+    data = [dict(task) for task in FLOAT_TASKS]
+    reference = smp_schedule([dict(task) for task in FLOAT_TASKS], 'priority_p', 2)[1]
+    log = ExecutionLog(with_core=True)
+    smp_schedule(data, 'priority_p', 2, log=log)
+    with ExecutionLogWriter(tmp_path / 'log.bin', with_core=True) as writer:
+        writer.extend(log)
+    assert _read(tmp_path / 'log.bin') == (True, True, [tuple(entry) for entry in reference])
+
+
+def test_columns_round_trip_with_core(tmp_path):
+    np = pytest.importorskip('numpy')
+    task = np.array([0, 1, 0])
+    start = np.array([0.0, 1.5, 2.0])
+    end = np.array([1.5, 2.0, 4.5])
+    core = np.array([0, 1, 1])
+    log = ExecutionLog(with_core=True)
+    log.extend_columns(task, start, end, core)
+    with ExecutionLogWriter(tmp_path / 'log.bin', with_core=True) as writer:
+        writer.extend_columns(*log.columns())
+    assert _read(tmp_path / 'log.bin') == (True, True, list(zip([0, 1, 0], [0.0, 1.5, 2.0], [1.5, 2.0, 4.5], [0, 1, 1])))
+
+
+def test_core_column_is_required_with_core(tmp_path):
+    log = ExecutionLog(with_core=True)
+    with pytest.raises(ValueError, match='core'):
+        log.extend_columns([0], [0], [1])
+    with ExecutionLogWriter(tmp_path / 'log.bin', with_core=True) as writer:
+        with pytest.raises(ValueError, match='core'):
+            writer.extend_columns([0], [0], [1])
+
+
+def test_core_utilization_reads_a_mapped_log_in_chunks(monkeypatch, tmp_path):
+    np = pytest.importorskip('numpy')
+    rng = np.random.default_rng(3)
+    durations = rng.integers(1, 4, 1000)
+    ends = np.cumsum(durations)
+    log = ExecutionLog(with_core=True)
+    log.extend_columns(rng.integers(0, 5, 1000), ends - durations, ends, rng.integers(0, 3, 1000))
+    log.save(tmp_path / 'log.bin')
+    entries = [tuple(entry) for entry in log]
+    monkeypatch.setattr(taskset, 'CHUNK_SEGMENTS', 64)
+    mapped = open_log(tmp_path / 'log.bin')
+    try:
+        chunked = core_utilization(mapped, cores=4)
+    finally:
+        mapped.close()
+    monkeypatch.setattr(taskset, 'np', None)
+    assert chunked == pytest.approx(core_utilization(entries, cores=4))
+    assert chunked[3] == 0.0
@@ -0,0 +1,73 @@
+# test_cache.py
+
+import os
+import pickle
+
+from cache import ResultCache, result_key
+
+TASKS = [{'id': 'A', 'at': 0, 'bt': 5, 'pr': 1}, {'id': 'B', 'at': 2, 'bt': 3, 'pr': 0}]
+
+
+def _value(tag):
+    return {'tag': tag, 'payload': b'x' * 1000}
+
+
+BLOB = len(pickle.dumps(_value('a'), protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def test_result_key_depends_on_id_types_and_inputs():
+    key = result_key(TASKS, 'fcfs')
+    assert key == result_key([dict(task, ct=9) for task in TASKS], 'fcfs')  # Earlier results are ignored
+    assert key != result_key(TASKS, 'sjf')
+    assert result_key(TASKS, 'rr', (2,)) != result_key(TASKS, 'rr', (3,))
+    numbered = [dict(task, id=i + 1) for i, task in enumerate(TASKS)]
+    assert result_key(numbered, 'fcfs') != result_key([dict(task, id=str(i + 1)) for i, task in enumerate(TASKS)],
+                                                      'fcfs')
+    # IDs that only join up the same way
+    assert result_key([dict(TASKS[0], id='A\x00B'), dict(TASKS[1], id='')], 'fcfs') != \
+        result_key([dict(TASKS[0], id='A'), dict(TASKS[1], id='B\x00')], 'fcfs')
+
+
+def test_hits_are_copies():
+    cache = ResultCache()
+    cache.put('k', _value('a'))
+    first = cache.get('k')
+    first['tag'] = 'changed'
+    assert cache.get('k') == _value('a')
+    assert cache.get('missing') is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache(max_bytes=2 * BLOB)
+    cache.put('a', _value('a'))
+    cache.put('b', _value('b'))
+    cache.get('a')  # 'b' is now the least recently used
+    cache.put('c', _value('c'))
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == _value('a') and cache.get('c') == _value('c')
+    cache.put('huge', {'payload': b'x' * 3 * BLOB})  # Over the whole budget: not kept at all
+    assert cache.get('huge') is None and len(cache) == 2
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    ResultCache(directory=str(tmp_path)).put('k', _value('a'))
+    cache = ResultCache(directory=str(tmp_path))
+    assert len(cache) == 0
+    assert cache.get('k') == _value('a')
+    assert len(cache) == 1  # Loaded back into the memory tier
+    cache.clear()
+    assert ResultCache(directory=str(tmp_path)).get('k') is None
+
+
+def test_disk_tier_evicts_oldest_files(tmp_path):
+    cache = ResultCache(max_bytes=0, directory=str(tmp_path), max_disk_bytes=2 * BLOB)
+    cache.put('a', _value('a'))
+    cache.put('b', _value('b'))
+    os.utime(tmp_path / 'a.pkl', (1000, 1000))
+    os.utime(tmp_path / 'b.pkl', (2000, 2000))
+    assert cache.get('a') == _value('a')  # Reading marks 'a' as recently used
+    cache.put('c', _value('c'))
+    assert sorted(os.listdir(tmp_path)) == ['a.pkl', 'c.pkl']
+    assert cache.get('b') is None
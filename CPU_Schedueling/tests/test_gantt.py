@@ -0,0 +1,94 @@
+# test_gantt.py
+
+import pytest
+
+import gantt
+import taskset
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('matplotlib')
+
+from binlog import ExecutionLog, open_log  # noqa: E402
+
+SMALL_LOG = [(0, 0, 2), (1, 2, 3), (0, 3, 5), (2, 5, 6), (1, 6, 9), (2, 9, 9.5)]
+SMALL_TASKS = [{'id': str(i), 'at': 0, 'bt': 1, 'pr': 1} for i in range(3)]
+
+
+def _bars(monkeypatch, vectorized, rows_per_lane, pixels, log=SMALL_LOG):
+    if not vectorized:
+        monkeypatch.setattr(gantt, 'np', None)
+    _, row_of, _, _ = gantt._row_index(log, SMALL_TASKS)
+    return [list(map(float, column)) for column in gantt._visible_bars(log, row_of, 0, 2, rows_per_lane, 1, 9, pixels)]
+
+
+@pytest.mark.parametrize('vectorized', [True, False])
+def test_visible_bars_bin_to_pixels(monkeypatch, vectorized):
+    # One row per lane, one time unit per pixel over [1, 9]: bars snap to whole
+    # pixels, and segments outside the view are dropped
+    assert _bars(monkeypatch, vectorized, 1, 8) == [[0, 0, 1, 1, 2], [1, 3, 2, 6, 5], [1, 2, 1, 3, 1]]
+    # Two units per pixel: task 0's one unit gap no longer shows, and the half-pixel
+    # segment of task 2 still covers a pixel
+    assert _bars(monkeypatch, vectorized, 1, 4) == [[0, 1, 1, 2], [1, 1, 5, 5], [4, 2, 4, 2]]
+    # All rows in one lane: the whole range is busy, so it is a single bar
+    assert _bars(monkeypatch, vectorized, 3, 4) == [[0], [1], [8]]
+
+
+def test_mapped_log_is_binned_in_chunks(monkeypatch, tmp_path):
+    rng = np.random.default_rng(1)
+    durations = rng.integers(1, 4, 5000)
+    ends = np.cumsum(durations)
+    log = ExecutionLog()
+    log.extend_columns(rng.integers(0, 3, 5000).astype(np.int32), ends - durations, ends)
+    log.save(tmp_path / 'log.bin')
+    entries = list(log)
+
+    def bars(execution_log):
+        _, row_of, first, last = gantt._row_index(execution_log, SMALL_TASKS)
+        assert (first, last) == (0, int(ends[-1]))
+        return [column.tolist() for column in gantt._visible_bars(execution_log, row_of, 0, 2, 1, 100, 9000, 600)]
+
+    whole = bars(entries)
+    monkeypatch.setattr(taskset, 'CHUNK_SEGMENTS', 64)
+    mapped = open_log(tmp_path / 'log.bin')
+    try:
+        assert len(list(taskset.log_chunks(mapped))) == 79
+        assert bars(mapped) == whole
+    finally:
+        mapped.close()
+    assert bars(entries) == whole
+
+
+def _drawn(ax):
+    """Bars and vertices in the collections drawn on ax."""
+    paths = [path for collection in ax.collections for path in collection.get_paths()]
+    return len(paths), sum(len(path.vertices) for path in paths)
+
+
+@pytest.mark.parametrize('segments, tasks', [(300000, 100000), (20000, 100)])
+def test_drawing_is_bounded_by_pixels(segments, tasks):
+    from matplotlib.figure import Figure
+
+    rng = np.random.default_rng(0)
+    durations = rng.integers(1, 5, segments)
+    ends = np.cumsum(durations)
+    log = ExecutionLog()
+    log.extend_columns(rng.integers(0, tasks, segments).astype(np.int32), ends - durations, ends)
+    details = [{'id': str(i), 'at': 0, 'bt': 1, 'pr': 1} for i in range(tasks)]
+
+    fig = Figure(figsize=(6, 3), dpi=100)
+    ax = fig.add_subplot()
+    chart = gantt.GanttChart(ax, log, details, draw=False)
+    fig.tight_layout()
+    chart.redraw()
+    extent = ax.get_window_extent()
+    lanes = min(tasks, int(extent.height))
+    # Bars of a lane are at least a pixel wide and at least a pixel apart
+    max_bars = lanes * (int(extent.width) // 2 + 1)
+    bars, vertices = _drawn(ax)
+    assert 0 < bars <= max_bars
+    assert vertices <= 5 * bars
+    assert len(ax.texts) <= gantt.MAX_LABELS
+
+    # Zooming in redraws the view without going over the bound
+    ax.set_xlim(1000, 3000)
+    assert 0 < _drawn(ax)[0] <= max_bars
@@ -0,0 +1,96 @@
+# test_incremental.py
+
+import random
+import threading
+
+import pytest
+
+from algorithm import ALGORITHMS
+from incremental import POLICIES, IncrementalScheduler
+from tracing import ProgressTracer, RunCancelled
+
+TQ = 3
+
+
+def _batch(policy, tasks):
+    data = [dict(task) for task in tasks]
+    if policy == 'rr':
+        return ALGORITHMS[policy](data, TQ)
+    return ALGORITHMS[policy](data)
+
+
+def _check(scheduler, policy, live):
+    result, log = scheduler.run()
+    expected, expected_log = _batch(policy, live)
+    assert [task['id'] for task in result] == [task['id'] for task in live]
+    assert [task['ct'] for task in result] == [task['ct'] for task in expected]
+    assert list(log) == list(expected_log)
+    assert scheduler.finished
+
+
+def _random_task(rng, task_id):
+    return {'id': task_id, 'at': rng.randint(0, 80), 'bt': rng.randint(1, 12), 'pr': rng.randint(0, 4)}
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+@pytest.mark.parametrize('seed', range(8))
+def test_edits_match_the_batch_schedulers(policy, seed):
+    rng = random.Random(seed)
+    scheduler = IncrementalScheduler(policy, TQ if policy == 'rr' else None, checkpoint_every=rng.choice((1, 2, 3)))
+    live = [_random_task(rng, f"T{i}") for i in range(12)]
+    scheduler.add_tasks(live)
+    _check(scheduler, policy, live)
+    next_id = len(live)
+    for _ in range(15):
+        for _ in range(rng.randint(1, 3)):
+            if live and rng.random() < 0.4:
+                task = live.pop(rng.randrange(len(live)))
+                scheduler.remove_task(task['id'])
+            elif rng.random() < 0.5:
+                task = _random_task(rng, f"T{next_id}")
+                next_id += 1
+                scheduler.add_task(task)
+                live.append(task)
+            else:
+                tasks = [_random_task(rng, f"T{next_id + i}") for i in range(rng.randint(1, 4))]
+                next_id += len(tasks)
+                scheduler.add_tasks(tasks)
+                live.extend(tasks)
+        if live:
+            _check(scheduler, policy, live)
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_cancelled_run_rolls_back_and_resumes(policy):
+    rng = random.Random(7)
+    live = [_random_task(rng, str(i)) for i in range(60)]
+    scheduler = IncrementalScheduler(policy, TQ if policy == 'rr' else None, checkpoint_every=4)
+    scheduler.add_tasks(live)
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(RunCancelled):
+        scheduler.run(tracer=ProgressTracer(cancel_event=cancel, interval=50))
+    assert not scheduler.finished
+    _check(scheduler, policy, live)
+
+    # Cancel again after an edit late in the timeline, then finish
+    late = {'id': 'late', 'at': 70, 'bt': 5, 'pr': 0}
+    scheduler.add_task(late)
+    live.append(late)
+    with pytest.raises(RunCancelled):
+        scheduler.run(tracer=ProgressTracer(cancel_event=cancel, interval=3))
+    _check(scheduler, policy, live)
+
+
+def test_rejects_duplicate_ids_and_unknown_policies():
+    scheduler = IncrementalScheduler('fcfs')
+    scheduler.add_task({'id': 'A', 'at': 0, 'bt': 1, 'pr': 0})
+    with pytest.raises(ValueError):
+        scheduler.add_task({'id': 'A', 'at': 1, 'bt': 1, 'pr': 0})
+    with pytest.raises(ValueError):
+        scheduler.add_tasks([{'id': 'B', 'at': 0, 'bt': 1, 'pr': 0}, {'id': 'A', 'at': 0, 'bt': 1, 'pr': 0}])
+    assert len(scheduler) == 1
+    with pytest.raises(ValueError):
+        IncrementalScheduler('mlfq')
+    with pytest.raises(ValueError):
+        IncrementalScheduler('rr')
@@ -0,0 +1,44 @@
+# test_instrument.py
+
+import random
+
+import pytest
+
+from algorithm import priority_preemptive, round_robin
+from instrument import profile_run
+from smp import smp_schedule
+from tracing import CollectingTracer
+
+
+def _workload(n=400, seed=7):
+    rng = random.Random(seed)
+    return [{'id': str(i), 'at': rng.randint(0, 2 * n), 'bt': rng.randint(1, 12), 'pr': rng.randint(0, 5)}
+            for i in range(n)]
+
+
+@pytest.mark.parametrize('queue_mode', ['global', 'per_core'])
+@pytest.mark.parametrize('policy, scheduler, args', [
+    ('priority_p', priority_preemptive, ()),
+    ('rr', round_robin, (3,)),
+])
+def test_smp_counts_match_single_core_on_one_core(queue_mode, policy, scheduler, args):
+    data = _workload()
+    _, _, single = profile_run(scheduler, [dict(task) for task in data], *args)
+    tq = args[0] if args else None
+    _, _, smp = profile_run(smp_schedule, [dict(task) for task in data], policy, 1, tq=tq, queue_mode=queue_mode)
+    for counter in ('preemptions', 'context_switches', 'arrivals', 'completions'):
+        assert smp.counters[counter] == single.counters[counter], counter
+    if policy == 'priority_p':
+        assert smp.counters['preemptions'] > 0
+
+
+def test_smp_preempt_events_carry_the_time_left():
+    data = _workload(100)
+    tracer = CollectingTracer()
+    result, log = smp_schedule(data, 'priority_p', 2, tracer=tracer)
+    preempts = [fields for event, fields in tracer.events if event == 'preempt']
+    assert preempts
+    for fields in preempts:
+        index = result.index(fields['task'])
+        ran = sum(min(end, fields['time']) - start for i, start, end, _ in log if i == index and start < fields['time'])
+        assert fields['remaining'] == fields['task']['bt'] - ran > 0
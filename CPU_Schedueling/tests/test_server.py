@@ -0,0 +1,169 @@
+# test_server.py
+
+import asyncio
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from algorithm import round_robin
+from server import FLUSH_SEGMENTS, SchedulingServer
+
+TASKS = [{'id': f"T{i}", 'at': i // 2, 'bt': 1 + i % 5, 'pr': i % 3} for i in range(400)]
+
+
+@pytest.fixture
+def start_server():
+    """Start SchedulingServer instances on free ports, each on its own event loop thread."""
+    running = []
+
+    def start(**kwargs):
+        loop = asyncio.new_event_loop()
+        server = SchedulingServer(port=0, workers=2, **kwargs)
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        running.append((server, loop, thread))
+        return server
+
+    yield start
+    for server, loop, thread in running:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=30)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+def _request(port, method, path, body=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def _read_chunks(port, body):
+    """
+    POST to /schedule over a plain socket and undo the chunked encoding by hand.
+
+    :return: Tuple of (status line, headers, list of chunk payloads).
+    """
+    with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+        sock.sendall(b'POST /schedule HTTP/1.1\r\nHost: test\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body))
+        stream = sock.makefile('rb')
+        status = stream.readline().decode().strip()
+        headers = {}
+        while True:
+            line = stream.readline().decode().strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        chunks = []
+        while True:
+            size = int(stream.readline(), 16)
+            data = stream.read(size)
+            assert stream.read(2) == b'\r\n'
+            if size == 0:
+                return status, headers, chunks
+            chunks.append(data)
+
+
+def test_schedule_streams_ndjson_chunks(start_server):
+    server = start_server()
+    body = json.dumps({'algorithm': 'rr', 'tq': 1, 'tasks': TASKS}).encode()
+    status, headers, chunks = _read_chunks(server.port, body)
+    assert status == 'HTTP/1.1 200 OK'
+    assert headers['content-type'] == 'application/x-ndjson'
+    assert headers['transfer-encoding'] == 'chunked'
+
+    result, execution_log = round_robin([dict(task) for task in TASKS], 1)
+    assert len(execution_log) > 2 * FLUSH_SEGMENTS
+    assert len(chunks) > 2  # Sent while the scheduler runs, not as one body
+    assert all(chunk.endswith(b'\n') for chunk in chunks)  # No line is split across chunks
+    lines = [json.loads(line) for line in b''.join(chunks).splitlines()]
+    assert [(line['id'], line['start'], line['end']) for line in lines[:-1]] == [
+        (TASKS[index]['id'], start, end) for index, start, end in execution_log]
+    assert lines[-1]['done']
+    assert [task['ct'] for task in lines[-1]['tasks']] == [task['ct'] for task in result]
+
+
+@pytest.mark.parametrize('body', [
+    b'{"algorithm": "rr", "tasks": [',
+    b'[1, 2]',
+    b'{"algorithm": "nope", "tasks": [{"id": "A", "at": 0, "bt": 1}]}',
+    b'{"algorithm": "rr", "tasks": [{"id": "A", "at": 0, "bt": 1}]}',
+    b'{"tasks": [{"id": "A", "at": "soon", "bt": 1}]}',
+])
+def test_malformed_requests_get_400(start_server, body):
+    server = start_server()
+    status, headers, payload = _request(server.port, 'POST', '/schedule', body)
+    assert status == 400
+    assert headers['Content-Type'] == 'application/json'
+    assert 'error' in json.loads(payload)
+
+
+def test_expect_100_continue_is_answered_before_the_body(start_server):
+    server = start_server()
+    body = json.dumps({'algorithm': 'fcfs', 'tasks': TASKS[:3]}).encode()
+    with socket.create_connection(('127.0.0.1', server.port), timeout=30) as sock:
+        sock.sendall(b'POST /schedule HTTP/1.1\r\nHost: test\r\nExpect: 100-continue\r\n'
+                     b'Content-Length: %d\r\n\r\n' % len(body))
+        stream = sock.makefile('rb')
+        assert stream.readline() == b'HTTP/1.1 100 Continue\r\n'
+        assert stream.readline() == b'\r\n'
+        sock.sendall(body)
+        assert stream.readline() == b'HTTP/1.1 200 OK\r\n'
+
+
+@pytest.mark.parametrize('head', [
+    b'GET /metrics?%s HTTP/1.1\r\n\r\n' % (b'x' * 70000),
+    b'POST /schedule HTTP/1.1\r\nX-Padding: %s\r\nContent-Length: 2\r\n\r\n{}' % (b'x' * 70000),
+])
+def test_overlong_lines_get_400(start_server, head):
+    server = start_server()
+    with socket.create_connection(('127.0.0.1', server.port), timeout=30) as sock:
+        sock.sendall(head)
+        assert sock.makefile('rb').readline() == b'HTTP/1.1 400 Bad Request\r\n'
+
+
+def test_requests_over_max_pending_get_503(start_server):
+    server = start_server(max_pending=1)
+    tasks = [{'id': str(i), 'at': i // 3, 'bt': 1 + i % 7} for i in range(100000)]
+    held = http.client.HTTPConnection('127.0.0.1', server.port, timeout=30)
+    try:
+        # Not reading the response holds the run back, so it stays in progress
+        held.request('POST', '/schedule', body=json.dumps({'algorithm': 'rr', 'tq': 1, 'tasks': tasks}))
+        assert held.getresponse().status == 200
+        status, headers, payload = _request(server.port, 'POST', '/schedule', json.dumps(
+            {'algorithm': 'fcfs', 'tasks': TASKS[:3]}))
+        assert status == 503
+        assert headers['Retry-After'] == '1'
+        assert 'error' in json.loads(payload)
+    finally:
+        held.close()
+
+    # Going away cancels the held run, and requests are accepted again
+    deadline = time.monotonic() + 30
+    while server.stats.active and time.monotonic() < deadline:
+        time.sleep(0.05)
+    status, _, _ = _request(server.port, 'POST', '/schedule', json.dumps({'algorithm': 'fcfs', 'tasks': TASKS[:3]}))
+    assert status == 200
+
+
+def test_metrics_reports_requests(start_server):
+    server = start_server()
+    _request(server.port, 'POST', '/schedule', json.dumps({'algorithm': 'sjf', 'tasks': TASKS[:10]}))
+    _request(server.port, 'POST', '/schedule', b'not json')
+    status, headers, payload = _request(server.port, 'GET', '/metrics')
+    assert status == 200
+    assert headers['Content-Type'] == 'application/json'
+    metrics = json.loads(payload)
+    assert metrics['requests'] == {'total': 2, 'active': 0, 'rejected': 0, 'failed': 1, 'cancelled': 0}
+    assert metrics['tasks_total'] == 10
+    assert metrics['latency_seconds']['count'] == 1
@@ -0,0 +1,135 @@
+# tracing.py
+
+import logging
+
+
+def format_event(event, fields):
+    """
+    Format a scheduler event as a human readable line.
+
+    :param event: Event name ('arrival', 'dispatch', 'preempt', 'complete', 'idle', 'task_metrics' or
+                  'averages').
+    :param fields: Dictionary of event fields as passed to Tracer.emit.
+    :return: Message string.
+    """
+    if event == 'arrival':
+        return f"Task {fields['task']['id']} arrived at {fields['time']} and joined the queue."
+    if event == 'dispatch':
+        on_core = f" on core {fields['core']}" if 'core' in fields else ""
+        return (f"Executing Task {fields['task']['id']}{on_core} from {fields['start']} to {fields['end']}, "
+                f"Remaining time {fields['remaining']}")
+    if event == 'preempt':
+        on_core = f" on core {fields['core']}" if 'core' in fields else ""
+        return (f"Task {fields['task']['id']} preempted{on_core} at {fields['time']}, "
+                f"Remaining time {fields['remaining']}")
+    if event == 'complete':
+        return f"Task {fields['task']['id']} completed at {fields['time']}"
+    if event == 'idle':
+        return f"Current time {fields['time']} - No task available. Skipping to time {fields['next_time']}"
+    if event == 'task_metrics':
+        task = fields['task']
+        return f"Task {task['id']}: CT={task['ct']}, AT={task['at']}, BT={task['bt']}, TAT={task['tat']}, WT={task['wt']}"
+    if event == 'averages':
+        return (f"Average Turnaround Time (Average TAT): {fields['avg_tat']:.2f}\n"
+                f"Average Waiting Time (Average WT): {fields['avg_wt']:.2f}")
+    return f"{event}: {fields}"
+
+
+class Tracer:
+    """
+    Receiver for scheduler events.
+
+    The base class is the no-op tracer. Schedulers test ``enabled`` before building
+    an event, so a disabled tracer costs one attribute check per event and nothing
+    is ever formatted.
+    """
+
+    enabled = False
+
+    def emit(self, event, **fields):
+        """
+        Handle one scheduler event.
+
+        :param event: Event name.
+        :param fields: Event fields; tasks are passed as the task dictionaries themselves.
+        """
+
+
+NULL_TRACER = Tracer()
+
+
+class StdoutTracer(Tracer):
+    """Print every event to stdout, like the schedulers used to do."""
+
+    enabled = True
+
+    def emit(self, event, **fields):
+        print(format_event(event, fields))
+
+
+class LoggingTracer(Tracer):
+    """Forward events to a :mod:`logging` logger."""
+
+    enabled = True
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        """
+        :param logger: Logger to write to. Defaults to the 'cpu_scheduling' logger.
+        :param level: Logging level used for every event.
+        """
+        self.logger = logger if logger is not None else logging.getLogger('cpu_scheduling')
+        self.level = level
+
+    def emit(self, event, **fields):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, format_event(event, fields))
+
+
+class CollectingTracer(Tracer):
+    """Keep every event in memory as an (event, fields) tuple."""
+
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, **fields):
+        self.events.append((event, fields))
+
+
+class RunCancelled(Exception):
+    """Raised inside a scheduler when its ProgressTracer has been cancelled."""
+
+
+class ProgressTracer(Tracer):
+    """
+    Report progress and support cancellation of a scheduler run from another thread.
+
+    Every ``interval`` events the tracer calls ``callback(completed_tasks)`` and, if
+    ``cancel_event`` is set, raises RunCancelled, which unwinds the scheduler.
+    """
+
+    enabled = True
+
+    def __init__(self, callback=None, cancel_event=None, interval=1024):
+        """
+        :param callback: Function called with the number of completed tasks.
+        :param cancel_event: threading.Event that requests cancellation when set.
+        :param interval: Number of events between progress reports and cancellation checks.
+        """
+        self.callback = callback
+        self.cancel_event = cancel_event
+        self.interval = interval
+        self.completed = 0
+        self._countdown = interval
+
+    def emit(self, event, **fields):
+        if event == 'complete':
+            self.completed += 1
+        self._countdown -= 1
+        if self._countdown == 0:
+            self._countdown = self.interval
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                raise RunCancelled()
+            if self.callback is not None:
+                self.callback(self.completed)
@@ -0,0 +1,271 @@
+# workload.py
+
+import csv
+import json
+import math
+import os
+import random
+
+# Accepted column names for each task field
+FIELD_ALIASES = {
+    'id': ('id', 'task_id', 'task'),
+    'at': ('at', 'arrival_time', 'arrival'),
+    'bt': ('bt', 'burst_time', 'burst'),
+    'pr': ('pr', 'priority'),
+}
+
+
+def _number(value, field, line):
+    """
+    Parse a CSV/JSON value as an int, or a float if it is not integral.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Line {line}: invalid value {value!r} for '{field}'") from None
+
+
+def _make_task(record, line):
+    """
+    Build a task dictionary from a parsed record, resolving column aliases.
+
+    :param record: Mapping of column name to value.
+    :param line: Line number, for error messages.
+    :return: Task dictionary with 'id', 'at', 'bt' and 'pr'.
+    """
+    task = {}
+    for field, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            if alias in record and record[alias] not in (None, ''):
+                task[field] = record[alias]
+                break
+        else:
+            if field == 'pr':
+                task['pr'] = 0  # Priority is only needed by the priority policies
+            else:
+                raise ValueError(f"Line {line}: missing '{field}'")
+    task['id'] = str(task['id'])
+    for field in ('at', 'bt', 'pr'):
+        task[field] = _number(task[field], field, line)
+    if task['bt'] < 0:
+        raise ValueError(f"Line {line}: burst time must not be negative")
+    return task
+
+
+def iter_csv(path):
+    """
+    Stream tasks from a CSV file with a header row.
+
+    :param path: File path.
+    :return: Generator of task dictionaries.
+    """
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            yield _make_task({key.strip().lower(): value for key, value in record.items() if key},
+                             reader.line_num)
+
+
+def iter_jsonl(path):
+    """
+    Stream tasks from a JSON Lines file (one task object per line).
+
+    :param path: File path.
+    :return: Generator of task dictionaries.
+    """
+    with open(path) as f:
+        for line_num, line in enumerate(f, 1):
+            if line.strip():
+                yield _make_task(json.loads(line), line_num)
+
+
+def iter_workload(path):
+    """
+    Stream tasks from a workload file, chosen by extension: .csv, .jsonl/.ndjson, or
+    .json (a list of task objects, which is read in one go).
+
+    :param path: File path.
+    :return: Iterator of task dictionaries.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return iter_csv(path)
+    if extension in ('.jsonl', '.ndjson'):
+        return iter_jsonl(path)
+    if extension == '.json':
+        with open(path) as f:
+            return (_make_task(record, index + 1) for index, record in enumerate(json.load(f)))
+    raise ValueError(f"Unsupported workload format '{extension}' (expected .csv, .jsonl or .json)")
+
+
+def load_workload(path, unique_ids=True):
+    """
+    Load a whole workload file into a list of task dictionaries.
+
+    :param path: File path (see iter_workload).
+    :param unique_ids: Reject workloads with repeated task IDs, like the GUI does.
+    :return: List of task dictionaries.
+    """
+    data = list(iter_workload(path))
+    if unique_ids:
+        _check_unique(data)
+    return data
+
+
+def parse_tasks(records, unique_ids=True):
+    """
+    Build task dictionaries from already parsed records, e.g. the objects of a JSON
+    request body, with the same aliases and checks as the workload files.
+
+    :param records: Sequence of mappings.
+    :param unique_ids: Reject repeated task IDs.
+    :return: List of task dictionaries.
+    """
+    data = []
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {index + 1}: expected a task object")
+        data.append(_make_task(record, index + 1))
+    if unique_ids:
+        _check_unique(data)
+    return data
+
+
+def _check_unique(data):
+    seen = set()
+    for task in data:
+        if task['id'] in seen:
+            raise ValueError(f"Task ID '{task['id']}' is not unique")
+        seen.add(task['id'])
+
+
+def poisson_arrivals(n, rate, rng):
+    """
+    Arrival times of a Poisson process, rounded down to whole time units.
+
+    :param n: Number of arrivals.
+    :param rate: Mean number of arrivals per time unit.
+    :param rng: random.Random instance.
+    :return: List of non-decreasing arrival times.
+    """
+    times = []
+    t = 0.0
+    for _ in range(n):
+        t += rng.expovariate(rate)
+        times.append(int(t))
+    return times
+
+
+def uniform_arrivals(n, horizon, rng):
+    """
+    Arrival times drawn uniformly over [0, horizon), rounded down and sorted.
+
+    :param n: Number of arrivals.
+    :param horizon: End of the arrival window.
+    :param rng: random.Random instance.
+    :return: List of non-decreasing arrival times.
+    """
+    return sorted(int(rng.random() * horizon) for _ in range(n))
+
+
+def exponential_bursts(n, mean, rng, cap=None):
+    """
+    Exponentially distributed burst times, rounded up.
+
+    :param n: Number of bursts.
+    :param mean: Mean burst time before rounding.
+    :param rng: random.Random instance.
+    :param cap: Largest burst time, or None for no cap.
+    :return: List of positive integer burst times.
+    """
+    bursts = [max(1, math.ceil(rng.expovariate(1 / mean))) for _ in range(n)]
+    if cap is not None:
+        bursts = [min(bt, cap) for bt in bursts]
+    return bursts
+
+
+def uniform_bursts(n, low, high, rng):
+    """
+    Burst times drawn uniformly from low to high inclusive.
+
+    :param n: Number of bursts.
+    :param low: Smallest burst time.
+    :param high: Largest burst time.
+    :param rng: random.Random instance.
+    :return: List of integer burst times.
+    """
+    return [rng.randint(low, high) for _ in range(n)]
+
+
+def pareto_bursts(n, alpha, scale, rng, cap=None):
+    """
+    Heavy-tailed burst times: scale times a Pareto(alpha) sample, rounded up.
+
+    :param n: Number of bursts.
+    :param alpha: Pareto shape; the lower, the heavier the tail.
+    :param scale: Smallest burst time.
+    :param rng: random.Random instance.
+    :param cap: Largest burst time, or None for no cap.
+    :return: List of positive integer burst times.
+    """
+    bursts = [math.ceil(scale * rng.paretovariate(alpha)) for _ in range(n)]
+    if cap is not None:
+        bursts = [min(bt, cap) for bt in bursts]
+    return bursts
+
+
+def bursty_priorities(n, levels, rng, mean_run=50):
+    """
+    Priorities that come in runs: stretches of uniformly mixed priorities alternate
+    with bursts where 90% of the tasks share one level, like a batch of urgent jobs
+    landing on a mixed queue. Run lengths are geometric with mean ``mean_run``.
+
+    :param n: Number of priorities.
+    :param levels: Priorities are drawn from range(levels).
+    :param rng: random.Random instance.
+    :param mean_run: Mean number of tasks per run.
+    :return: List of priorities.
+    """
+    priorities = []
+    while len(priorities) < n:
+        length = 1 + int(rng.expovariate(1 / mean_run))
+        if rng.random() < 0.5:
+            hot = rng.randrange(levels)
+            priorities.extend(hot if rng.random() < 0.9 else rng.randrange(levels) for _ in range(length))
+        else:
+            priorities.extend(rng.randrange(levels) for _ in range(length))
+    return priorities[:n]
+
+
+def generate_workload(n, seed=0, load=0.9, alpha=1.5, scale=2, priority_levels=10, max_burst=None):
+    """
+    Seeded synthetic workload with Poisson arrivals, Pareto burst times and bursty
+    priorities. The same arguments always give the same task list.
+
+    :param n: Number of tasks.
+    :param seed: Random seed.
+    :param load: Offered load, mean burst time times arrival rate. Above 1 the ready
+                 queue keeps growing for the whole run.
+    :param alpha: Pareto shape of the burst times; must be above 1 so the mean exists.
+    :param scale: Smallest burst time.
+    :param priority_levels: Number of distinct priorities.
+    :param max_burst: Largest burst time, or None for no cap.
+    :return: List of task dictionaries in arrival order.
+    """
+    if load <= 0:
+        raise ValueError("The load must be positive")
+    if alpha <= 1:
+        raise ValueError("The Pareto shape must be above 1")
+    rng = random.Random(seed)
+    mean_burst = scale * alpha / (alpha - 1) + 0.5  # Rounding up adds half a time unit on average
+    arrivals = poisson_arrivals(n, load / mean_burst, rng)
+    bursts = pareto_bursts(n, alpha, scale, rng, max_burst)
+    priorities = bursty_priorities(n, priority_levels, rng)
+    return [{'id': str(i), 'at': at, 'bt': bt, 'pr': pr}
+            for i, (at, bt, pr) in enumerate(zip(arrivals, bursts, priorities))]